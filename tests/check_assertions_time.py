@@ -0,0 +1,62 @@
+#
+# Copyright (c), 2016-2020, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Check the scaling of XSD 1.1 validation time with assertions. The assertions
+use the parent axis, that requires an index of the XML tree. For a linear
+scaling the time per element has to remain about constant.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import xmlschema  # noqa: E402
+
+SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="root">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="item" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:attribute name="id" type="xs:int"/>
+            <xs:attribute name="max" type="xs:int"/>
+            <xs:assert test="@id le ../@max"/>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+      <xs:attribute name="max" type="xs:int"/>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>"""
+
+parser = argparse.ArgumentParser(add_help=True)
+parser.add_argument('sizes', metavar='SIZE', nargs='*', type=int,
+                    default=[1000, 2000, 4000, 8000, 16000],
+                    help='Numbers of elements of the XML documents.')
+args = parser.parse_args()
+
+schema = xmlschema.XMLSchema11(SCHEMA)
+
+for size in args.sizes:
+    xml_data = '<root max="{0}">{1}</root>'.format(
+        size, ''.join('<item id="%d"/>' % k for k in range(size))
+    )
+    resource = xmlschema.XMLResource(xml_data)
+
+    start_time = time.perf_counter()
+    errors = list(schema.iter_errors(resource))
+    elapsed = time.perf_counter() - start_time
+    assert not errors, errors[0]
+
+    print("{:>8} elements: {:.3f} s, {:.1f} us per element".format(
+        size, elapsed, elapsed * 1000000 / size
+    ))
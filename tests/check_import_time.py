@@ -0,0 +1,56 @@
+#
+# Copyright (c), 2016-2020, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Check xmlschema package import time, measured in fresh interpreter processes.
+The creation and the build of meta-schemas, that are deferred at first use,
+are measured apart.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+STATEMENTS = [
+    ('import xmlschema', ''),
+    ('create XSD 1.0 meta-schema', 'xmlschema.XMLSchema10.meta_schema'),
+    ('create XSD 1.1 meta-schema', 'xmlschema.XMLSchema11.meta_schema'),
+    ('build XSD 1.0 meta-schema', 'xmlschema.XMLSchema10.meta_schema.build()'),
+]
+
+SCRIPT = """
+import time
+start_time = time.perf_counter()
+import xmlschema
+import_time = time.perf_counter()
+{}
+print(import_time - start_time, time.perf_counter() - import_time)
+"""
+
+parser = argparse.ArgumentParser(add_help=True)
+parser.add_argument('repeat', metavar='REPEAT', nargs='?', type=int, default=10,
+                    help='Repeat each measure N times (default 10)')
+args = parser.parse_args()
+
+# Use the package of the repository, also if a different version is installed
+env = dict(os.environ)
+env['PYTHONPATH'] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for label, statement in STATEMENTS:
+    times = []
+    for _ in range(args.repeat):
+        output = subprocess.check_output(
+            [sys.executable, '-c', SCRIPT.format(statement)], env=env, universal_newlines=True
+        )
+        import_time, statement_time = map(float, output.split())
+        times.append(import_time if not statement else statement_time)
+
+    print("{:<30} min {:.1f} ms, avg {:.1f} ms".format(
+        label, min(times) * 1000, sum(times) * 1000 / len(times)
+    ))
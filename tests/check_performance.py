@@ -0,0 +1,397 @@
+#
+# Copyright (c), 2016-2020, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Benchmarks of xmlschema throughput on generated XML documents of different
+shapes. Each benchmark runs in a new process and reports the best time of
+the repeats, the processed elements per second and the peak RSS of the
+process. Results can be saved to a JSON file for comparing releases.
+
+Shapes:
+  collection) objects of the bundled collection.xsd schema
+  identities) authors and objects of the bundled collection3.xsd schema, \
+with a key and a keyref
+  choices) a wide repeated choice of 40 elements
+  nesting) deeply nested recursive elements
+  enumerations) tokens and decimals restricted by large enumerations
+  patterns) strings restricted by a pattern facet with 20 alternatives
+  assertions) elements with XSD 1.1 assertions
+
+Operations:
+  build) schema build
+  parse, lazy-parse) parsing of a full XML resource or iteration of a lazy XML resource
+  validate, lazy-validate) validation of a full or lazy XML resource
+  decode) decoding of a full XML resource
+  lazy-decode) iterative decoding of the children of the root of a lazy XML resource
+  encode) encoding of the decoded data
+  to-json) conversion of the XML document to JSON
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import xmlschema  # noqa: E402
+
+TEST_CASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_cases/')
+
+COLLECTION_NAMESPACE = 'http://example.com/ns/collection'
+
+CHOICES_SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="root">
+    <xs:complexType>
+      <xs:choice maxOccurs="unbounded">
+{}
+      </xs:choice>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>""".format('\n'.join(
+    '        <xs:element name="e{}" type="xs:int"/>'.format(k) for k in range(40)
+))
+
+NESTING_SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="root">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element ref="node" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+  <xs:element name="node">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element ref="node" minOccurs="0"/>
+      </xs:sequence>
+      <xs:attribute name="level" type="xs:nonNegativeInteger" use="required"/>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>"""
+
+ASSERTIONS_SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="root">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="item" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:simpleContent>
+              <xs:extension base="xs:int">
+                <xs:attribute name="min" type="xs:int" use="required"/>
+                <xs:attribute name="max" type="xs:int" use="required"/>
+                <xs:assert test="@min le @max"/>
+                <xs:assert test="$value ge @min and $value le @max"/>
+              </xs:extension>
+            </xs:simpleContent>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>"""
+
+ENUMERATIONS_SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="root">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="code" type="codeType" maxOccurs="unbounded"/>
+        <xs:element name="amount" type="amountType" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+  <xs:simpleType name="codeType">
+    <xs:restriction base="xs:token">
+{}
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:simpleType name="amountType">
+    <xs:restriction base="xs:decimal">
+{}
+    </xs:restriction>
+  </xs:simpleType>
+</xs:schema>""".format(
+    '\n'.join('      <xs:enumeration value="C{:05d}"/>'.format(k) for k in range(5000)),
+    '\n'.join('      <xs:enumeration value="{}.50"/>'.format(k) for k in range(1000)),
+)
+
+PATTERNS_SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="root">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="code" type="codeType" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+  <xs:simpleType name="codeType">
+    <xs:restriction base="xs:string">
+{}
+    </xs:restriction>
+  </xs:simpleType>
+</xs:schema>""".format(
+    '\n'.join('      <xs:pattern value="P{:02d}-[A-Z]{{2}}[0-9]{{4}}"/>'.format(k)
+              for k in range(20)),
+)
+
+PERSON_TEMPLATE = '<{tag} {key}="{id}"><name>Name {k}</name><born>1900-01-01</born>' \
+                  '<qualification>painter</qualification></{tag}>'
+
+
+def generate_collection(fp, size, depth):
+    fp.write('<col:collection xmlns:col="%s">' % COLLECTION_NAMESPACE)
+    count = 1
+    for k in range(max(1, size // 9)):
+        fp.write('<object id="o{0}" available="true"><position>{0}</position>'
+                 '<title>Title {0}</title><year>1900</year>'.format(k))
+        fp.write(PERSON_TEMPLATE.format(tag='author', key='id', id='a%d' % k, k=k))
+        fp.write('<estimation>1000.00</estimation></object>')
+        count += 9
+    fp.write('</col:collection>')
+    return count
+
+
+def generate_identities(fp, size, depth):
+    authors = max(1, size // 20)
+    fp.write('<col:collection xmlns:col="%s">' % COLLECTION_NAMESPACE)
+    count = 1
+    for k in range(authors):
+        fp.write(PERSON_TEMPLATE.format(tag='author', key='dn', id='a%d' % k, k=k))
+        count += 4
+    for k in range(max(1, (size - count) // 6)):
+        fp.write('<object id="o{0}" available="true"><position>{0}</position>'
+                 '<title>Title {0}</title><year>1900</year><author>a{1}</author>'
+                 '<estimation>1000.00</estimation></object>'.format(k, k % authors))
+        count += 6
+    fp.write('</col:collection>')
+    return count
+
+
+def generate_choices(fp, size, depth):
+    fp.write('<root>')
+    for k in range(size - 1):
+        fp.write('<e{0}>{1}</e{0}>'.format(k % 40, k))
+    fp.write('</root>')
+    return size
+
+
+def generate_nesting(fp, size, depth):
+    fp.write('<root>')
+    count = 1
+    for _ in range(max(1, size // depth)):
+        fp.write(''.join('<node level="%d">' % k for k in range(depth)))
+        fp.write('</node>' * depth)
+        count += depth
+    fp.write('</root>')
+    return count
+
+
+def generate_enumerations(fp, size, depth):
+    fp.write('<root>')
+    for k in range(size // 2):
+        fp.write('<code>C{:05d}</code>'.format(k * 7 % 5000))
+    for k in range(size - size // 2 - 1):
+        fp.write('<amount>{}.5</amount>'.format(k * 7 % 1000))
+    fp.write('</root>')
+    return size
+
+
+def generate_patterns(fp, size, depth):
+    fp.write('<root>')
+    for k in range(size - 1):
+        fp.write('<code>P{:02d}-AB{:04d}</code>'.format(k % 20, k % 10000))
+    fp.write('</root>')
+    return size
+
+
+def generate_assertions(fp, size, depth):
+    fp.write('<root>')
+    for k in range(size - 1):
+        fp.write('<item min="{0}" max="{1}">{0}</item>'.format(k, k + 10))
+    fp.write('</root>')
+    return size
+
+
+# For each shape: the schema class, the schema source, the generator of XML data
+# and the path of the root element, that is used for encoding.
+SHAPES = {
+    'collection': (
+        xmlschema.XMLSchema10,
+        os.path.join(TEST_CASES_DIR, 'examples/collection/collection.xsd'),
+        generate_collection,
+        '{%s}collection' % COLLECTION_NAMESPACE,
+    ),
+    'identities': (
+        xmlschema.XMLSchema10,
+        os.path.join(TEST_CASES_DIR, 'examples/collection/collection3.xsd'),
+        generate_identities,
+        '{%s}collection' % COLLECTION_NAMESPACE,
+    ),
+    'choices': (xmlschema.XMLSchema10, CHOICES_SCHEMA, generate_choices, 'root'),
+    'nesting': (xmlschema.XMLSchema10, NESTING_SCHEMA, generate_nesting, 'root'),
+    'enumerations': (xmlschema.XMLSchema10, ENUMERATIONS_SCHEMA, generate_enumerations, 'root'),
+    'patterns': (xmlschema.XMLSchema10, PATTERNS_SCHEMA, generate_patterns, 'root'),
+    'assertions': (xmlschema.XMLSchema11, ASSERTIONS_SCHEMA, generate_assertions, 'root'),
+}
+
+OPERATIONS = ('build', 'parse', 'lazy-parse', 'validate', 'lazy-validate',
+              'decode', 'lazy-decode', 'encode', 'to-json')
+
+
+def get_peak_rss():
+    """Returns the peak resident set size of the process in MiB, if available."""
+    if resource is None:
+        return
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return rss / 1024 ** 2  # bytes on macOS
+    return rss / 1024  # KiB on Linux
+
+
+def run_benchmark(shape, operation, xml_file, repeat, defuse, lazy_backend, queue):
+    try:
+        queue.put(benchmark(shape, operation, xml_file, repeat, defuse, lazy_backend))
+    except Exception as err:
+        queue.put(err)
+
+
+def benchmark(shape, operation, xml_file, repeat, defuse='remote', lazy_backend='etree'):
+    schema_class, schema_source, _, root_path = SHAPES[shape]
+    schema = schema_class(schema_source)
+    obj = None
+    if operation == 'encode':
+        obj = schema.decode(xml_file)
+
+    def load(lazy=False):
+        return xmlschema.XMLResource(xml_file, lazy=lazy, defuse=defuse,
+                                     lazy_backend=lazy_backend)
+
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        if operation == 'build':
+            schema_class(schema_source)
+        elif operation == 'parse':
+            load()
+        elif operation == 'lazy-parse':
+            for elem in load(lazy=True).iter():
+                del elem
+        elif operation == 'validate':
+            schema.validate(load())
+        elif operation == 'lazy-validate':
+            schema.validate(load(lazy=True))
+        elif operation == 'decode':
+            schema.decode(load())
+        elif operation == 'lazy-decode':
+            for result in schema.iter_decode(load(lazy=True), path='*'):
+                del result
+        elif operation == 'encode':
+            schema.encode(obj, path=root_path)
+        elif operation == 'to-json':
+            xmlschema.to_json(load(), schema=schema)
+        times.append(time.perf_counter() - start_time)
+
+    return min(times), get_peak_rss()
+
+
+def main():
+    parser = argparse.ArgumentParser(add_help=True, description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', metavar='N', nargs='+', type=int, default=[10000],
+                        help="approximate numbers of elements of the XML documents.")
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES),
+                        metavar='SHAPE', help="shapes of the XML documents to generate.")
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS,
+                        metavar='OPERATION', help="operations to benchmark.")
+    parser.add_argument('--depth', type=int, default=50,
+                        help="depth of the documents of the 'nesting' shape.")
+    parser.add_argument('--defuse', choices=xmlschema.resources.DEFUSE_MODES,
+                        default='remote', help="when to defuse the XML data.")
+    parser.add_argument('--lazy-backend', choices=xmlschema.resources.LAZY_BACKENDS,
+                        default='etree', help="the parser used for lazy resources.")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="number of repeats of each benchmark, the best time is taken.")
+    parser.add_argument('--json', metavar='FILE', dest='json_file',
+                        help="save the results to a JSON file.")
+    args = parser.parse_args()
+
+    # Each benchmark runs in a new process, for measuring its peak RSS.
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    results = []
+
+    header = "xmlschema {} with Python {} on {}".format(
+        xmlschema.__version__, platform.python_version(), platform.platform()
+    )
+    print('{0}\n{1}\n{0}'.format("*" * len(header), header))
+    print('{:<12} {:>9} {:<14} {:>10} {:>14} {:>10}'.format(
+        'shape', 'elements', 'operation', 'time (s)', 'elements/s', 'RSS (MiB)'
+    ))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for shape in args.shapes:
+            for size in args.sizes:
+                xml_file = os.path.join(tmp_dir, '{}-{}.xml'.format(shape, size))
+                with open(xml_file, 'w') as fp:
+                    elements = SHAPES[shape][2](fp, size, args.depth)
+
+                for operation in args.operations:
+                    process = context.Process(
+                        target=run_benchmark,
+                        args=(shape, operation, xml_file, args.repeat,
+                              args.defuse, args.lazy_backend, queue)
+                    )
+                    process.start()
+                    result = queue.get()
+                    process.join()
+                    if isinstance(result, Exception):
+                        print('{:<12} {:>9} {:<14} failed: {}'.format(
+                            shape, elements, operation, result
+                        ))
+                        continue
+
+                    elapsed, peak_rss = result
+
+                    throughput = None if operation == 'build' else elements / elapsed
+                    results.append({
+                        'shape': shape,
+                        'elements': elements,
+                        'operation': operation,
+                        'time': elapsed,
+                        'elements_per_second': throughput,
+                        'peak_rss': peak_rss,
+                    })
+                    print('{:<12} {:>9} {:<14} {:>10.4f} {:>14} {:>10}'.format(
+                        shape, elements, operation, elapsed,
+                        '-' if throughput is None else '{:.0f}'.format(throughput),
+                        '-' if peak_rss is None else '{:.1f}'.format(peak_rss),
+                    ))
+
+    if args.json_file:
+        with open(args.json_file, 'w') as fp:
+            json.dump({
+                'xmlschema_version': xmlschema.__version__,
+                'python_version': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': args.repeat,
+                'defuse': args.defuse,
+                'lazy_backend': args.lazy_backend,
+                'results': results,
+            }, fp, indent=2)
+
+
+if __name__ == '__main__':
+    main()
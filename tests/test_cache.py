@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2016-2020, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""Tests concerning the schema cache and the schema registry"""
+import unittest
+import os
+import shutil
+import tempfile
+
+import xmlschema
+from xmlschema import XMLSchema10, XMLSchema11, SchemaCache, SchemaRegistry, \
+    get_schema_registry, set_schema_registry, normalize_url
+from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError
+from xmlschema.cache import CACHE_FILE_SUFFIX
+
+
+TEST_CASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_cases/')
+
+
+def casepath(relative_path):
+    return os.path.join(TEST_CASES_DIR, relative_path)
+
+
+class TestSchemaCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.schema_dir = os.path.join(self.tmp_dir, 'vehicles')
+        shutil.copytree(casepath('examples/vehicles'), self.schema_dir)
+        self.xsd_file = os.path.join(self.schema_dir, 'vehicles.xsd')
+        self.xml_file = os.path.join(self.schema_dir, 'vehicles.xml')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def get_cache_files(self):
+        return [x for x in os.listdir(self.cache_dir) if x.endswith(CACHE_FILE_SUFFIX)]
+
+    def test_init(self):
+        cache = SchemaCache(self.cache_dir)
+        self.assertEqual(repr(cache), 'SchemaCache(cache_dir=%r)' % self.cache_dir)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+        with self.assertRaises(XMLSchemaValueError):
+            SchemaCache(self.xsd_file)
+
+    def test_get_schema(self):
+        cache = SchemaCache(self.cache_dir)
+        schema = cache.get_schema(self.xsd_file)
+        self.assertIsInstance(schema, XMLSchema10)
+        self.assertTrue(schema.built)
+        self.assertEqual(len(self.get_cache_files()), 1)
+
+        cached_schema = cache.get_schema(self.xsd_file)
+        self.assertIsNot(cached_schema, schema)
+        self.assertTrue(cached_schema.built)
+        self.assertEqual(cached_schema.url, schema.url)
+        self.assertTrue(cached_schema.is_valid(self.xml_file))
+        self.assertEqual(len(self.get_cache_files()), 1)
+
+        schema = cache.get_schema(self.xsd_file, cls=XMLSchema11)
+        self.assertIsInstance(schema, XMLSchema11)
+        schema = cache.get_schema(self.xsd_file, validation='lax')
+        self.assertEqual(schema.validation, 'lax')
+        self.assertEqual(len(self.get_cache_files()), 3)
+
+        cache.clear()
+        self.assertListEqual(self.get_cache_files(), [])
+
+    def test_not_cached_sources(self):
+        cache = SchemaCache(self.cache_dir)
+        with open(self.xsd_file) as fp:
+            schema = cache.get_schema(fp, base_url=self.schema_dir)
+        self.assertTrue(schema.built)
+
+        schema = cache.get_schema(self.xsd_file, build=False)
+        self.assertFalse(schema.built)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_expired_schema(self):
+        cache = SchemaCache(self.cache_dir)
+        cache.get_schema(self.xsd_file)
+        cached_schema = cache.get_schema(self.xsd_file)
+        self.assertNotIn('{http://example.com/vehicles}autos', cached_schema.maps.elements)
+
+        # Change an included schema
+        cars_file = os.path.join(self.schema_dir, 'cars.xsd')
+        with open(cars_file) as fp:
+            text = fp.read()
+        with open(cars_file, 'w') as fp:
+            fp.write(text.replace('</xs:schema>', '<xs:element name="autos"/></xs:schema>'))
+
+        schema = cache.get_schema(self.xsd_file)
+        self.assertIn('{http://example.com/vehicles}autos', schema.maps.elements)
+        self.assertEqual(len(self.get_cache_files()), 1)
+
+    def test_corrupted_cache_file(self):
+        cache = SchemaCache(self.cache_dir)
+        cache.get_schema(self.xsd_file)
+        cache_file = os.path.join(self.cache_dir, self.get_cache_files()[0])
+        with open(cache_file, 'wb') as fp:
+            fp.write(b'not a pickle')
+
+        schema = cache.get_schema(self.xsd_file)
+        self.assertTrue(schema.built)
+        self.assertTrue(schema.is_valid(self.xml_file))
+
+
+class TestSchemaRegistry(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.xsd_file = casepath('examples/vehicles/vehicles.xsd')
+        cls.xml_file = casepath('examples/vehicles/vehicles.xml')
+
+    def test_init(self):
+        registry = SchemaRegistry()
+        self.assertEqual(repr(registry), 'SchemaRegistry(maxsize=32)')
+        self.assertEqual(len(registry), 0)
+        with self.assertRaises(XMLSchemaValueError):
+            SchemaRegistry(maxsize=0)
+
+    def test_get_schema(self):
+        registry = SchemaRegistry(maxsize=2)
+        schema = registry.get_schema(self.xsd_file)
+        self.assertIsInstance(schema, XMLSchema10)
+        self.assertIs(registry.get_schema(self.xsd_file, timeout=10), schema)
+        self.assertIs(registry.get_schema(normalize_url(self.xsd_file)), schema)
+        self.assertEqual((registry.hits, registry.misses), (2, 1))
+
+        schema11 = registry.get_schema(self.xsd_file, cls=XMLSchema11)
+        self.assertIsInstance(schema11, XMLSchema11)
+        self.assertIsNot(registry.get_schema(self.xsd_file, defuse='always'), schema)
+        self.assertEqual(len(registry), 2)
+        self.assertIsNot(registry.get_schema(self.xsd_file), schema)  # evicted
+
+        with open(self.xsd_file) as fp:
+            self.assertTrue(registry.get_schema(fp, base_url=os.path.dirname(self.xsd_file)).built)
+        self.assertIsNone(registry.get_key(self.xsd_file, XMLSchema10, build=False))
+
+        registry.clear()
+        self.assertEqual((len(registry), registry.hits, registry.misses), (0, 0, 0))
+
+    def test_registry_keys(self):
+        registry = SchemaRegistry()
+        locations = {'http://example.com/vehicles': 'vehicles.xsd'}
+        base_url = os.path.dirname(self.xsd_file)
+        self.assertEqual(
+            registry.get_key(self.xsd_file, XMLSchema10, locations=locations, base_url=base_url),
+            registry.get_key(self.xsd_file, XMLSchema10, base_url=base_url,
+                             locations=[('http://example.com/vehicles', self.xsd_file)])
+        )
+        self.assertNotEqual(registry.get_key(self.xsd_file, XMLSchema10, defuse='always'),
+                            registry.get_key(self.xsd_file, XMLSchema10, defuse='never'))
+
+    def test_module_level_functions(self):
+        self.assertIsNone(get_schema_registry())
+        with self.assertRaises(XMLSchemaTypeError):
+            set_schema_registry(SchemaCache(tempfile.gettempdir()))
+
+        registry = SchemaRegistry()
+        self.assertIsNone(set_schema_registry(registry))
+        try:
+            self.assertIs(get_schema_registry(), registry)
+            for _ in range(3):
+                xmlschema.validate(self.xml_file)
+                self.assertTrue(xmlschema.is_valid(self.xml_file, schema=self.xsd_file))
+            xmlschema.to_dict(self.xml_file)
+            self.assertEqual(len(registry), 1)
+            self.assertEqual((registry.hits, registry.misses), (6, 1))
+
+            self.assertTrue(xmlschema.is_valid(self.xml_file, cls=XMLSchema11))
+            self.assertEqual(len(registry), 2)
+        finally:
+            self.assertIs(set_schema_registry(None), registry)
+        self.assertIsNone(get_schema_registry())
+
+
+if __name__ == '__main__':
+    import platform
+    header_template = "Test xmlschema schema cache with Python {} on {}"
+    header = header_template.format(platform.python_version(), platform.platform())
+    print('{0}\n{1}\n{0}'.format("*" * len(header), header))
+
+    unittest.main()
@@ -13,13 +13,14 @@ import unittest
 from unittest.mock import patch
 import glob
 import io
+import json
 import pathlib
 import os
 import platform
 import sys
 
-from xmlschema.cli import validate, xml2json, json2xml
-from xmlschema import to_json
+from xmlschema.cli import validate, xml2json, json2xml, to_ndjson
+from xmlschema import XMLSchema, to_json
 
 WORK_DIRECTORY = os.getcwd()
 
@@ -122,6 +123,61 @@ class TestConsoleScripts(unittest.TestCase):
         self.assertEqual("vehicles.xml is valid\n", mock_out.getvalue())
         self.assertEqual('0', str(self.ctx.exception))
 
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_validate_command_09(self, mock_out, mock_err):
+        self.run_validate('--lazy', '--jobs=2', 'vehicles.xml', 'vehicles-2_errors.xml')
+        self.assertEqual(mock_err.getvalue(), '')
+        output = mock_out.getvalue()
+        self.assertIn("vehicles.xml is valid", output)
+        self.assertIn("vehicles-2_errors.xml is not valid", output)
+        self.assertEqual('2', str(self.ctx.exception))
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_validate_command_10(self, mock_out, mock_err):
+        self.run_validate('--lazy', '--max-errors=1', 'vehicles.xml', 'vehicles-2_errors.xml')
+        self.assertEqual(mock_err.getvalue(), '')
+        output = mock_out.getvalue()
+        self.assertIn("vehicles.xml is valid", output)
+        self.assertIn("vehicles-2_errors.xml is not valid", output)
+        self.assertEqual('1', str(self.ctx.exception))
+
+        self.run_validate('--max-errors=0', 'vehicles.xml')
+        self.assertIn("requires a positive integer", mock_err.getvalue())
+        self.assertEqual('2', str(self.ctx.exception))
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_validate_command_11(self, mock_out, mock_err):
+        files = sorted(glob.glob('vehicles*.xml')) * 3
+        self.run_validate('--jobs=2', '--schema=vehicles.xsd', *files)
+        self.assertEqual(mock_err.getvalue(), '')
+        lines = mock_out.getvalue().splitlines()
+        self.assertListEqual([x.split()[0] for x in lines[:-1]], files)
+        self.assertIn("vehicles-2_errors.xml is not valid", lines)
+        self.assertIn("vehicles.xml is valid", lines)
+        self.assertRegex(lines[-1], r'^%d files validated in .* files/s\), 18 errors$' % len(files))
+        self.assertEqual('18', str(self.ctx.exception))
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_validate_command_12(self, mock_out, mock_err):
+        files = ['vehicles.xml', 'unknown.xml', 'vehicles-2_errors.xml']
+        self.run_validate('--jobs=2', *files)
+        self.assertEqual(mock_err.getvalue(), '')
+        lines = mock_out.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0], "vehicles.xml is valid")
+        self.assertIn("unknown.xml", lines[1])
+        self.assertEqual(lines[2], "vehicles-2_errors.xml is not valid")
+        self.assertTrue(lines[3].startswith("3 files validated in "))
+        self.assertEqual('3', str(self.ctx.exception))
+
+        self.run_validate('--schema=unknown.xsd', 'vehicles.xml')
+        self.assertIn("unknown.xsd", mock_out.getvalue().splitlines()[-1])
+        self.assertEqual('1', str(self.ctx.exception))
+
     @patch('sys.stderr', new_callable=io.StringIO)
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_xml2json_command_01(self, mock_out, mock_err):
@@ -149,6 +205,49 @@ class TestConsoleScripts(unittest.TestCase):
         self.assertEqual(msg, mock_out.getvalue())
         self.assertEqual('2', str(self.ctx.exception))
 
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_xml2json_command_04(self, mock_out, mock_err):
+        self.run_xml2json('--ndjson', '--path=vh:cars/vh:car', 'vehicles.xml')
+        with open('vehicles.ndjson') as fp:
+            lines = fp.read().splitlines()
+        os.unlink('vehicles.ndjson')
+
+        self.assertEqual(mock_err.getvalue(), '')
+        self.assertEqual("vehicles.xml converted to vehicles.ndjson\n", mock_out.getvalue())
+        self.assertEqual('0', str(self.ctx.exception))
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0]),
+                         {'@make': 'Porsche', '@model': '911'})
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_xml2json_command_05(self, mock_out, mock_err):
+        self.run_xml2json('--ndjson', 'vehicles.xml')
+        self.assertEqual(mock_out.getvalue(), '')
+        self.assertIn("requires a record path", mock_err.getvalue())
+        self.assertEqual('2', str(self.ctx.exception))
+
+    def test_to_ndjson_counts_errors(self):
+        schema = XMLSchema("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="item" type="xs:int" maxOccurs="unbounded"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>""")
+        xml_data = '<root>{}</root>'.format(''.join(
+            '<item>{}</item>'.format('x' if k % 2 else k) for k in range(1000)
+        ))
+
+        fp = io.StringIO()
+        num_errors = to_ndjson(io.StringIO(xml_data), fp, 'item', schema=schema)
+        self.assertEqual(num_errors, 500)
+        self.assertEqual(len(fp.getvalue().splitlines()), 1000)
+
     @patch('sys.stderr', new_callable=io.StringIO)
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_json2xml_command_01(self, mock_out, mock_err):
@@ -11,10 +11,11 @@
 import unittest
 import os
 import platform
+from io import StringIO
 import lxml.etree
 
 from xmlschema.etree import ElementTree, PyElementTree, ParseError, \
-    SafeXMLParser, etree_tostring, etree_getpath, etree_iter_location_hints, \
+    SafeXMLParser, safe_iterparse, etree_tostring, etree_getpath, etree_iter_location_hints, \
     etree_iterpath, etree_elements_assert_equal, prune_etree
 
 TEST_CASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_cases/')
@@ -178,6 +179,47 @@ class TestElementTree(unittest.TestCase):
         self.assertEqual("Unparsed entities are forbidden (entity_name='logo_file')",
                          str(ctx.exception))
 
+    def test_safe_iterparse(self):
+        xml_file = casepath('resources/unused_external_entity.xml')
+        with self.assertRaises(ParseError) as ctx:
+            list(safe_iterparse(xml_file))
+        self.assertEqual("Entities are forbidden (entity_name='ee')", str(ctx.exception))
+
+        xml_file = casepath('resources/unused_unparsed_entity.xml')
+        with open(xml_file, 'rb') as fp:
+            with self.assertRaises(ParseError) as ctx:
+                list(safe_iterparse(fp))
+        self.assertEqual("Unparsed entities are forbidden (entity_name='logo_file')",
+                         str(ctx.exception))
+
+        xml_file = casepath('examples/vehicles/vehicles.xml')
+        events = [(e, getattr(n, 'tag', n)) for e, n in ElementTree.iterparse(xml_file)]
+        self.assertListEqual(
+            [(e, getattr(n, 'tag', n)) for e, n in safe_iterparse(xml_file)], events
+        )
+        events = [(e, getattr(n, 'tag', n))
+                  for e, n in ElementTree.iterparse(xml_file, ('start-ns', 'start'))]
+        self.assertListEqual(
+            [(e, getattr(n, 'tag', n)) for e, n in safe_iterparse(xml_file, ('start-ns', 'start'))],
+            events
+        )
+
+        # Entities are forbidden also if the DTD is split between more chunks
+        xml_data = '<!DOCTYPE root [<!ENTITY e "abc">{}]>\n<root>&e;</root>'.format(' ' * 40000)
+        with self.assertRaises(ParseError) as ctx:
+            list(safe_iterparse(StringIO(xml_data)))
+        self.assertEqual("Entities are forbidden (entity_name='e')", str(ctx.exception))
+
+        with self.assertRaises(ParseError) as ctx:
+            list(safe_iterparse(StringIO('<root><a></root>')))
+        self.assertEqual(ctx.exception.position, (1, 11))
+
+        root = None
+        for _, root in safe_iterparse(StringIO('<root>&amp;</root>')):
+            pass
+        self.assertIsInstance(root, ElementTree.Element)
+        self.assertEqual(root.text, '&')
+
     def test_etree_iterpath(self):
         root = ElementTree.XML('<a><b1><c1/><c2/></b1><b2/><b3><c3/></b3></a>')
 
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2016-2020, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""Tests concerning the profiling of XSD components"""
+import unittest
+import os
+import json
+
+from xmlschema import XMLSchema10, ComponentProfiler
+from xmlschema.exceptions import XMLSchemaValueError
+from xmlschema.validators import XsdElement, XsdGroup, XsdAtomicRestriction, XsdFacet
+
+
+TEST_CASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_cases/')
+
+
+def casepath(relative_path):
+    return os.path.join(TEST_CASES_DIR, relative_path)
+
+
+class TestComponentProfiler(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.schema = XMLSchema10("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="item" type="itemType" maxOccurs="unbounded"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+              <xs:simpleType name="itemType">
+                <xs:restriction base="xs:int">
+                  <xs:maxInclusive value="10"/>
+                </xs:restriction>
+              </xs:simpleType>
+            </xs:schema>""")
+
+    def test_instrumentation(self):
+        iter_decode = XsdElement.__dict__['iter_decode']
+        call = XsdFacet.__dict__['__call__']
+
+        profiler = ComponentProfiler()
+        self.assertFalse(profiler.enabled)
+        with profiler:
+            self.assertTrue(profiler.enabled)
+            self.assertIsNot(XsdElement.__dict__['iter_decode'], iter_decode)
+            self.assertIsNot(XsdFacet.__dict__['__call__'], call)
+            self.assertEqual(XsdElement.iter_decode.__name__, 'iter_decode')
+
+            with self.assertRaises(RuntimeError):
+                ComponentProfiler().enable()
+
+        self.assertFalse(profiler.enabled)
+        self.assertIs(XsdElement.__dict__['iter_decode'], iter_decode)
+        self.assertIs(XsdFacet.__dict__['__call__'], call)
+        self.assertEqual(profiler.stats, {})
+
+    def test_statistics(self):
+        xml_data = '<root><item>1</item><item>20</item><item>3</item></root>'
+        with ComponentProfiler() as profiler:
+            errors = list(self.schema.iter_errors(xml_data))
+        self.assertEqual(len(errors), 1)
+
+        stats = {id(s.component): s for s in profiler.get_stats()}
+        item = self.schema.elements['root'].type.content[0]
+        self.assertEqual(stats[id(item)].calls, 3)
+        self.assertEqual(stats[id(item)].errors, 1)
+        self.assertEqual(stats[id(self.schema.elements['root'])].calls, 1)
+        self.assertEqual(stats[id(self.schema.elements['root'])].errors, 1)
+
+        item_type = self.schema.types['itemType']
+        self.assertIsInstance(item_type, XsdAtomicRestriction)
+        self.assertEqual(stats[id(item_type)].calls, 3)
+        self.assertEqual(stats[id(item_type.validators[0])].calls, 3)
+        self.assertEqual(stats[id(item_type.validators[0])].errors, 1)
+
+        for s in stats.values():
+            self.assertGreaterEqual(s.cumtime, s.tottime)
+            self.assertGreaterEqual(s.tottime, 0.0)
+
+        root_stats = stats[id(self.schema.elements['root'])]
+        self.assertGreaterEqual(root_stats.cumtime, sum(
+            s.cumtime for s in stats.values() if isinstance(s.component, XsdGroup)
+        ))
+
+        self.assertListEqual(profiler.get_stats(sort_by='calls', limit=1),
+                             [max(stats.values(), key=lambda x: x.calls)])
+        with self.assertRaises(XMLSchemaValueError):
+            profiler.get_stats(sort_by='name')
+
+        profiler.clear()
+        self.assertListEqual(profiler.get_stats(), [])
+
+    def test_decode_and_encode(self):
+        xml_data = '<root><item>1</item><item>2</item></root>'
+        with ComponentProfiler() as profiler:
+            obj = self.schema.decode(xml_data)
+            self.schema.encode(obj, path='root')
+
+        self.assertEqual(obj, {'item': [1, 2]})
+        stats = {id(s.component): s for s in profiler.get_stats()}
+        self.assertEqual(stats[id(self.schema.elements['root'])].calls, 2)
+        self.assertEqual(stats[id(self.schema)].calls, 2)
+
+    def test_export(self):
+        vh_schema = XMLSchema10(casepath('examples/vehicles/vehicles.xsd'))
+        with ComponentProfiler() as profiler:
+            vh_schema.to_dict(casepath('examples/vehicles/vehicles.xml'))
+
+        lines = profiler.format_table(limit=3).split('\n')
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0].split(), ['calls', 'errors', 'tottime', 'cumtime', 'component'])
+
+        data = json.loads(profiler.to_json(sort_by='cumtime'))
+        self.assertEqual(len(data), len(profiler.stats))
+        self.assertEqual(data[0]['class'], 'XMLSchema10')
+        self.assertEqual(set(data[0]), {'component', 'class', 'name', 'calls',
+                                        'errors', 'tottime', 'cumtime'})
+        self.assertTrue({'vh:car', 'vh:bike'}.issubset(x['name'] for x in data))
+
+
+if __name__ == '__main__':
+    import platform
+    header_template = "Test xmlschema profiling with Python {} on {}"
+    header = header_template.format(platform.python_version(), platform.platform())
+    print('{0}\n{1}\n{0}'.format("*" * len(header), header))
+
+    unittest.main()
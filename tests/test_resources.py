@@ -27,10 +27,10 @@ except ImportError:
 
 from xmlschema import fetch_namespaces, fetch_resource, normalize_url, \
     fetch_schema, fetch_schema_locations, XMLResource, XMLResourceError, XMLSchema
-from xmlschema.etree import ElementTree, etree_element, py_etree_element, is_etree_element
+from xmlschema.etree import ElementTree, etree_element, is_etree_element
 from xmlschema.namespaces import XSD_NAMESPACE
 from xmlschema.resources import is_url, is_local_url, is_remote_url, \
-    url_path_is_file, normalize_locations, LazySelector
+    url_path_is_file, normalize_locations, LazySelector, DEFUSE_MODES
 from xmlschema.testing import SKIP_REMOTE_TESTS
 
 
@@ -527,7 +527,7 @@ class TestResources(unittest.TestCase):
         self.assertRaises(TypeError, XMLResource, self.vh_xml_file, defuse=None)
         self.assertIsInstance(resource.root, etree_element)
         resource = XMLResource(self.vh_xml_file, defuse='always', lazy=True)
-        self.assertIsInstance(resource.root, py_etree_element)
+        self.assertIsInstance(resource.root, etree_element)
 
         xml_file = casepath('resources/with_entity.xml')
         self.assertIsInstance(XMLResource(xml_file, lazy=True), XMLResource)
@@ -588,6 +588,65 @@ class TestResources(unittest.TestCase):
         with self.assertRaises(TypeError):
             XMLResource(self.vh_xml_file, lazy='1')
 
+    @unittest.skipIf(lxml_etree is None, "Skip: lxml is not available.")
+    def test_xml_resource_lazy_backend(self):
+        resource = XMLResource(self.vh_xml_file, lazy=True)
+        self.assertEqual(resource.lazy_backend, 'etree')
+        self.assertRaises(ValueError, XMLResource, self.vh_xml_file, lazy_backend='sax')
+        self.assertRaises(TypeError, XMLResource, self.vh_xml_file, lazy_backend=None)
+
+        resource = XMLResource(XMLSchema.meta_schema.source.url, lazy=True)
+        lxml_resource = XMLResource(XMLSchema.meta_schema.source.url,
+                                    lazy=True, lazy_backend='lxml')
+        self.assertEqual(lxml_resource.lazy_backend, 'lxml')
+        self.assertIsInstance(lxml_resource.root, lxml_etree._Element)
+
+        for args in [(), ('{%s}complexType' % XSD_NAMESPACE,)]:
+            nsmap, lxml_nsmap = {}, {}
+            self.assertListEqual([x.tag for x in resource.iter(*args, nsmap=nsmap)],
+                                 [x.tag for x in lxml_resource.iter(*args, nsmap=lxml_nsmap)])
+            self.assertDictEqual(nsmap, lxml_nsmap)
+        self.assertIs(lxml_resource.root.getparent(), None)
+
+        for mode in range(1, 5):
+            ancestors, lxml_ancestors = [], []
+            for elem, lxml_elem in zip(
+                    resource.iter_depth(mode, ancestors=ancestors),
+                    lxml_resource.iter_depth(mode, ancestors=lxml_ancestors)):
+                self.assertEqual(elem.tag, lxml_elem.tag)
+                self.assertEqual(elem.attrib, dict(lxml_elem.attrib))
+                self.assertListEqual([e.tag for e in ancestors],
+                                     [e.tag for e in lxml_ancestors])
+
+        # The processed siblings are deleted only if the pruned root is not yielded
+        self.assertEqual(len(next(lxml_resource.iter_depth(mode=2))), 156)
+        children = [len(lxml_resource.root) for _ in lxml_resource.iter_depth()]
+        self.assertEqual(len(children), 156)
+        self.assertLess(max(children), 40)  # only the elements of a chunk of data
+
+        namespaces = {'xs': XSD_NAMESPACE}
+        for path in ['.', '*', 'xs:complexType', 'xs:complexType[2]',
+                     'xs:complexType/xs:sequence', '/xs:schema/xs:element']:
+            self.assertListEqual(
+                [(x.tag, x.attrib) for x in resource.iterfind(path, namespaces)],
+                [(x.tag, dict(x.attrib)) for x in lxml_resource.iterfind(path, namespaces)]
+            )
+
+        schema = XMLSchema(self.vh_xsd_file)
+        for defuse in DEFUSE_MODES:
+            resource = XMLResource(self.vh_xml_file, defuse=defuse,
+                                   lazy=True, lazy_backend='lxml')
+            self.assertTrue(schema.is_valid(resource))
+            self.assertTrue(schema.is_valid(resource, workers=2))
+
+        xml_file = casepath('resources/with_entity.xml')
+        with self.assertRaises(ElementTree.ParseError) as ctx:
+            XMLResource(xml_file, defuse='always', lazy=True, lazy_backend='lxml')
+        self.assertEqual("Entities are forbidden (entity_name='e')", str(ctx.exception))
+
+        with self.assertRaises(ElementTree.ParseError):
+            XMLResource(StringIO('<a><b></a>'), lazy=True, lazy_backend='lxml')
+
     def test_xml_resource_base_url(self):
         resource = XMLResource(self.vh_xml_file)
         base_url = resource.base_url
@@ -923,6 +982,40 @@ class TestResources(unittest.TestCase):
         self.assertListEqual(resource.findall('*/*'), root[0][:])
         self.assertListEqual(resource.findall('*/c3'), [])
 
+    def test_xml_resource_iter_records(self):
+        xml_data = '<a><b1><c1/><c2 x="1"/></b1><b2><c1/><d1/></b2><b3/></a>'
+        resource = XMLResource(xml_data)
+        self.assertListEqual(list(resource.iter_records('*/c1')),
+                             [resource.root[0][0], resource.root[1][0]])
+
+        resource = XMLResource(StringIO(xml_data), lazy=True)
+        ancestors = []
+        records = []
+        for elem in resource.iter_records('*/c1', ancestors=ancestors):
+            records.append((elem.tag, [e.tag for e in ancestors]))
+        self.assertListEqual(records, [('c1', ['a', 'b1']), ('c1', ['a', 'b2'])])
+        self.assertEqual(len(resource.root), 0)  # processed subtrees are removed
+
+        resource = XMLResource(StringIO(xml_data), lazy=True)
+        self.assertListEqual([e.tag for e in resource.iter_records('/a/*')], ['b1', 'b2', 'b3'])
+        self.assertListEqual([e.tag for e in resource.iter_records('b2/*')], ['c1', 'd1'])
+        self.assertListEqual([e.tag for e in resource.iter_records('./b1/c2')], ['c2'])
+        self.assertListEqual([e.tag for e in resource.iter_records('.')], ['a'])
+        self.assertListEqual(list(resource.iter_records('/b1/c2')), [])
+
+        for path in ('b1[1]', '//c1', '*/@x', 'b1/../b2'):
+            with self.assertRaises(XMLResourceError):
+                list(resource.iter_records(path))
+
+        resource = XMLResource(self.col_xml_file, lazy=True)
+        namespaces = {'col': 'http://example.com/ns/collection'}
+        tags = [e.tag for e in resource.iter_records('/col:collection/object', namespaces)]
+        self.assertListEqual(tags, ['object', 'object'])
+        tags = [e.tag for e in resource.iter_records('/col:collection/object')]
+        self.assertListEqual(tags, ['object', 'object'])
+        with self.assertRaises(XMLResourceError):
+            list(resource.iter_records('/foo:collection/object'))
+
     def test_xml_resource_nsmap_tracking(self):
         xsd_file = casepath('examples/collection/collection4.xsd')
         resource = XMLResource(xsd_file)
@@ -937,6 +1030,26 @@ class TestResources(unittest.TestCase):
                 self.assertEqual(dict(nsmap), {'xs': 'http://www.w3.org/2001/XMLSchema',
                                                '': 'http://example.com/ns/collection'})
 
+        # Namespace scopes are stored only for the root and the declaring elements
+        self.assertListEqual(list(resource._nsmap), [root, root[2][0]])
+
+        nsmap.clear()
+        tag = '{http://www.w3.org/2001/XMLSchema}element'
+        for elem in resource.iter(tag, nsmap=nsmap):
+            self.assertEqual(elem.tag, tag)
+            if elem in root[2][0]:
+                self.assertEqual(dict(nsmap)[''], 'http://www.w3.org/2001/XMLSchema')
+            else:
+                self.assertEqual(dict(nsmap)[''], 'http://example.com/ns/collection')
+
+        nsmap.clear()
+        self.assertIs(resource.find('xs:complexType/xs:sequence/xs:element', {'xs': XSD_NAMESPACE},
+                                    nsmap=nsmap), root[2][0][0])
+        self.assertEqual(dict(nsmap)[''], 'http://www.w3.org/2001/XMLSchema')
+
+        subresource = resource.subresource(root[2])
+        self.assertListEqual(list(subresource._nsmap), [root[2], root[2][0]])
+
         nsmap.clear()
         resource._nsmap.clear()
         resource._nsmap[resource._root] = []
@@ -10,6 +10,7 @@
 #
 import unittest
 import os
+import io
 from decimal import Decimal
 import base64
 
@@ -561,6 +562,66 @@ class TestDecoding(XsdValidatorTestCase):
             validation='skip', path='/col:collection/object/author', lazy=True, **kwargs
         ))
 
+    def test_stream_decode(self):
+        objects = self.col_schema.decode(self.col_xml_file, path='object')
+        self.assertEqual(len(objects), 2)
+
+        records = list(self.col_schema.stream_decode(self.col_xml_file, 'object'))
+        self.assertListEqual(records, objects)
+        namespaces = {'col': 'http://example.com/ns/collection'}
+        records = list(self.col_schema.stream_decode(
+            self.col_xml_file, '/col:collection/object', namespaces=namespaces
+        ))
+        self.assertListEqual(records, objects)
+
+        resource = xmlschema.XMLResource(self.col_xml_file)
+        records = list(self.col_schema.stream_decode(resource, 'object'))
+        self.assertListEqual(records, objects)
+        self.assertEqual(len(resource.root), 2)
+
+        authors = self.col_schema.decode(self.col_xml_file, path='object/author')
+        records = list(self.col_schema.stream_decode(self.col_xml_file, '*/author'))
+        self.assertListEqual(records, authors)
+
+        with self.assertRaises(xmlschema.XMLResourceError):
+            list(self.col_schema.stream_decode(self.col_xml_file, 'object[1]'))
+
+        schema = self.get_schema("""
+            <xs:element name="root">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:element name="record" maxOccurs="unbounded">
+                    <xs:complexType>
+                      <xs:attribute name="id" type="xs:ID"/>
+                      <xs:attribute name="ref" type="xs:IDREF"/>
+                      <xs:attribute name="key" type="xs:int"/>
+                    </xs:complexType>
+                  </xs:element>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:key name="recordKey">
+                <xs:selector xpath="record"/>
+                <xs:field xpath="@key"/>
+              </xs:key>
+            </xs:element>""")
+
+        xml_data = '<root><record id="a" key="1"/><record id="b" key="2" ref="a"/></root>'
+        records = list(schema.stream_decode(io.StringIO(xml_data), 'record'))
+        self.assertListEqual(records, [{'@id': 'a', '@key': 1},
+                                       {'@id': 'b', '@key': 2, '@ref': 'a'}])
+
+        xml_data = '<root><record id="a" key="1"/><record id="a" key="1" ref="c"/></root>'
+        results = list(schema.stream_decode(io.StringIO(xml_data), 'record'))
+        errors = [str(e.reason) for e in results if isinstance(e, XMLSchemaValidationError)]
+        self.assertEqual(len(results), 5)
+        self.assertEqual(len(errors), 3)
+        self.assertIn("Duplicated xs:ID value 'a'", errors)
+        self.assertIn("IDREF 'c' not found in XML document", errors)
+        self.assertTrue(any(e.startswith("duplicated value (1,)") for e in errors))
+
+        with self.assertRaises(XMLSchemaValidationError):
+            list(schema.stream_decode(io.StringIO(xml_data), 'record', validation='strict'))
+
     def test_path(self):
         xt = ElementTree.parse(self.vh_xml_file)
         xd = self.vh_schema.to_dict(xt, '/vh:vehicles/vh:cars', namespaces=self.vh_namespaces)
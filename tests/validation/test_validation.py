@@ -9,8 +9,11 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import unittest
+import unittest.mock
+import io
 import os
 import sys
+import threading
 
 try:
     import lxml.etree as lxml_etree
@@ -19,6 +22,7 @@ except ImportError:
 
 import xmlschema
 from xmlschema import XMLSchemaValidationError
+from xmlschema.exceptions import XMLSchemaValueError
 
 from xmlschema.etree import ElementTree
 from xmlschema.validators import XMLSchema11
@@ -109,6 +113,172 @@ class TestValidation(XsdValidatorTestCase):
         self.assertIsInstance(errors[0], XMLSchemaValidationError)
         self.assertIsInstance(errors[1], XMLSchemaValidationError)
 
+    def test_iter_validate_api(self):
+        vh_2_file = self.casepath('examples/vehicles/vehicles-2_errors.xml')
+        self.assertListEqual(list(self.vh_schema.iter_validate(self.vh_xml_file)), [])
+
+        errors = list(self.vh_schema.iter_validate(vh_2_file))
+        self.assertEqual(len(errors), 2)
+        self.assertListEqual(
+            [e.reason for e in errors],
+            [e.reason for e in self.vh_schema.iter_decode(vh_2_file)
+             if isinstance(e, XMLSchemaValidationError)]
+        )
+
+        schema = self.get_schema("""
+            <xs:element name="root">
+              <xs:complexType mixed="true">
+                <xs:sequence>
+                  <xs:element name="a" type="xs:decimal" minOccurs="0"/>
+                </xs:sequence>
+                <xs:attribute name="b" type="xs:date"/>
+              </xs:complexType>
+            </xs:element>""")
+
+        xsd_element = schema.elements['root']
+        elem = ElementTree.XML('<root b="2020-01-01">text<a>10.0</a>tail</root>')
+        self.assertListEqual(list(xsd_element.iter_validate(elem)), [])
+        self.assertListEqual(
+            list(xsd_element.iter_decode(elem, validation_only=True)), [None]
+        )
+        self.assertListEqual(list(xsd_element.attributes.iter_validate({'b': '2020-01-01'})), [])
+
+        elem = ElementTree.XML('<root b="2020-13-01"><a>ten</a></root>')
+        self.assertEqual(len(list(xsd_element.iter_validate(elem))), 2)
+        self.assertFalse(schema.is_valid(elem))
+
+    def test_parallel_validation(self):
+        vh_2_file = self.casepath('examples/vehicles/vehicles-2_errors.xml')
+        source = xmlschema.XMLResource(self.vh_xml_file, lazy=True)
+        self.assertListEqual(list(self.vh_schema.iter_errors(source, workers=2)), [])
+        self.assertTrue(xmlschema.is_valid(self.vh_xml_file, lazy=True, workers=2))
+
+        source = xmlschema.XMLResource(vh_2_file, lazy=True)
+        errors = list(self.vh_schema.iter_errors(source, workers=2))
+        self.assertListEqual(
+            [e.reason for e in errors],
+            [e.reason for e in self.vh_schema.iter_errors(vh_2_file)]
+        )
+
+        schema = self.get_schema("""
+            <xs:element name="root">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:element name="item" maxOccurs="unbounded">
+                    <xs:complexType>
+                      <xs:attribute name="id" type="xs:ID"/>
+                      <xs:attribute name="key" type="xs:int"/>
+                    </xs:complexType>
+                  </xs:element>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:key name="itemKey">
+                <xs:selector xpath="item"/>
+                <xs:field xpath="@key"/>
+              </xs:key>
+            </xs:element>""")
+
+        def get_source(dup_id=None, dup_key=None):
+            items = ''.join('<item id="i{}" key="{}"/>'.format(
+                dup_id if k == 250 and dup_id is not None else k,
+                dup_key if k == 350 and dup_key is not None else k,
+            ) for k in range(400))
+            return xmlschema.XMLResource('<root>{}</root>'.format(items), lazy=True)
+
+        self.assertListEqual(list(schema.iter_errors(get_source(), workers=3)), [])
+
+        for kwargs in ({'dup_id': 10}, {'dup_id': 210}, {'dup_key': 20}, {'dup_key': 320}):
+            errors = list(schema.iter_errors(get_source(**kwargs), workers=3))
+            self.assertListEqual(
+                [e.reason for e in errors],
+                [e.reason for e in schema.iter_errors(get_source(**kwargs))]
+            )
+            self.assertEqual(len(errors), 1)
+
+    def test_validate_many(self):
+        vh_2_file = self.casepath('examples/vehicles/vehicles-2_errors.xml')
+        sources = [self.vh_xml_file, vh_2_file, xmlschema.XMLResource(self.vh_xml_file)]
+        expected = [[e.reason for e in self.vh_schema.iter_errors(x)] for x in sources]
+        self.assertListEqual([len(x) for x in expected], [0, 2, 0])
+
+        results = self.vh_schema.validate_many(sources)
+        self.assertListEqual([[e.reason for e in x] for x in results], expected)
+
+        results = list(self.vh_schema.iter_validate_many(iter(sources), max_errors=1))
+        self.assertListEqual([len(x) for x in results], [0, 1, 0])
+        self.assertListEqual(self.vh_schema.validate_many([]), [])
+
+        results = self.vh_schema.validate_many(sources * 3, workers=2, use_threads=True)
+        self.assertListEqual([[e.reason for e in x] for x in results], expected * 3)
+
+        sources = [self.vh_xml_file, vh_2_file] * 3
+        results = self.vh_schema.validate_many(sources, workers=2)
+        self.assertListEqual([[e.reason for e in x] for x in results], expected[:2] * 3)
+
+        schema = self.get_schema("""
+            <xs:element name="root">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:element name="item" type="xs:int" maxOccurs="unbounded"/>
+                </xs:sequence>
+              </xs:complexType>
+            </xs:element>""")
+
+        sources = ['<root><item>{}</item></root>'.format(k) for k in (1, 'x', 3)]
+        sources.append('<unknown/>')
+        results = schema.validate_many(sources)
+        self.assertListEqual([len(x) for x in results], [0, 1, 0, 1])
+        self.assertIsInstance(results[1][0], XMLSchemaValidationError)
+        self.assertIn('is not an element of the schema', results[3][0].reason)
+
+    def test_max_errors_argument(self):
+        vh_2_file = self.casepath('examples/vehicles/vehicles-2_errors.xml')
+        errors = list(self.vh_schema.iter_errors(vh_2_file, max_errors=1))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(len(list(self.vh_schema.iter_errors(vh_2_file, max_errors=5))), 2)
+        self.assertEqual(len(list(xmlschema.iter_errors(vh_2_file, max_errors=1))), 1)
+
+        with self.assertRaises(XMLSchemaValueError):
+            list(self.vh_schema.iter_errors(vh_2_file, max_errors=0))
+
+        data, errors = self.vh_schema.decode(vh_2_file, validation='lax', max_errors=1)
+        self.assertIsNone(data)
+        self.assertEqual(len(errors), 1)
+
+        data, errors = self.vh_schema.decode(vh_2_file, validation='lax', max_errors=2)
+        self.assertIsNone(data)
+        self.assertEqual(len(errors), 2)
+
+        data, errors = self.vh_schema.decode(vh_2_file, validation='lax', max_errors=3)
+        self.assertIsInstance(data, dict)
+        self.assertEqual(len(errors), 2)
+
+        schema = self.get_schema("""
+            <xs:element name="root">
+              <xs:complexType>
+                <xs:sequence>
+                  <xs:element name="item" type="xs:int" maxOccurs="unbounded"/>
+                </xs:sequence>
+              </xs:complexType>
+            </xs:element>""")
+
+        xml_data = '<root>{}</root>'.format('<item>x</item>' * 10000)
+        fp = io.StringIO(xml_data)
+        source = xmlschema.XMLResource(fp, lazy=True)
+        errors = list(schema.iter_errors(source, max_errors=3))
+        self.assertEqual(len(errors), 3)
+        self.assertLess(fp.tell(), len(xml_data))  # the parsing is stopped
+
+        source = xmlschema.XMLResource(
+            '<root>{}</root>'.format('<item>x</item>' * 1000), lazy=True
+        )
+        errors = list(schema.iter_errors(source, max_errors=3, workers=2))
+        self.assertEqual(len(errors), 3)
+
+        document = xmlschema.XmlDocument('<root><item>x</item><item>y</item></root>',
+                                         schema=schema, validation='lax', max_errors=1)
+        self.assertEqual(len(document.errors), 1)
+
     def test_max_depth_argument(self):
         schema = self.schema_class(self.col_xsd_file)
         self.assertEqual(
@@ -230,6 +400,103 @@ class TestValidation11(TestValidation):
                                      "   <node node-id='2' colour='red'>beta</node>\n"
                                      "</tree>"))
 
+    def test_assertions_context(self):
+        schema = self.check_schema("""
+        <xs:element name="root">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="item" maxOccurs="unbounded">
+                <xs:complexType>
+                  <xs:attribute name="id" type="xs:int"/>
+                  <xs:assert test="@id le ../@max"/>
+                </xs:complexType>
+              </xs:element>
+            </xs:sequence>
+            <xs:attribute name="max" type="xs:int"/>
+            <xs:assert test="count(item) le @max"/>
+          </xs:complexType>
+        </xs:element>""")
+
+        self.assertTrue(schema.is_valid('<root max="3"><item id="1"/><item id="3"/></root>'))
+        errors = list(schema.iter_errors(
+            '<root max="2"><item id="1"/><item id="3"/><item id="4"/></root>'
+        ))
+        self.assertEqual(len(errors), 3)
+
+        context = None
+        assertion = schema.elements['root'].type.content[0].type.assertions[0]
+        original_call = assertion.__class__.__call__
+
+        def call(self_, elem, **kwargs):
+            nonlocal context
+            if context is None:
+                context = kwargs['assertion_context']
+            self.assertIs(kwargs['assertion_context'], context)
+            return original_call(self_, elem, **kwargs)
+
+        with unittest.mock.patch.object(assertion.__class__, '__call__', call):
+            self.assertTrue(schema.is_valid('<root max="9"><item id="1"/><item id="3"/></root>'))
+        self.assertIsNotNone(context)
+        self.assertIsNone(context.axis)
+
+    def test_concurrent_use(self):
+        # A built schema is shared by many threads for validation, decoding and
+        # encoding. The XHTML namespace is loaded on-demand by the lax wildcard.
+        schema_source = """
+        <xs:element name="root">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="item" maxOccurs="unbounded">
+                <xs:complexType>
+                  <xs:simpleContent>
+                    <xs:extension base="xs:int">
+                      <xs:attribute name="max" type="xs:int" use="required"/>
+                      <xs:assert test="$value le @max"/>
+                    </xs:extension>
+                  </xs:simpleContent>
+                </xs:complexType>
+              </xs:element>
+              <xs:any namespace="##other" processContents="lax" minOccurs="0"/>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>"""
+
+        xhtml_namespace = 'http://www.w3.org/1999/xhtml'
+        sources = [
+            '<root>{}<p xmlns="{}">text</p></root>'.format(
+                ''.join('<item max="{}">{}</item>'.format(k + j % 2, k + 1) for k in range(5)),
+                xhtml_namespace
+            ) for j in range(8)
+        ]
+        schema = self.get_schema(schema_source)
+        expected = [[e.reason for e in schema.iter_errors(x)] for x in sources[:2]] * 4
+        self.assertListEqual([len(x) for x in expected[:2]], [5, 0])
+
+        schema = self.get_schema(schema_source)
+        self.assertNotIn(xhtml_namespace, schema.maps.namespaces)
+        barrier = threading.Barrier(len(sources))
+        results = [None] * len(sources)
+
+        def worker(k):
+            barrier.wait()
+            errors = [e.reason for e in schema.iter_errors(sources[k])]
+            obj = schema.decode(sources[k], validation='skip')
+            elem = schema.encode(obj, path='root', validation='skip')
+            results[k] = errors, obj, elem.tag
+
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(len(sources))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIn(xhtml_namespace, schema.maps.namespaces)
+        self.assertEqual(len(schema.maps.namespaces[xhtml_namespace]), 1)
+        self.assertListEqual([x[0] for x in results], expected)
+        self.assertListEqual([x[2] for x in results], ['root'] * len(sources))
+        for k, (_, obj, _) in enumerate(results):
+            self.assertEqual(obj, schema.decode(sources[k], validation='skip'))
+
 
 if __name__ == '__main__':
     import platform
@@ -9,6 +9,10 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import unittest
+import unittest.mock
+import pickle
+
+from xmlschema.etree import ElementTree
 
 from xmlschema.validators import XMLSchema11
 from xmlschema.testing import XsdValidatorTestCase
@@ -48,6 +52,94 @@ class TestXsd11Elements(TestXsdElements):
 
     schema_class = XMLSchema11
 
+    def test_alternatives_predicates(self):
+        schema = self.check_schema("""
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+            xmlns:p="http://xmlschema.test/p">
+        <xs:element name="msg" type="msgType">
+          <xs:alternative test="@kind = 'a' and not(@p:flag)" type="aType"/>
+          <xs:alternative test="@size &gt; 10 or @size = -1" type="bType"/>
+          <xs:alternative test="@kind eq 'c' or (@p:flag)" type="cType"/>
+          <xs:alternative test="count(@*) = 0" type="emptyType"/>
+          <xs:alternative type="msgType"/>
+        </xs:element>
+        <xs:complexType name="msgType">
+          <xs:anyAttribute processContents="skip"/>
+        </xs:complexType>
+        <xs:complexType name="aType">
+          <xs:complexContent><xs:restriction base="msgType">
+            <xs:anyAttribute processContents="skip"/>
+          </xs:restriction></xs:complexContent>
+        </xs:complexType>
+        <xs:complexType name="bType">
+          <xs:complexContent><xs:restriction base="msgType">
+            <xs:anyAttribute processContents="skip"/>
+          </xs:restriction></xs:complexContent>
+        </xs:complexType>
+        <xs:complexType name="cType">
+          <xs:complexContent><xs:restriction base="msgType">
+            <xs:anyAttribute processContents="skip"/>
+          </xs:restriction></xs:complexContent>
+        </xs:complexType>
+        <xs:complexType name="emptyType">
+          <xs:complexContent><xs:restriction base="msgType">
+            <xs:anyAttribute processContents="skip"/>
+          </xs:restriction></xs:complexContent>
+        </xs:complexType>
+        </xs:schema>""")
+
+        xsd_element = schema.elements['msg']
+        alternatives = xsd_element.alternatives
+        self.assertIsNotNone(alternatives[0].predicate)
+        self.assertIsNotNone(alternatives[1].predicate)
+        self.assertIsNotNone(alternatives[2].predicate)
+        self.assertIsNone(alternatives[3].predicate)
+        self.assertIsNone(alternatives[4].predicate)
+
+        samples = [
+            {'kind': 'a'}, {'kind': 'a', '{http://xmlschema.test/p}flag': '1'},
+            {'kind': 'c'}, {'size': '11'}, {'size': ' 2e1 '}, {'size': '-1.0'},
+            {'size': 'INF'}, {'size': 'NaN'}, {'size': 'ten'}, {'size': '9'}, {},
+        ]
+        for attrib in samples:
+            elem = ElementTree.Element('msg', attrib)
+            for alt in alternatives[:3]:
+                with unittest.mock.patch.object(alt, 'predicate', None):
+                    expected = alt.test(elem)
+                self.assertEqual(alt.test(elem), expected, msg=(alt, attrib))
+
+        self.assertIs(xsd_element.get_type(ElementTree.Element('msg', {'kind': 'a'})),
+                      schema.types['aType'])
+        self.assertIs(xsd_element.get_type(ElementTree.Element('msg', {'size': 'x'})),
+                      schema.types['msgType'])
+        self.assertIs(xsd_element.get_type(ElementTree.Element('msg')),
+                      schema.types['emptyType'])
+        self.assertIs(xsd_element.get_type(ElementTree.Element('msg'), {'size': '12'}),
+                      schema.types['bType'])
+
+        pickled_schema = pickle.loads(pickle.dumps(schema))
+        self.assertIsNotNone(pickled_schema.elements['msg'].alternatives[0].predicate)
+
+    def test_assertions_predicates(self):
+        schema = self.check_schema("""
+        <xs:element name="item">
+          <xs:complexType>
+            <xs:attribute name="code" type="xs:token"/>
+            <xs:attribute name="qty" type="xs:int"/>
+            <xs:assert test="@code = 'A B' or not(@code)"/>
+            <xs:assert test="@qty = 1"/>
+          </xs:complexType>
+        </xs:element>""")
+
+        assertions = schema.elements['item'].type.assertions
+        self.assertIsNotNone(assertions[0].predicate)
+        self.assertIsNone(assertions[1].predicate)
+
+        self.assertTrue(schema.is_valid('<item code=" A  B " qty="1"/>'))
+        self.assertTrue(schema.is_valid('<item qty="1"/>'))
+        self.assertFalse(schema.is_valid('<item code="AB" qty="1"/>'))
+        self.assertFalse(schema.is_valid('<item code="A B" qty="2"/>'))
+
 
 if __name__ == '__main__':
     import platform
@@ -17,7 +17,7 @@ from xmlschema import XMLSchema, XMLResource
 from xmlschema.etree import ElementTree
 from xmlschema.validators.exceptions import XMLSchemaValidatorError, \
     XMLSchemaNotBuiltError, XMLSchemaModelDepthError, XMLSchemaValidationError, \
-    XMLSchemaChildrenValidationError
+    XMLSchemaChildrenValidationError, ValidationErrorRecord
 
 CASES_DIR = os.path.join(os.path.dirname(__file__), '../test_cases')
 
@@ -138,6 +138,50 @@ class TestValidatorExceptions(unittest.TestCase):
         self.assertEqual(ctx.exception.origin_url, xs.source.url)
         self.assertIsNone(XMLSchemaValidatorError(None, 'unknown error').origin_url)
 
+    def test_deferred_formatting(self):
+        schema = XMLSchema("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="a" type="xs:integer" maxOccurs="unbounded"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>""")
+
+        root = ElementTree.XML('<root><a>1</a><a>x</a><b/></root>')
+        errors = list(schema.iter_errors(root))
+        self.assertEqual(len(errors), 2)
+
+        error = errors[0]
+        self.assertIsNone(error.__dict__['_message'])
+        self.assertIsNone(error.__dict__['_path'])
+        self.assertIsNotNone(error.__dict__['_path_args'])
+        self.assertIsInstance(error, XMLSchemaValidationError)
+        self.assertEqual(error.path, '/root/a[2]')
+        self.assertIsNone(error.__dict__['_path_args'])
+        self.assertEqual(error.message, "failed validating %r with %r" % ('x', error.validator))
+
+        error = errors[1]
+        self.assertIsInstance(error, XMLSchemaChildrenValidationError)
+        self.assertIsNone(error.__dict__['_reason'])
+        self.assertEqual(error.reason, "Unexpected child with tag 'b' at position 3.")
+
+        record = error.to_record()
+        self.assertIsInstance(record, ValidationErrorRecord)
+        self.assertEqual(record, (error.validator, '/root', error.reason, None,
+                                  'XMLSchemaChildrenValidationError'))
+
+        error.path = '/foo'
+        self.assertEqual(error.path, '/foo')
+
+        # The path of an element of a lazy resource is calculated before pruning
+        resource = XMLResource(io.StringIO('<root><a>1</a><a>x</a><b/></root>'), lazy=True)
+        errors = list(schema.iter_errors(resource))
+        self.assertEqual([e.path for e in errors], ['/root/a[2]', '/root'])
+        self.assertEqual(errors[1].reason, "Unexpected child with tag 'b' at position 3.")
+
     def test_children_validation_error(self):
         schema = XMLSchema("""
             <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
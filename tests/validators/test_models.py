@@ -12,8 +12,9 @@
 import unittest
 import os.path
 
-from xmlschema import XMLSchema10, XMLSchema11
-from xmlschema.validators import XsdElement, ModelVisitor, XMLSchemaValidationError
+from xmlschema import XMLSchema10, XMLSchema11, etree_tostring
+from xmlschema.validators import XsdElement, ModelVisitor, ModelAutomaton, \
+    ModelDispatchTable, XMLSchemaValidationError
 from xmlschema.testing import XsdValidatorTestCase
 
 
@@ -1126,6 +1127,241 @@ class TestModelBasedSorting(XsdValidatorTestCase):
         self.assertListEqual(list(model.iter_collapsed_content(content)), content)
 
 
+class TestModelAutomaton(XsdValidatorTestCase):
+    TEST_CASES_DIR = os.path.join(os.path.dirname(__file__), '../test_cases')
+
+    def test_sequence_automaton(self):
+        schema = self.get_schema("""
+            <xs:element name="A" type="A_type" />
+            <xs:complexType name="A_type">
+                <xs:sequence>
+                    <xs:element name="B1" type="xs:string"/>
+                    <xs:element name="B2" type="xs:integer" minOccurs="0" maxOccurs="2"/>
+                    <xs:element name="B3" type="xs:boolean" maxOccurs="unbounded"/>
+                </xs:sequence>
+            </xs:complexType>
+            """)
+        group = schema.types['A_type'].content
+        automaton = ModelAutomaton(group)
+        self.assertIs(group.automaton, group.automaton)
+        self.assertIsInstance(group.automaton, ModelAutomaton)
+
+        b1, b2, b3 = group
+        self.assertEqual(automaton.match(['B1', 'B3']), [(b1, b1), (b3, b3)])
+        self.assertEqual(automaton.match(['B1', 'B2', 'B2', 'B3', 'B3']),
+                         [(b1, b1), (b2, b2), (b2, b2), (b3, b3), (b3, b3)])
+        self.assertIsNone(automaton.match(['B1', 'B2', 'B2', 'B2', 'B3']))
+        self.assertIsNone(automaton.match(['B1', 'B2']))
+        self.assertIsNone(automaton.match(['B3', 'B1']))
+        self.assertIsNone(automaton.match([]))
+
+    def test_nested_choice_automaton(self):
+        schema = self.get_schema("""
+            <xs:element name="root">
+                <xs:complexType>
+                    <xs:sequence minOccurs="0" maxOccurs="unbounded">
+                        <xs:group ref="group1" minOccurs="2" maxOccurs="unbounded"/>
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>
+            <xs:group name="group1">
+                <xs:choice>
+                    <xs:element name="a" maxOccurs="unbounded"/>
+                    <xs:element name="b"/>
+                    <xs:element name="c"/>
+                </xs:choice>
+            </xs:group>
+            """)
+        automaton = schema.elements['root'].type.content.automaton
+        self.assertIsNotNone(automaton)
+        self.assertEqual(len(automaton.match(['a', 'b', 'c', 'a'])), 4)
+        self.assertIsNotNone(automaton.match([]))
+        self.assertIsNone(automaton.match(['b']))
+        self.assertIsNone(automaton.match(['a', 'd']))
+
+    def test_not_compilable_models(self):
+        schema = self.get_schema("""
+            <xs:element name="A">
+                <xs:complexType>
+                    <xs:sequence>
+                        <xs:element name="B1"/>
+                        <xs:any namespace="##other" processContents="lax"/>
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>
+            <xs:element name="C">
+                <xs:complexType>
+                    <xs:all>
+                        <xs:element name="B1"/>
+                        <xs:element name="B2"/>
+                    </xs:all>
+                </xs:complexType>
+            </xs:element>
+            <xs:element name="D">
+                <xs:complexType>
+                    <xs:sequence>
+                        <xs:element name="B1" maxOccurs="5000"/>
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>
+            """)
+        self.assertIsNone(schema.elements['A'].type.content.automaton)
+        self.assertIsNone(schema.elements['C'].type.content.automaton)
+        self.assertIsNone(schema.elements['D'].type.content.automaton)
+        self.assertTrue(schema.is_valid('<C><B2/><B1/></C>'))
+
+    def test_substitution_groups(self):
+        schema = self.get_schema("""
+            <xs:element name="A">
+                <xs:complexType>
+                    <xs:sequence>
+                        <xs:element ref="head" maxOccurs="unbounded"/>
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>
+            <xs:element name="head" type="xs:string"/>
+            <xs:element name="member" type="xs:string" substitutionGroup="head"/>
+            """)
+        group = schema.elements['A'].type.content
+        head, member = schema.elements['head'], schema.elements['member']
+        self.assertEqual(group.automaton.match(['head', 'member']),
+                         [(group[0], group[0]), (group[0], member)])
+        xml_data = '<A><head>1</head><member>2</member></A>'
+        self.assertEqual(schema.decode(xml_data, compiled_models=True),
+                         schema.decode(xml_data))
+        self.assertIsNot(head, group[0])
+
+    def test_compiled_models_decoding_and_encoding(self):
+        schema = self.get_schema("""
+            <xs:element name="A" type="A_type" />
+            <xs:complexType name="A_type">
+                <xs:sequence>
+                    <xs:element name="B1" type="xs:string"/>
+                    <xs:element name="B2" type="xs:integer" minOccurs="0"/>
+                    <xs:element name="B3" type="xs:boolean"/>
+                </xs:sequence>
+            </xs:complexType>
+            """)
+        xml_data = '<A><B1>abc</B1><!-- comment --><B2>10</B2><B3>true</B3></A>'
+        self.assertEqual(schema.decode(xml_data, compiled_models=True),
+                         schema.decode(xml_data))
+
+        # Invalid content falls back to the model visitor for reporting errors
+        xml_data = '<A><B1>abc</B1><B3>true</B3><B2>10</B2></A>'
+        data, errors = schema.decode(xml_data, validation='lax', compiled_models=True)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual([e.reason for e in errors],
+                         [e.reason for e in schema.decode(xml_data, validation='lax')[1]])
+
+        data = {'B1': 'abc', 'B2': 10, 'B3': True}
+        self.assertEqual(
+            etree_tostring(schema.encode(data, path='A', compiled_models=True)),
+            etree_tostring(schema.encode(data, path='A'))
+        )
+
+
+class TestModelDispatchTable(XsdValidatorTestCase):
+
+    def test_dispatch_table(self):
+        schema = self.get_schema("""
+            <xs:element name="A">
+                <xs:complexType>
+                    <xs:choice maxOccurs="unbounded">
+                        <xs:element name="B1" type="xs:string"/>
+                        <xs:sequence>
+                            <xs:element name="B2" type="xs:integer"/>
+                            <xs:element name="B3" type="xs:integer" minOccurs="0"/>
+                        </xs:sequence>
+                        <xs:element ref="head"/>
+                        <xs:any namespace="##other" processContents="skip"/>
+                        <xs:element name="B4" type="xs:boolean"/>
+                    </xs:choice>
+                </xs:complexType>
+            </xs:element>
+            <xs:element name="head" type="xs:string"/>
+            <xs:element name="member" type="xs:string" substitutionGroup="head"/>
+            """)
+        group = schema.elements['A'].type.content
+        self.assertIsInstance(group.dispatch_table, ModelDispatchTable)
+        self.assertIs(group.dispatch_table, group.dispatch_table)
+
+        b1, sequence, head, wildcard, b4 = group
+        dispatch_table = group.dispatch_table
+        self.assertEqual(dispatch_table.positions,
+                         {b1: 0, sequence: 1, head: 2, wildcard: 3, b4: 4})
+        self.assertEqual(dispatch_table.choices,
+                         {'B1': [0], 'head': [2], 'member': [2], 'B4': [4]})
+        self.assertEqual(dispatch_table.others, [1, 3])
+
+        self.assertIsNone(dispatch_table.next_choice(b1, 'B1'))
+        self.assertEqual(dispatch_table.next_choice(b1, 'member'), 1)
+        self.assertEqual(dispatch_table.next_choice(head, 'B4'), 3)
+        self.assertIsNone(dispatch_table.next_choice(wildcard, 'B4'))
+        self.assertIsNone(dispatch_table.next_choice(b4, 'B1'))
+
+        self.assertIs(group.match_element('B3'), sequence[1])
+        self.assertIs(group.match_element('member'), head)
+        self.assertIs(group.match_element('{http://xmlschema.test/ns}C'), wildcard)
+        self.assertIsNone(group.match_element('C'))
+
+    def test_repeated_element_before_wildcard(self):
+        schema = self.get_schema("""
+            <xs:element name="root">
+                <xs:complexType>
+                    <xs:sequence>
+                        <xs:element name="a" type="xs:string"/>
+                        <xs:element name="b" type="xs:string"/>
+                        <xs:element name="a" type="xs:string"/>
+                        <xs:any namespace="##other" processContents="lax"/>
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>
+            """)
+        group = schema.elements['root'].type.content
+        self.assertEqual(group.dispatch_table.elements, {'a': (0, group[0]), 'b': (1, group[1])})
+        self.assertEqual(group.dispatch_table.wildcards, [(3, group[3])])
+
+        for name in ('a', 'b', '{http://x}foo', 'foo'):
+            linear_match = None
+            for xsd_element in group.iter_elements():
+                if xsd_element.is_matching(name, group=group):
+                    linear_match = xsd_element
+                    break
+            self.assertIs(group.match_element(name), linear_match)
+        self.assertIs(group.match_element('{http://x}foo'), group[3])
+
+        xml_data = '<root><b/><x:foo xmlns:x="http://x">1</x:foo></root>'
+        reasons = ["Unexpected child with tag 'b' at position 1. Tag a expected."]
+        self.assertListEqual([e.reason for e in schema.iter_errors(xml_data)], reasons)
+        data, errors = schema.decode(xml_data, validation='lax')
+        self.assertEqual(data, {'b': None})
+        self.assertListEqual([e.reason for e in errors], reasons)
+
+    def test_wide_choice_decoding_and_encoding(self):
+        names = ['B%d' % k for k in range(200)]
+        schema = self.get_schema("""
+            <xs:element name="A">
+                <xs:complexType>
+                    <xs:choice maxOccurs="unbounded">
+                        {}
+                    </xs:choice>
+                </xs:complexType>
+            </xs:element>
+            """.format('\n'.join('<xs:element name="%s" type="xs:int"/>' % name
+                                 for name in names)))
+
+        xml_data = '<A><B150>1</B150><B3>2</B3><B199>3</B199><B150>4</B150></A>'
+        self.assertEqual(schema.decode(xml_data),
+                         {'B150': [1, 4], 'B3': [2], 'B199': [3]})
+        self.assertEqual(schema.decode(xml_data),
+                         schema.decode(xml_data, compiled_models=True))
+        self.assertFalse(schema.is_valid('<A><B150>1</B150><C/></A>'))
+
+        data = {'B150': [1, 4], 'B3': [2], 'B199': [3]}
+        self.assertEqual(etree_tostring(schema.encode(data, path='A')),
+                         etree_tostring(schema.encode(data, path='A', compiled_models=True)))
+
+
 if __name__ == '__main__':
     import platform
     header_template = "Test xmlschema's XSD model groups with Python {} on {}"
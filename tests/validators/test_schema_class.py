@@ -16,12 +16,15 @@ import platform
 import glob
 import os
 import re
+import subprocess
+import sys
 
 from xmlschema import XMLSchemaParseError, XMLSchemaIncludeWarning, XMLSchemaImportWarning
 from xmlschema.etree import etree_element
-from xmlschema.namespaces import SCHEMAS_DIR
+from xmlschema.namespaces import SCHEMAS_DIR, XSD_NAMESPACE
 from xmlschema.qnames import XSD_ELEMENT, XSI_TYPE
 from xmlschema.validators import XMLSchema11
+from xmlschema.validators.schema import SchemaPathResolver
 from xmlschema.testing import SKIP_REMOTE_TESTS, XsdValidatorTestCase
 
 
@@ -53,6 +56,27 @@ class TestXMLSchema10(XsdValidatorTestCase):
         self.assertNotEqual(id(self.vh_schema.namespaces), id(schema.namespaces))
         self.assertNotEqual(id(self.vh_schema.maps), id(schema.maps))
 
+    def test_meta_schema_creation(self):
+        meta_schema = self.schema_class.meta_schema
+        self.assertIs(self.schema_class.meta_schema, meta_schema)
+        self.assertIs(self.vh_schema.meta_schema, meta_schema)
+        self.assertEqual(meta_schema.target_namespace, XSD_NAMESPACE)
+
+        class CustomXMLSchema(self.schema_class):
+            pass
+
+        lazy_meta_schema = CustomXMLSchema.__dict__['meta_schema']
+        self.assertIsNone(lazy_meta_schema.meta_schema)
+        self.assertEqual(lazy_meta_schema.url, meta_schema.url)
+        self.assertIsNot(CustomXMLSchema.meta_schema, meta_schema)
+        self.assertIsInstance(CustomXMLSchema(self.vh_xsd_file), CustomXMLSchema)
+
+        # Meta-schemas are not created at package import
+        script = "import xmlschema\n" \
+                 "for cls in (xmlschema.XMLSchema10, xmlschema.XMLSchema11):\n" \
+                 "    assert cls.__dict__['meta_schema'].meta_schema is None\n"
+        subprocess.check_call([sys.executable, '-c', script])
+
     def test_resolve_qname(self):
         schema = self.schema_class("""<xs:schema
             xmlns:xs="http://www.w3.org/2001/XMLSchema"
@@ -178,6 +202,30 @@ class TestXMLSchema10(XsdValidatorTestCase):
         for schema in vh_schema.maps.iter_schemas():
             self.assertIsInstance(schema.root, etree_element)
 
+    def test_schema_path_resolver(self):
+        vh_schema = self.schema_class(self.vh_xsd_file)
+        namespaces = {'vh': 'http://example.com/vehicles'}
+        resolver = SchemaPathResolver(vh_schema, '/vh:vehicles/vh:cars/*', namespaces, maxsize=2)
+        self.assertEqual(repr(resolver), 'SchemaPathResolver(schema=%r, '
+                                         "schema_path='/vh:vehicles/vh:cars/*')" % vh_schema)
+
+        car_tag = '{http://example.com/vehicles}car'
+        xsd_car = resolver.get_element(car_tag)
+        self.assertIs(xsd_car, vh_schema.find('vh:vehicles/vh:cars/vh:car', namespaces))
+        self.assertIs(resolver.get_element(car_tag), xsd_car)
+        self.assertIsNone(resolver.get_element('unknown'))
+
+        ancestors = [etree_element('{http://example.com/vehicles}vehicles'),
+                     etree_element('{http://example.com/vehicles}cars')]
+        xsd_ancestors = resolver.get_ancestors(ancestors)
+        self.assertEqual(xsd_ancestors, [vh_schema.elements['vehicles'],
+                                         vh_schema.find('vh:vehicles/vh:cars', namespaces)])
+        self.assertIs(resolver.get_ancestors(ancestors[:]), xsd_ancestors)
+        self.assertEqual(resolver.get_ancestors(ancestors[:1]), [vh_schema.elements['vehicles']])
+
+        resolver.get_element('{http://example.com/vehicles}bike')
+        self.assertEqual(list(resolver._elements), ['unknown', '{http://example.com/vehicles}bike'])
+
     def test_export_errors__issue_187(self):
         with self.assertRaises(ValueError) as ctx:
             self.vh_schema.export(target=self.vh_dir)
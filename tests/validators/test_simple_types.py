@@ -9,9 +9,11 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import unittest
+from decimal import Decimal
 
 from xmlschema import XMLSchemaParseError, XMLSchemaValidationError
-from xmlschema.qnames import XSD_LIST, XSD_UNION
+from xmlschema.qnames import XSD_LIST, XSD_UNION, XSD_ID, XSD_INT, XSD_QNAME, \
+    XSD_ENUMERATION
 from xmlschema.validators import XMLSchema11
 from xmlschema.testing import XsdValidatorTestCase
 
@@ -143,6 +145,155 @@ class TestXsdSimpleTypes(XsdValidatorTestCase):
                 </xs:restriction>
             </xs:simpleType>""")
 
+    def test_pattern_facets(self):
+        schema = self.check_schema("""
+        <xs:simpleType name="codeType">
+            <xs:restriction base="xs:string">
+                <xs:pattern value="[A-Z]{3}"/>
+                <xs:pattern value="\\d{2}(-\\d{2})?"/>
+                <xs:pattern value="x|y"/>
+            </xs:restriction>
+        </xs:simpleType>
+        """)
+        patterns = schema.types['codeType'].patterns
+        self.assertEqual(len(patterns), 3)
+        self.assertEqual(patterns._regex.pattern.count('^'), 1)
+
+        for value in ('EUR', '01', '01-02', 'x', 'y'):
+            self.assertTrue(schema.types['codeType'].is_valid(value))
+        for value in ('EU', 'EURO', '01-', 'xy', 'x\n', ''):
+            self.assertFalse(schema.types['codeType'].is_valid(value))
+
+        del patterns[0]
+        self.assertFalse(schema.types['codeType'].is_valid('EUR'))
+        self.assertTrue(schema.types['codeType'].is_valid('x'))
+        del patterns[0]
+        self.assertIs(patterns._regex, patterns.patterns[0])
+        self.assertFalse(schema.types['codeType'].is_valid('01'))
+        self.assertTrue(schema.types['codeType'].is_valid('y'))
+
+    def test_enumeration_facets(self):
+        schema = self.check_schema("""
+        <xs:simpleType name="codeType">
+            <xs:restriction base="xs:token">
+                {}
+            </xs:restriction>
+        </xs:simpleType>
+        <xs:simpleType name="amountType">
+            <xs:restriction base="xs:double">
+                <xs:enumeration value="1.5"/>
+                <xs:enumeration value="NaN"/>
+                <xs:enumeration value="INF"/>
+            </xs:restriction>
+        </xs:simpleType>
+        <xs:simpleType name="listType">
+            <xs:restriction>
+                <xs:simpleType>
+                    <xs:list itemType="xs:decimal"/>
+                </xs:simpleType>
+                <xs:enumeration value="1 2.0"/>
+                <xs:enumeration value="3"/>
+            </xs:restriction>
+        </xs:simpleType>
+        """.format('\n'.join('<xs:enumeration value="C%03d"/>' % k for k in range(500))))
+
+        code_type = schema.types['codeType']
+        self.assertEqual(len(code_type.enumeration), 500)
+        self.assertTrue(code_type.is_valid('C000'))
+        self.assertTrue(code_type.is_valid(' C499 '))
+        errors = code_type.decode('C500', validation='lax')[1]
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].reason, "invalid value 'C500', it must be one of "
+                                           "['C000', 'C001', 'C002', 'C003', 'C004', 'C005', "
+                                           "'C006', 'C007', 'C008', 'C009', ...] (500 values)")
+
+        facet = code_type.get_facet(XSD_ENUMERATION)
+        del facet[0]
+        self.assertFalse(code_type.is_valid('C000'))
+        facet.append(facet[0])
+        self.assertTrue(code_type.is_valid('C001'))
+        self.assertEqual(len(facet.enumeration), 500)
+
+        amount_type = schema.types['amountType']
+        for value in ('1.5', '1.50', 'NaN', 'INF'):
+            self.assertTrue(amount_type.is_valid(value))
+        self.assertFalse(amount_type.is_valid('2'))
+        facet = amount_type.get_facet(XSD_ENUMERATION)
+        self.assertIsNone(next(facet(Decimal('1.5')), None))
+        self.assertIsNone(next(facet(float('nan')), None))
+
+        list_type = schema.types['listType']
+        self.assertTrue(list_type.is_valid('1.0 2'))
+        self.assertTrue(list_type.is_valid('3'))
+        self.assertFalse(list_type.is_valid('1'))
+        self.assertFalse(list_type.is_valid('2 1'))
+        errors = list_type.decode('2 1', validation='lax')[1]
+        self.assertEqual(errors[0].reason, "invalid value [Decimal('2'), Decimal('1')], it "
+                                           "must be one of [[Decimal('1'), Decimal('2.0')], "
+                                           "[Decimal('3')]]")
+
+    def test_decode_cache(self):
+        schema = self.check_schema("""
+        <xs:simpleType name="codeType">
+            <xs:restriction base="xs:token">
+                <xs:pattern value="[A-Z]{3}"/>
+            </xs:restriction>
+        </xs:simpleType>
+        <xs:simpleType name="keyType">
+            <xs:restriction base="xs:ID"/>
+        </xs:simpleType>
+        <xs:simpleType name="listType">
+            <xs:list itemType="xs:int"/>
+        </xs:simpleType>
+        <xs:simpleType name="restrictedListType">
+            <xs:restriction base="listType">
+                <xs:maxLength value="3"/>
+            </xs:restriction>
+        </xs:simpleType>
+        """)
+        code_type = schema.types['codeType']
+        self.assertIsNone(code_type.decode_cache)
+        self.assertTrue(code_type.set_decode_cache(2))
+        self.assertEqual(repr(code_type.decode_cache), 'DecodeCache(maxsize=2)')
+
+        self.assertEqual(code_type.decode(' EUR '), 'EUR')
+        self.assertEqual(code_type.decode('EUR'), 'EUR')
+        self.assertEqual(code_type.decode_cache.info(), (1, 1, 2, 1))
+
+        for _ in range(2):
+            result, errors = code_type.decode('eur', validation='lax')
+            self.assertEqual(result, 'eur')
+            self.assertEqual(len(errors), 1)
+            self.assertIsInstance(errors[0], XMLSchemaValidationError)
+        self.assertIsNot(code_type.decode('eur', validation='lax')[1][0], errors[0])
+        self.assertEqual(code_type.decode_cache.info(), (3, 2, 2, 2))
+
+        with self.assertRaises(XMLSchemaValidationError):
+            code_type.decode('eur')
+        self.assertEqual(code_type.decode('USD'), 'USD')
+        self.assertEqual(code_type.decode_cache.info(), (4, 3, 2, 2))
+
+        code_type.decode_cache.clear()
+        self.assertEqual(code_type.decode_cache.info(), (0, 0, 2, 0))
+        self.assertFalse(code_type.set_decode_cache(None))
+        self.assertIsNone(code_type.decode_cache)
+
+        self.assertFalse(schema.types['keyType'].set_decode_cache())
+        self.assertFalse(schema.maps.types[XSD_QNAME].set_decode_cache())
+        self.assertFalse(schema.types['restrictedListType'].set_decode_cache())
+
+        try:
+            schema.set_decode_cache()
+            self.assertEqual(schema.types['listType'].decode('1 2 1'), [1, 2, 1])
+            info = schema.get_decode_cache_info()
+            self.assertIn(code_type, info)
+            self.assertNotIn(schema.types['keyType'], info)
+            self.assertNotIn(schema.maps.types[XSD_ID], info)
+            self.assertEqual(info[schema.maps.types[XSD_INT]], (1, 2, 128, 2))
+        finally:
+            schema.set_decode_cache(None)
+        self.assertDictEqual(schema.get_decode_cache_info(), {})
+
 
 class TestXsd11SimpleTypes(TestXsdSimpleTypes):
 
@@ -26,9 +26,12 @@ from .validators import (
     XMLSchemaModelError, XMLSchemaModelDepthError, XMLSchemaValidationError,
     XMLSchemaDecodeError, XMLSchemaEncodeError, XMLSchemaChildrenValidationError,
     XMLSchemaIncludeWarning, XMLSchemaImportWarning, XMLSchemaTypeTableWarning,
-    XsdGlobals, XMLSchemaBase, XMLSchema, XMLSchema10, XMLSchema11,
+    ValidationErrorRecord, XsdGlobals, XMLSchemaBase, XMLSchema, XMLSchema10, XMLSchema11,
     XsdComponent, XsdType, XsdElement, XsdAttribute
 )
+from .cache import SchemaCache, SchemaRegistry, get_schema_registry, \
+    set_schema_registry
+from .profiling import ComponentProfiler
 
 __version__ = '1.3.1'
 __author__ = "Davide Brunato"
@@ -49,7 +52,8 @@ __all__ = [
     'XMLSchemaNotBuiltError', 'XMLSchemaModelError', 'XMLSchemaModelDepthError',
     'XMLSchemaValidationError', 'XMLSchemaDecodeError', 'XMLSchemaEncodeError',
     'XMLSchemaChildrenValidationError', 'XMLSchemaIncludeWarning',
-    'XMLSchemaImportWarning', 'XMLSchemaTypeTableWarning',
+    'XMLSchemaImportWarning', 'XMLSchemaTypeTableWarning', 'ValidationErrorRecord',
     'XsdGlobals', 'XMLSchemaBase', 'XMLSchema', 'XMLSchema10', 'XMLSchema11',
-    'XsdComponent', 'XsdType', 'XsdElement', 'XsdAttribute',
+    'XsdComponent', 'XsdType', 'XsdElement', 'XsdAttribute', 'SchemaCache',
+    'SchemaRegistry', 'get_schema_registry', 'set_schema_registry', 'ComponentProfiler',
 ]
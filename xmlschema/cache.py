@@ -0,0 +1,248 @@
+#
+# Copyright (c), 2016-2020, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""Persistent on-disk cache and in-memory registry of built schemas."""
+import os
+import hashlib
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from urllib.request import urlopen
+from urllib.error import URLError
+
+from .exceptions import XMLSchemaTypeError, XMLSchemaValueError
+from .resources import is_url, normalize_url, normalize_locations
+from .validators import XMLSchema10
+
+CACHE_FILE_SUFFIX = '.schema.pickle'
+
+SCHEMA_REGISTRY_MAXSIZE = 32
+
+
+def get_resource_digest(url, timeout=300):
+    """Returns the SHA-256 digest of the content of the resource at *url*."""
+    with urlopen(url, timeout=timeout) as resource:
+        return hashlib.sha256(resource.read()).hexdigest()
+
+
+class SchemaCache(object):
+    """
+    A cache of built schemas stored as pickle files into a directory. A schema is
+    stored with the digests of all the resources of its XSD set (included and imported
+    schemas and meta-schemas), so a cached schema is reloaded only if none of its
+    resources has been changed.
+
+    :param cache_dir: the directory where to store the cached schemas, is created \
+    if it doesn't exist.
+    :param protocol: the pickle protocol to use for storing schemas.
+    """
+    def __init__(self, cache_dir, protocol=pickle.HIGHEST_PROTOCOL):
+        if os.path.exists(cache_dir) and not os.path.isdir(cache_dir):
+            raise XMLSchemaValueError("{!r} is not a directory".format(cache_dir))
+        self.cache_dir = cache_dir
+        self.protocol = protocol
+
+    def __repr__(self):
+        return '%s(cache_dir=%r)' % (self.__class__.__name__, self.cache_dir)
+
+    def get_cache_path(self, url, cls=XMLSchema10, **kwargs):
+        """Returns the path of the cache file for a schema URL, class and arguments."""
+        from . import __version__
+
+        key = repr((__version__, cls.__module__, cls.__qualname__,
+                    url, sorted(kwargs.items())))
+        filename = hashlib.sha256(key.encode('utf-8')).hexdigest() + CACHE_FILE_SUFFIX
+        return os.path.join(self.cache_dir, filename)
+
+    def get_schema(self, source, cls=None, **kwargs):
+        """
+        Returns a built schema instance, loading it from the cache if it's present
+        and is not expired, otherwise building it and storing it into the cache.
+
+        :param source: a path or an URL of an XSD resource. Other types of sources \
+        are not cached.
+        :param cls: the schema class to use, for default is :class:`XMLSchema10`.
+        :param kwargs: other optional arguments for building the schema.
+        """
+        if cls is None:
+            cls = XMLSchema10
+        if not is_url(source) or kwargs.get('build') is False \
+                or kwargs.get('global_maps') is not None:
+            return cls(source, **kwargs)
+
+        url = normalize_url(source, kwargs.get('base_url'))
+        cache_path = self.get_cache_path(url, cls, **kwargs)
+        timeout = kwargs.get('timeout', 300)
+
+        schema = self._load(cache_path, timeout)
+        if schema is None:
+            schema = cls(source, **kwargs)
+            self._store(cache_path, schema, timeout)
+        return schema
+
+    def clear(self):
+        """Removes all the cached schemas."""
+        if os.path.isdir(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(CACHE_FILE_SUFFIX):
+                    os.remove(os.path.join(self.cache_dir, filename))
+
+    def _load(self, cache_path, timeout):
+        try:
+            with open(cache_path, 'rb') as fp:
+                digests = pickle.load(fp)
+                for url, digest in digests:
+                    if get_resource_digest(url, timeout) != digest:
+                        return None
+                return pickle.load(fp)
+        except (OSError, URLError, pickle.UnpicklingError, EOFError,
+                AttributeError, ImportError, ValueError):
+            return None
+
+    def _store(self, cache_path, schema, timeout):
+        try:
+            digests = [(s.url, get_resource_digest(s.url, timeout))
+                       for s in schema.maps.iter_schemas() if s.url]
+            data = pickle.dumps(schema, self.protocol)
+        except (OSError, URLError, pickle.PicklingError):
+            return  # the schema is not cacheable
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                pickle.dump(digests, fp, self.protocol)
+                fp.write(data)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class SchemaRegistry(object):
+    """
+    A process-wide registry of built schemas, that can be used by the module-level
+    functions (eg. :meth:`xmlschema.validate` and :meth:`xmlschema.to_dict`) for
+    reusing the schemas built from the same sources, instead of building a new
+    schema at each call. The schemas are keyed by the schema class, the normalized
+    URL of the source and the other arguments used for building them, except the
+    timeout. When the registry is full the least recently used schema is removed.
+    The registry can be used by concurrent threads. Registered schemas are not
+    rebuilt if their XSD resources change: call :meth:`clear` for reloading them.
+
+    :param maxsize: the maximum number of registered schemas.
+    :param cache: an optional :class:`SchemaCache` instance, used for loading \
+    the schemas that are not registered.
+    """
+    def __init__(self, maxsize=SCHEMA_REGISTRY_MAXSIZE, cache=None):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise XMLSchemaValueError("'maxsize' argument must be a positive integer")
+        self.maxsize = maxsize
+        self.cache = cache
+        self.hits = self.misses = 0
+        self._schemas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '%s(maxsize=%r)' % (self.__class__.__name__, self.maxsize)
+
+    def __len__(self):
+        return len(self._schemas)
+
+    def get_key(self, source, cls=XMLSchema10, **kwargs):
+        """
+        Returns the registry key for a schema source, class and arguments,
+        or `None` if the schema can't be registered.
+        """
+        if not is_url(source) or kwargs.get('build') is False \
+                or kwargs.get('global_maps') is not None:
+            return None
+
+        base_url = kwargs.get('base_url')
+        kwargs.pop('timeout', None)
+        if kwargs.get('locations'):
+            kwargs['locations'] = tuple(normalize_locations(kwargs['locations'], base_url))
+
+        key = cls, normalize_url(source, base_url), tuple(sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        else:
+            return key
+
+    def get_schema(self, source, cls=None, **kwargs):
+        """
+        Returns a built schema instance, getting it from the registry if it's
+        registered, otherwise building and registering it.
+
+        :param source: a path or an URL of an XSD resource. Other types of sources \
+        are not registered.
+        :param cls: the schema class to use, for default is :class:`XMLSchema10`.
+        :param kwargs: other optional arguments for building the schema.
+        """
+        if cls is None:
+            cls = XMLSchema10
+
+        key = self.get_key(source, cls, **kwargs)
+        if key is None:
+            return cls(source, **kwargs)
+
+        with self._lock:
+            try:
+                schema = self._schemas[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._schemas.move_to_end(key)
+                return schema
+
+        # Build out of the lock, for not blocking the threads that use other schemas
+        if self.cache is not None:
+            schema = self.cache.get_schema(source, cls, **kwargs)
+        else:
+            schema = cls(source, **kwargs)
+
+        with self._lock:
+            schema = self._schemas.setdefault(key, schema)
+            if len(self._schemas) > self.maxsize:
+                self._schemas.popitem(last=False)
+        return schema
+
+    def clear(self):
+        """Removes all the registered schemas and clears the statistics."""
+        with self._lock:
+            self._schemas.clear()
+            self.hits = self.misses = 0
+
+
+_schema_registry = None
+
+
+def get_schema_registry():
+    """Returns the schema registry used by the module-level functions, if any."""
+    return _schema_registry
+
+
+def set_schema_registry(registry):
+    """
+    Sets the schema registry used by the module-level functions for building the
+    schemas. Returns the previous registry.
+
+    :param registry: a :class:`SchemaRegistry` instance, or `None` for building \
+    a new schema at each call (the default).
+    """
+    global _schema_registry
+
+    if registry is not None and not isinstance(registry, SchemaRegistry):
+        raise XMLSchemaTypeError("'registry' argument must be a SchemaRegistry instance")
+    previous, _schema_registry = _schema_registry, registry
+    return previous
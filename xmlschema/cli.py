@@ -9,19 +9,30 @@
 """Command Line Interface"""
 import sys
 import os
+import json
 import argparse
 import logging
+import multiprocessing
 import pathlib
+import time
 from urllib.error import URLError
 
 import xmlschema
-from xmlschema import XMLSchema, XMLSchema11, iter_errors, to_json, from_json
+from xmlschema import XMLSchema, XMLSchema11, XMLSchemaValidationError, \
+    SchemaRegistry, set_schema_registry, iter_errors, to_json, from_json
 from xmlschema.exceptions import XMLSchemaValueError
 from xmlschema.etree import etree_tostring
+from xmlschema.documents import get_context
 
 
 PROGRAM_NAME = os.path.basename(sys.argv[0])
 
+# Size in characters of the chunks of JSON lines written to NDJSON files
+NDJSON_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Maximum number of XML files sent at once to a worker process
+FILES_CHUNK_SIZE = 16
+
 CONVERTERS_MAP = {
     'Unordered': xmlschema.UnorderedConverter,
     'Parker': xmlschema.ParkerConverter,
@@ -32,6 +43,9 @@ CONVERTERS_MAP = {
 }
 
 
+_worker_kwargs = {}  # Validation arguments of a worker process
+
+
 def xsd_version_number(value):
     if value not in ('1.0', '1.1'):
         msg = "%r is not an XSD version." % value
@@ -67,6 +81,38 @@ def get_converter(name):
         raise ValueError("--converter must be in {!r}".format_map(list(CONVERTERS_MAP)))
 
 
+def to_ndjson(xml_document, fp, path, schema=None, cls=None, converter=None, locations=None):
+    """
+    Decodes the elements of an XML document selected by a record path, writing
+    a JSON line for each decoded element. The XML document is parsed lazily and
+    the lines are written in chunks. Returns the number of validation errors,
+    that are counted and not collected for keeping the memory usage constant.
+    """
+    source, schema = get_context(xml_document, schema, cls, locations, lazy=True)
+
+    num_errors = 0
+    lines = []
+    size = 0
+    for obj in schema.stream_decode(source, path, converter=converter,
+                                    decimal_type=float, validation='lax'):
+        if isinstance(obj, XMLSchemaValidationError):
+            num_errors += 1
+            continue
+
+        lines.append(json.dumps(obj))
+        size += len(lines[-1]) + 1
+        if size >= NDJSON_CHUNK_SIZE:
+            lines.append('')
+            fp.write('\n'.join(lines))
+            lines.clear()
+            size = 0
+
+    if lines:
+        lines.append('')
+        fp.write('\n'.join(lines))
+    return num_errors
+
+
 def xml2json():
     parser = argparse.ArgumentParser(prog=PROGRAM_NAME, add_help=True,
                                      description="decode a set of XML files to JSON.")
@@ -87,6 +133,12 @@ def xml2json():
                              "{!r}.".format(tuple(CONVERTERS_MAP)))
     parser.add_argument('--lazy', action='store_true', default=False,
                         help="use lazy decoding mode (slower but use less memory).")
+    parser.add_argument('--path', type=str, metavar='XPATH',
+                        help="XPath expression for selecting the elements to decode. "
+                             "In NDJSON mode it's a path of child steps.")
+    parser.add_argument('--ndjson', action='store_true', default=False,
+                        help="write a JSON line for each element selected by --path, "
+                             "parsing the XML files lazily (NDJSON output).")
     parser.add_argument('-o', '--output', type=str, default='.',
                         help="where to write the encoded XML files, current dir by default.")
     parser.add_argument('-f', '--force', action="store_true", default=False,
@@ -95,6 +147,8 @@ def xml2json():
                         help="XML files to be decoded to JSON.")
 
     args = parser.parse_args()
+    if args.ndjson and args.path is None:
+        parser.error("the --ndjson option requires a record path (--path)")
 
     loglevel = get_loglevel(args.verbosity)
     schema_class = XMLSchema if args.version == '1.0' else XMLSchema11
@@ -112,33 +166,45 @@ def xml2json():
 
     tot_errors = 0
     for xml_path in map(pathlib.Path, args.files):
-        json_path = base_path.joinpath(xml_path.name).with_suffix('.json')
+        suffix = '.ndjson' if args.ndjson else '.json'
+        json_path = base_path.joinpath(xml_path.name).with_suffix(suffix)
         if json_path.exists() and not args.force:
             print("skip {}: the destination file exists!".format(str(json_path)))
             continue
 
         with open(str(json_path), 'w') as fp:
             try:
-                errors = to_json(
-                    xml_document=str(xml_path),
-                    fp=fp,
-                    schema=schema,
-                    cls=schema_class,
-                    converter=converter,
-                    lazy=args.lazy,
-                    validation='lax',
-                )
+                if args.ndjson:
+                    num_errors = to_ndjson(
+                        xml_document=str(xml_path),
+                        fp=fp,
+                        path=args.path,
+                        schema=schema,
+                        cls=schema_class,
+                        converter=converter,
+                    )
+                else:
+                    num_errors = len(to_json(
+                        xml_document=str(xml_path),
+                        fp=fp,
+                        schema=schema,
+                        cls=schema_class,
+                        path=args.path,
+                        converter=converter,
+                        lazy=args.lazy,
+                        validation='lax',
+                    ))
             except (xmlschema.XMLSchemaException, URLError) as err:
                 tot_errors += 1
                 print("error with {}: {}".format(str(xml_path), str(err)))
                 continue
             else:
-                if not errors:
+                if not num_errors:
                     print("{} converted to {}".format(str(xml_path), str(json_path)))
                 else:
-                    tot_errors += len(errors)
+                    tot_errors += num_errors
                     print("{} converted to {} with {} errors".format(
-                        str(xml_path), str(json_path), len(errors)
+                        str(xml_path), str(json_path), num_errors
                     ))
 
     sys.exit(tot_errors)
@@ -216,6 +282,35 @@ def json2xml():
     sys.exit(tot_errors)
 
 
+def validate_file(filepath, schema=None, cls=None, locations=None,
+                  lazy=False, workers=None, max_errors=None):
+    """
+    Validates an XML file, returning the number of errors and the message to print.
+    A failure in loading the XML file or the schema is counted as an error.
+    """
+    try:
+        errors = list(iter_errors(filepath, schema=schema, cls=cls, locations=locations,
+                                  lazy=lazy, workers=workers, max_errors=max_errors))
+    except (xmlschema.XMLSchemaException, URLError) as err:
+        return 1, str(err)
+    else:
+        if not errors:
+            return 0, "{} is valid".format(filepath)
+        return len(errors), "{} is not valid".format(filepath)
+
+
+def _init_validate_worker(schema, kwargs):
+    global _worker_kwargs
+    _worker_kwargs = dict(kwargs, schema=schema)
+    if schema is None:
+        # Each worker builds once the schemas fetched from the XML files
+        set_schema_registry(SchemaRegistry())
+
+
+def _validate_file(filepath):
+    return validate_file(filepath, **_worker_kwargs)
+
+
 def validate():
     parser = argparse.ArgumentParser(prog=PROGRAM_NAME, add_help=True,
                                      description="validate a set of XML files.")
@@ -231,25 +326,65 @@ def validate():
                         metavar="URI/URL", help="schema location hint overrides.")
     parser.add_argument('--lazy', action='store_true', default=False,
                         help="use lazy validation mode (slower but use less memory).")
+    parser.add_argument('-j', '--jobs', type=int, default=None, metavar='N',
+                        help="number of worker processes for validating the XML files "
+                             "in parallel. In lazy mode the subtrees of each XML file "
+                             "are validated in parallel instead.")
+    parser.add_argument('--max-errors', type=int, default=None, metavar='N',
+                        help="stop the validation of a file after N errors. In lazy "
+                             "mode also the parsing of the XML file is stopped.")
     parser.add_argument('files', metavar='[XML_FILE ...]', nargs='+',
                         help="XML files to be validated.")
 
     args = parser.parse_args()
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("the --max-errors option requires a positive integer")
 
-    tot_errors = 0
-    for filepath in args.files:
+    loglevel = get_loglevel(args.verbosity)
+    schema_class = XMLSchema if args.version == '1.0' else XMLSchema11
+    if args.schema is not None:
         try:
-            errors = list(iter_errors(filepath, schema=args.schema, lazy=args.lazy))
+            schema = schema_class(args.schema, locations=args.locations, loglevel=loglevel)
         except (xmlschema.XMLSchemaException, URLError) as err:
-            tot_errors += 1
             print(str(err))
-            continue
-        else:
-            if not errors:
-                print("{} is valid".format(filepath))
-            else:
-                tot_errors += len(errors)
-                print("{} is not valid".format(filepath))
+            sys.exit(1)
+    else:
+        schema = None
+
+    kwargs = {
+        'cls': schema_class,
+        'locations': args.locations,
+        'lazy': args.lazy,
+        'max_errors': args.max_errors,
+    }
+    parallel = not args.lazy and args.jobs is not None and args.jobs > 1 and len(args.files) > 1
+
+    tot_errors = 0
+    start_time = time.perf_counter()
+    if parallel:
+        # The schema is built once and it's inherited (or unpickled) by the workers.
+        # Results are printed in the order of the files.
+        chunksize = max(1, min(FILES_CHUNK_SIZE, len(args.files) // (args.jobs * 4)))
+        with multiprocessing.Pool(args.jobs, _init_validate_worker, (schema, kwargs)) as pool:
+            for num_errors, message in pool.imap(_validate_file, args.files, chunksize):
+                tot_errors += num_errors
+                print(message)
+    else:
+        registry = set_schema_registry(SchemaRegistry()) if schema is None else None
+        try:
+            for filepath in args.files:
+                num_errors, message = validate_file(filepath, schema, workers=args.jobs, **kwargs)
+                tot_errors += num_errors
+                print(message)
+        finally:
+            if schema is None:
+                set_schema_registry(registry)
+
+    if parallel or args.verbosity:
+        elapsed = time.perf_counter() - start_time
+        print("{} files validated in {:.2f} seconds ({:.1f} files/s), {} errors".format(
+            len(args.files), elapsed, len(args.files) / elapsed if elapsed else 0.0, tot_errors
+        ))
 
     sys.exit(tot_errors)
 
@@ -15,6 +15,7 @@ from .namespaces import XSD_NAMESPACE
 from .etree import ElementTree, is_etree_document, etree_tostring
 from .qnames import XSI_TYPE
 from .resources import fetch_schema_locations, XMLResource
+from .cache import get_schema_registry
 from .validators import XMLSchema10, XMLSchemaBase, XMLSchemaValidationError
 
 
@@ -47,15 +48,26 @@ def get_context(source, schema=None, cls=None, locations=None, base_url=None,
                 raise XMLSchemaValueError(msg) from None
 
         elif not isinstance(schema, XMLSchemaBase):
-            schema = cls(schema, validation='strict', locations=locations,
-                         base_url=base_url, defuse=defuse, timeout=timeout)
+            schema = get_schema(schema, cls, validation='strict', locations=locations,
+                                base_url=base_url, defuse=defuse, timeout=timeout)
     else:
-        schema = cls(schema or schema_location, validation='strict', locations=locations,
-                     defuse=defuse, timeout=timeout)
+        schema = get_schema(schema or schema_location, cls, validation='strict',
+                            locations=locations, defuse=defuse, timeout=timeout)
 
     return source, schema
 
 
+def get_schema(source, cls, **kwargs):
+    """
+    Builds a schema instance, or gets it from the schema registry
+    if one is set with :meth:`xmlschema.set_schema_registry`.
+    """
+    registry = get_schema_registry()
+    if registry is None:
+        return cls(source, **kwargs)
+    return registry.get_schema(source, cls, **kwargs)
+
+
 def get_dummy_schema(xml_resource, schema_class):
     tag = xml_resource.root.tag
     if tag.startswith('{'):
@@ -95,7 +107,7 @@ def get_lazy_json_encoder(errors):
 
 def validate(xml_document, schema=None, cls=None, path=None, schema_path=None,
              use_defaults=True, namespaces=None, locations=None, base_url=None,
-             defuse='remote', timeout=300, lazy=False):
+             defuse='remote', timeout=300, lazy=False, workers=None):
     """
     Validates an XML document against a schema instance. This function builds an
     :class:`XMLSchema` object for validating the XML document. Raises an
@@ -126,16 +138,18 @@ def validate(xml_document, schema=None, cls=None, path=None, schema_path=None,
     :param timeout: optional argument to pass for construct schema and \
     :class:`XMLResource` instances.
     :param lazy: optional argument for construct the :class:`XMLResource` instance.
+    :param workers: an optional number of worker processes for validating \
+    the subtrees of a lazy XML resource in parallel.
     """
     source, schema = get_context(
         xml_document, schema, cls, locations, base_url, defuse, timeout, lazy
     )
-    schema.validate(source, path, schema_path, use_defaults, namespaces)
+    schema.validate(source, path, schema_path, use_defaults, namespaces, workers)
 
 
 def is_valid(xml_document, schema=None, cls=None, path=None, schema_path=None,
              use_defaults=True, namespaces=None, locations=None, base_url=None,
-             defuse='remote', timeout=300, lazy=False):
+             defuse='remote', timeout=300, lazy=False, workers=None):
     """
     Like :meth:`validate` except that do not raises an exception but returns ``True`` if
     the XML document is valid, ``False`` if it's invalid.
@@ -143,20 +157,23 @@ def is_valid(xml_document, schema=None, cls=None, path=None, schema_path=None,
     source, schema = get_context(
         xml_document, schema, cls, locations, base_url, defuse, timeout, lazy
     )
-    return schema.is_valid(source, path, schema_path, use_defaults, namespaces)
+    return schema.is_valid(source, path, schema_path, use_defaults, namespaces, workers)
 
 
 def iter_errors(xml_document, schema=None, cls=None, path=None, schema_path=None,
                 use_defaults=True, namespaces=None, locations=None, base_url=None,
-                defuse='remote', timeout=300, lazy=False):
+                defuse='remote', timeout=300, lazy=False, workers=None, max_errors=None):
     """
     Creates an iterator for the errors generated by the validation of an XML document.
-    Takes the same arguments of the function :meth:`validate`.
+    Takes the same arguments of the function :meth:`validate`, plus an optional
+    *max_errors* argument for stopping the validation, and the parsing of a lazy
+    resource, after the given number of errors.
     """
     source, schema = get_context(
         xml_document, schema, cls, locations, base_url, defuse, timeout, lazy
     )
-    return schema.iter_errors(source, path, schema_path, use_defaults, namespaces)
+    return schema.iter_errors(source, path, schema_path, use_defaults,
+                              namespaces, workers, max_errors)
 
 
 def to_dict(xml_document, schema=None, cls=None, path=None, process_namespaces=True,
@@ -192,7 +209,8 @@ def to_dict(xml_document, schema=None, cls=None, path=None, process_namespaces=T
     as keyword arguments.
     :return: an object containing the decoded data. If ``validation='lax'`` keyword argument \
     is provided the validation errors are collected and returned coupled in a tuple with the \
-    decoded data.
+    decoded data. With a *max_errors* keyword argument the decoding stops after the given \
+    number of errors and the data of the interrupted element is not returned.
     :raises: :exc:`XMLSchemaValidationError` if the object is not decodable by \
     the XSD component, or also if it's invalid when ``validation='strict'`` is provided.
     """
@@ -331,17 +349,21 @@ class XmlDocument(XMLResource):
     :param defuse: the defuse mode for base :class:`xmlschema.XMLResource` initialization.
     :param timeout: the timeout for base :class:`xmlschema.XMLResource` initialization.
     :param lazy: the lazy mode for base :class:`xmlschema.XMLResource` initialization.
+    :param max_errors: an optional maximum number of errors collected with 'lax' \
+    validation. The validation stops after this number of errors.
     """
     schema = _fallback_schema = None
     validation = 'skip'
     namespaces = None
     errors = ()
+    max_errors = None
 
     def __init__(self, source, schema=None, cls=None, validation='strict',
                  namespaces=None, locations=None, base_url=None, allow='all',
-                 defuse='remote', timeout=300, lazy=False):
+                 defuse='remote', timeout=300, lazy=False, max_errors=None):
 
         self.validation = validation
+        self.max_errors = max_errors
         self._namespaces = namespaces
         super(XmlDocument, self).__init__(source, base_url, allow, defuse, timeout, lazy)
 
@@ -382,7 +404,9 @@ class XmlDocument(XMLResource):
         if validation == 'strict':
             self.schema.validate(self, namespaces=self.namespaces)
         elif validation == 'lax':
-            self.errors = [e for e in self.schema.iter_errors(self, namespaces=self.namespaces)]
+            self.errors = [e for e in self.schema.iter_errors(
+                self, namespaces=self.namespaces, max_errors=self.max_errors
+            )]
         elif validation != 'skip':
             raise XMLSchemaValueError("{!r}: not a validation mode".format(validation))
 
@@ -395,7 +419,9 @@ class XmlDocument(XMLResource):
         elif self.validation == 'strict':
             self.schema.validate(self, namespaces=self.namespaces)
         elif self.validation == 'lax':
-            self.errors = [e for e in self.schema.iter_errors(self, namespaces=self.namespaces)]
+            self.errors = [e for e in self.schema.iter_errors(
+                self, namespaces=self.namespaces, max_errors=self.max_errors
+            )]
 
     def getroot(self):
         """Get the root element of the XML document."""
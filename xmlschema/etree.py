@@ -14,6 +14,7 @@ import sys
 import importlib
 import re
 from collections import Counter
+from xml.parsers import expat
 
 from .exceptions import XMLSchemaTypeError
 from .namespaces import get_namespace
@@ -22,6 +23,9 @@ from .qnames import get_qname, get_prefixed_qname, XSI_SCHEMA_LOCATION, XSI_NONS
 _REGEX_NS_PREFIX = re.compile(r'ns\d+$')
 _REGEX_SPACES = re.compile(r'\s+')
 
+# Size in bytes or characters of the chunks of XML data read by iterparse_chunks()
+PARSE_CHUNK_SIZE = 16 * 1024
+
 ###
 # Programmatic import of xml.etree.ElementTree
 #
@@ -103,6 +107,92 @@ class SafeXMLParser(PyElementTree.XMLParser):
         )  # pragma: no cover (EntityDeclHandler is called before)
 
 
+def _forbid_entity_declaration(entity_name, *args):
+    raise ParseError("Entities are forbidden (entity_name={!r})".format(entity_name))
+
+
+def _forbid_unparsed_entity_declaration(entity_name, *args):
+    raise ParseError("Unparsed entities are forbidden (entity_name={!r})".format(entity_name))
+
+
+def _forbid_external_entity_reference(context, base, system_id, public_id):
+    raise ParseError(
+        "External references are forbidden (system_id={!r}, "
+        "public_id={!r})".format(system_id, public_id)
+    )  # pragma: no cover (EntityDeclHandler is called before)
+
+
+def iterparse_chunks(source, parser, defuse=False):
+    """
+    Iterates the events of a pull parser, feeding it with chunks of XML data
+    read from a source. With *defuse* entities processing is forbidden like
+    with :class:`SafeXMLParser`. Entities can be declared only in the DTD, that
+    precedes the root element, so the chunks of XML data are checked by a bare
+    expat parser, that raises an error at entity declarations, until the start
+    of the root element. After that the data is only fed to the pull parser.
+
+    :param source: a filename or a file-like object containing XML data.
+    :param parser: a pull parser instance, with the methods *feed()*, \
+    *read_events()* and *close()*, like `ElementTree.XMLPullParser` or \
+    the *XMLPullParser* of lxml.
+    :param defuse: if `True` forbids entities processing.
+    """
+    root_started = not defuse
+
+    def start_element(*args):
+        nonlocal root_started
+        root_started = True
+
+    if defuse:
+        checker = expat.ParserCreate()
+        checker.EntityDeclHandler = _forbid_entity_declaration
+        checker.UnparsedEntityDeclHandler = _forbid_unparsed_entity_declaration
+        checker.ExternalEntityRefHandler = _forbid_external_entity_reference
+        checker.StartElementHandler = start_element
+
+    close_source = not hasattr(source, 'read')
+    if close_source:
+        source = open(source, 'rb')
+
+    try:
+        while True:
+            data = source.read(PARSE_CHUNK_SIZE)
+            if not data:
+                break
+
+            if not root_started:
+                try:
+                    checker.Parse(data, False)
+                except expat.ExpatError as err:
+                    error = ParseError("{}: line {}, column {}".format(
+                        expat.ErrorString(err.code), err.lineno, err.offset
+                    ))
+                    error.code = err.code
+                    error.position = err.lineno, err.offset
+                    raise error from None
+
+            parser.feed(data)
+            yield from parser.read_events()
+
+        parser.close()
+        yield from parser.read_events()
+    finally:
+        if close_source:
+            source.close()
+
+
+def safe_iterparse(source, events=None):
+    """
+    An *iterparse()* that forbids entities processing like :class:`SafeXMLParser`,
+    keeping the speed of the C optimized parser. See :func:`iterparse_chunks`.
+
+    :param source: a filename or a file-like object containing XML data.
+    :param events: a sequence of events to report back, for default only \
+    *end* events are reported.
+    """
+    return iterparse_chunks(source, ElementTree.XMLPullParser(events), defuse=True)
+
+
 def is_etree_element(obj):
     """A checker for valid ElementTree elements that excludes XsdElement objects."""
     return hasattr(obj, 'append') and hasattr(obj, 'tag') and hasattr(obj, 'attrib')
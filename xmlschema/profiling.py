@@ -0,0 +1,263 @@
+#
+# Copyright (c), 2016-2020, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""Per-component profiling of XSD validation, decoding and encoding."""
+import json
+import threading
+from functools import wraps
+from time import perf_counter
+
+from .exceptions import XMLSchemaValueError
+from .validators import XMLSchemaValidationError, ValidationMixin, \
+    XsdFacet, XsdAssert, XsdIdentity
+
+# The instrumented methods of each class of XSD components
+PROFILED_METHODS = (
+    (ValidationMixin, ('iter_decode', 'iter_encode')),
+    (XsdFacet, ('__call__',)),
+    (XsdAssert, ('__call__',)),
+    (XsdIdentity, ('get_fields',)),
+)
+
+SORT_KEYS = ('tottime', 'cumtime', 'calls', 'errors')
+
+_profiler_lock = threading.Lock()
+_active_profiler = None
+
+
+def iter_subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from iter_subclasses(subclass)
+
+
+class ComponentStats(object):
+    """
+    The profiling statistics of an XSD component. The cumulative time includes
+    the time spent in the instrumented methods of the inner components, the total
+    time excludes it. The errors are the validation errors yielded or raised by the
+    component, including the ones propagated from the inner components.
+    """
+    __slots__ = ('component', 'calls', 'errors', 'tottime', 'cumtime')
+
+    def __init__(self, component):
+        self.component = component
+        self.calls = self.errors = 0
+        self.tottime = self.cumtime = 0.0
+
+    def __repr__(self):
+        return '%s(component=%r, calls=%r, errors=%r, tottime=%r, cumtime=%r)' % (
+            self.__class__.__name__, self.component, self.calls,
+            self.errors, self.tottime, self.cumtime
+        )
+
+    def as_dict(self):
+        return {
+            'component': repr(self.component),
+            'class': self.component.__class__.__name__,
+            'name': getattr(self.component, 'prefixed_name', None),
+            'calls': self.calls,
+            'errors': self.errors,
+            'tottime': self.tottime,
+            'cumtime': self.cumtime,
+        }
+
+
+class ComponentProfiler(object):
+    """
+    A profiler that records call counts, times and error counts of the XSD components
+    used for validating, decoding or encoding data. The decoding and encoding methods
+    of the components, the facets, the assertions and the field selection of the
+    identities are instrumented only while the profiler is enabled, so there is no
+    overhead when it's disabled. Only one profiler can be enabled at a time and the
+    decoding made by other processes (eg. parallel validation) is not profiled.
+    Can be used as a context manager:
+
+    .. code-block:: python
+
+        with ComponentProfiler() as profiler:
+            schema.validate(xml_document)
+        table = profiler.format_table(limit=10)
+    """
+    def __init__(self):
+        self.stats = {}
+        self._local = threading.local()
+        self._patched = []
+
+    def __repr__(self):
+        return '%s(enabled=%r)' % (self.__class__.__name__, self.enabled)
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+    @property
+    def enabled(self):
+        return _active_profiler is self
+
+    def enable(self):
+        """Enables the profiler, instrumenting the methods of XSD components."""
+        global _active_profiler
+
+        with _profiler_lock:
+            if _active_profiler is self:
+                return
+            elif _active_profiler is not None:
+                raise RuntimeError("another component profiler is enabled")
+
+            patched = set()
+            for base_class, names in PROFILED_METHODS:
+                for cls in iter_subclasses(base_class):
+                    for name in names:
+                        if name in cls.__dict__ and (cls, name) not in patched:
+                            patched.add((cls, name))
+                            method = cls.__dict__[name]
+                            self._patched.append((cls, name, method))
+                            setattr(cls, name, self._profile(method, name != 'get_fields'))
+            _active_profiler = self
+
+    def disable(self):
+        """Disables the profiler, restoring the original methods of XSD components."""
+        global _active_profiler
+
+        with _profiler_lock:
+            if _active_profiler is not self:
+                return
+
+            while self._patched:
+                cls, name, method = self._patched.pop()
+                setattr(cls, name, method)
+            _active_profiler = None
+
+    def clear(self):
+        """Clears the collected statistics."""
+        self.stats.clear()
+
+    def _get_stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+            return stack
+
+    def _get_stats(self, component):
+        # Keyed by id because some components (eg. attribute groups) are not hashable
+        try:
+            return self.stats[id(component)]
+        except KeyError:
+            stats = self.stats[id(component)] = ComponentStats(component)
+            return stats
+
+    def _profile(self, method, iterator=True):
+        # Each frame of the stack is a list with the component and the time
+        # spent by the inner components, subtracted from the component's total.
+
+        if not iterator:
+            @wraps(method)
+            def profiled_method(component, *args, **kwargs):
+                stack = self._get_stack()
+                stats = self._get_stats(component)
+                stats.calls += 1
+
+                frame = [component, 0.0]
+                stack.append(frame)
+                start = perf_counter()
+                try:
+                    return method(component, *args, **kwargs)
+                except Exception:
+                    stats.errors += 1
+                    raise
+                finally:
+                    elapsed = perf_counter() - start
+                    stack.pop()
+                    stats.tottime += elapsed - frame[1]
+                    stats.cumtime += elapsed
+                    if stack:
+                        stack[-1][1] += elapsed
+
+            return profiled_method
+
+        @wraps(method)
+        def profiled_method(component, *args, **kwargs):
+            stack = self._get_stack()
+            if stack and stack[-1][0] is component:
+                # A call of an overridden method, already profiled by the caller
+                yield from method(component, *args, **kwargs)
+                return
+
+            stats = self._get_stats(component)
+            stats.calls += 1
+            results = None
+            try:
+                while True:
+                    frame = [component, 0.0]
+                    stack.append(frame)
+                    start = perf_counter()
+                    try:
+                        if results is None:
+                            results = iter(method(component, *args, **kwargs))
+                        result = next(results)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed = perf_counter() - start
+                        stack.pop()
+                        stats.tottime += elapsed - frame[1]
+                        stats.cumtime += elapsed
+                        if stack:
+                            stack[-1][1] += elapsed
+
+                    if isinstance(result, XMLSchemaValidationError):
+                        stats.errors += 1
+                    yield result
+            finally:
+                if hasattr(results, 'close'):
+                    results.close()
+
+        return profiled_method
+
+    def get_stats(self, sort_by='tottime', limit=None):
+        """
+        Returns a list with the statistics of the profiled components.
+
+        :param sort_by: the key for sorting the statistics in descending order, \
+        can be 'tottime', 'cumtime', 'calls' or 'errors'.
+        :param limit: an optional maximum number of items to return.
+        """
+        if sort_by not in SORT_KEYS:
+            raise XMLSchemaValueError("'sort_by' argument must be in {!r}".format(SORT_KEYS))
+
+        stats = sorted(self.stats.values(), key=lambda x: getattr(x, sort_by), reverse=True)
+        return stats if limit is None else stats[:limit]
+
+    def format_table(self, sort_by='tottime', limit=None):
+        """
+        Returns the statistics of the profiled components formatted as a text table.
+        Takes the same arguments of :meth:`get_stats`.
+        """
+        lines = ['{:>10} {:>8} {:>10} {:>10}  {}'.format(
+            'calls', 'errors', 'tottime', 'cumtime', 'component'
+        )]
+        for stats in self.get_stats(sort_by, limit):
+            lines.append('{:>10} {:>8} {:>10.6f} {:>10.6f}  {!r}'.format(
+                stats.calls, stats.errors, stats.tottime, stats.cumtime, stats.component
+            ))
+        return '\n'.join(lines)
+
+    def to_json(self, sort_by='tottime', limit=None, **json_options):
+        """
+        Returns the statistics of the profiled components as a JSON list.
+        Takes the same arguments of :meth:`get_stats` plus other keyword
+        arguments for the JSON serializer.
+        """
+        return json.dumps([x.as_dict() for x in self.get_stats(sort_by, limit)],
+                          **json_options)
@@ -7,22 +7,24 @@
 #
 # @author Davide Brunato <brunato@sissa.it>
 #
+import importlib
 import os.path
 import re
 from string import ascii_letters
 from elementpath import iter_select, XPath1Parser, XPathContext, XPath2Parser
-from io import StringIO, BytesIO
+from io import StringIO
 from urllib.request import urlopen, pathname2url
 from urllib.parse import uses_relative, urlsplit, urljoin, urlunsplit
 from urllib.error import URLError
 
 from .exceptions import XMLSchemaTypeError, XMLSchemaValueError, XMLResourceError
 from .namespaces import XML_NAMESPACE, get_namespace
-from .etree import ElementTree, PyElementTree, SafeXMLParser, etree_tostring, \
-    etree_iter_location_hints, is_etree_element, is_etree_document
+from .etree import ElementTree, PyElementTree, etree_tostring, etree_iter_location_hints, \
+    is_etree_element, is_etree_document, iterparse_chunks, safe_iterparse
 
 
 DEFUSE_MODES = ('never', 'remote', 'always')
+LAZY_BACKENDS = ('etree', 'lxml')
 SECURITY_MODES = ('all', 'remote', 'local', 'sandbox')
 
 
@@ -334,7 +336,7 @@ class XMLResource(object):
     URLs are allowed. With 'remote' only remote resource URLs are allowed. With 'local' \
     only file paths and URLs are allowed. With 'sandbox' only file paths and URLs that \
     are under the directory path identified by the *base_url* argument are allowed.
-    :param defuse: defines when to defuse XML data using a `SafeXMLParser`. Can be \
+    :param defuse: defines when to defuse XML data forbidding entities. Can be \
     'always', 'remote' or 'never'. For default defuses only remote XML data.
     :param timeout: the timeout in seconds for the connection attempt in case of remote data.
     :param lazy: if a value `False` or 0 is provided the XML data is fully loaded into and \
@@ -342,13 +344,20 @@ class XMLResource(object):
     except in case the *source* argument is an Element or an ElementTree instance. A \
     positive integer also defines the depth at which the lazy resource can be better \
     iterated (`True` means 1).
+    :param lazy_backend: the parser used for iterating lazy resources. Can be 'etree' \
+    or 'lxml'. For default the ElementTree library is used. With 'lxml' the lazy \
+    iteration is done with lxml elements, filtering tags at C level and deleting \
+    the processed siblings from the tree, that is cheaper on huge XML files. \
+    The subtrees of lazy resources iterated with lxml can't be validated by worker \
+    processes, because lxml elements can't be pickled.
     """
     # Protected attributes for data and resource location
     _source = _root = _text = _url = _nsmap = _parent_map = None
     _lazy = False
+    _lazy_backend = 'etree'
 
     def __init__(self, source, base_url=None, allow='all',
-                 defuse='remote', timeout=300, lazy=False):
+                 defuse='remote', timeout=300, lazy=False, lazy_backend='etree'):
 
         if base_url is not None and not isinstance(base_url, str):
             msg = "invalid type {!r} for the attribute 'base_url'"
@@ -382,6 +391,14 @@ class XMLResource(object):
             raise XMLSchemaValueError(msg)
         self._timeout = timeout
 
+        if not isinstance(lazy_backend, str):
+            msg = "invalid type {!r} for the attribute 'lazy_backend'"
+            raise XMLSchemaTypeError(msg.format(type(lazy_backend)))
+        elif lazy_backend not in LAZY_BACKENDS:
+            msg = "'lazy_backend' attribute: {!r} is not a lazy backend"
+            raise XMLSchemaValueError(msg.format(lazy_backend))
+        self._lazy_backend = lazy_backend
+
         self.parse(source, lazy)
 
     def __str__(self):
@@ -432,6 +449,11 @@ class XMLResource(object):
         """The timeout in seconds for accessing remote resources."""
         return self._timeout
 
+    @property
+    def lazy_backend(self):
+        """The parser used for iterating lazy resources."""
+        return self._lazy_backend
+
     def _access_control(self, url):
         if self._allow == 'all':
             return
@@ -467,7 +489,7 @@ class XMLResource(object):
                 prefix += '0'
         nsmap[prefix] = uri
 
-    def _lazy_iterparse(self, source, nsmap=None):
+    def _lazy_iterparse(self, source, nsmap=None, tag=None):
         if nsmap is None:
             events = 'start', 'end'
             _nsmap = None
@@ -479,10 +501,20 @@ class XMLResource(object):
             else:
                 _nsmap = []
 
-        if self._defuse == 'remote' and is_remote_url(self.base_url) \
-                or self._defuse == 'always':
-            safe_parser = SafeXMLParser(target=PyElementTree.TreeBuilder())
-            tree_iterator = PyElementTree.iterparse(source, events, safe_parser)
+        defuse = self._defuse == 'remote' and is_remote_url(self.base_url) \
+            or self._defuse == 'always'
+
+        if self._lazy_backend == 'lxml':
+            # The tag filter of lxml doesn't apply to namespace events. The
+            # limits of libxml2 for huge trees are kept for defused data.
+            lxml_etree = importlib.import_module('lxml.etree')
+            parser = lxml_etree.XMLPullParser(
+                events, tag=tag, remove_comments=True,
+                remove_pis=True, huge_tree=not defuse
+            )
+            tree_iterator = iterparse_chunks(source, parser, defuse)
+        elif defuse:
+            tree_iterator = safe_iterparse(source, events)
         else:
             tree_iterator = ElementTree.iterparse(source, events)
 
@@ -494,7 +526,7 @@ class XMLResource(object):
             for event, node in tree_iterator:
                 if event == 'start':
                     if not root_started:
-                        self._root = node
+                        self._root = node if tag is None else node.getroottree().getroot()
                         root_started = True
                     if nsmap_update:
                         for prefix, uri in _nsmap:
@@ -511,52 +543,94 @@ class XMLResource(object):
                         _nsmap.pop()
                     nsmap_update = nsmap is not _nsmap
 
-        except Exception as err:
+        except SyntaxError as err:
+            self._root = _root
+            if isinstance(err, ElementTree.ParseError):
+                raise
+            raise ElementTree.ParseError(str(err)) from None  # an lxml parse error
+        except Exception:
             self._root = _root
-            if isinstance(err, PyElementTree.ParseError):
-                raise ElementTree.ParseError(str(err)) from None
             raise
 
     def _parse(self, resource):
+        events = 'start-ns', 'end-ns', 'start'
         if self._defuse == 'remote' and is_remote_url(self.base_url) \
                 or self._defuse == 'always':
+            tree_iterator = safe_iterparse(resource, events)
+        else:
+            tree_iterator = ElementTree.iterparse(resource, events)
 
-            if not hasattr(resource, 'seekable') or not resource.seekable():
-                text = resource.read()
-                resource = StringIO(text) if isinstance(text, str) else BytesIO(text)
-
-            safe_parser = SafeXMLParser(target=PyElementTree.TreeBuilder())
-            try:
-                for _ in PyElementTree.iterparse(resource, ('start',), safe_parser):
-                    break
-            except PyElementTree.ParseError as err:
-                raise ElementTree.ParseError(str(err))
-            else:
-                resource.seek(0)
-
-        elem = None
+        # Namespace scopes are recorded only for the root and for
+        # the elements that declare namespaces.
+        root = None
         nsmap = []
-        nsmap_changed = False
+        nsmap_declared = True
         namespaces = {}
-        events = 'start-ns', 'end-ns', 'end'
-        for event, node in ElementTree.iterparse(resource, events):
-            if event == 'end':
-                if nsmap_changed or elem is None:
+        for event, node in tree_iterator:
+            if event == 'start':
+                if nsmap_declared:
                     namespaces[node] = nsmap[:]
-                    nsmap_changed = False
-                else:
-                    namespaces[node] = namespaces[elem]
-                elem = node
+                    nsmap_declared = False
+                if root is None:
+                    root = node
             elif event == 'start-ns':
                 nsmap.append(node)
-                nsmap_changed = True
+                nsmap_declared = True
             else:
                 nsmap.pop()
-                nsmap_changed = True
 
-        self._root = elem
+        self._root = root
         self._nsmap = namespaces
 
+    def _iter_scopes(self):
+        """
+        Iterates the elements of a not lazy XML tree in document order,
+        yielding couples with the element and its namespace scope.
+        """
+        nsmap = []
+        scopes = []  # couples with the last element of a scope and the scope
+        for elem in self._root.iter():
+            _nsmap = self._nsmap.get(elem)
+            if _nsmap is not None:
+                last = elem
+                while len(last):
+                    last = last[-1]
+                scopes.append((last, nsmap))
+                nsmap = _nsmap
+
+            yield elem, nsmap
+
+            while scopes and scopes[-1][0] is elem:
+                nsmap = scopes.pop()[1]
+
+    def _iter_with_scopes(self, elements):
+        """
+        Yields the provided elements of the XML tree coupled with their namespace
+        scopes. The scopes are found walking the tree in parallel, so it's faster
+        if the elements are provided in document order. The scope is `None` for
+        items that are not elements of the tree.
+        """
+        scopes = self._iter_scopes()
+        for elem in elements:
+            if not hasattr(elem, 'tag'):
+                yield elem, None
+                continue
+
+            for e, nsmap in scopes:
+                if e is elem:
+                    break
+            else:
+                # Restart the walk from the root
+                scopes = self._iter_scopes()
+                for e, nsmap in scopes:
+                    if e is elem:
+                        break
+                else:
+                    nsmap = None
+                    scopes = self._iter_scopes()
+
+            yield elem, nsmap
+
     def parse(self, source, lazy=False):
         if isinstance(lazy, bool):
             pass
@@ -667,12 +741,10 @@ class XMLResource(object):
             else:
                 self._nsmap = {}
 
-                nsmap = lxml_nsmap = None
                 for elem in self._root.iter():
-                    if lxml_nsmap != elem.nsmap:
-                        lxml_nsmap = elem.nsmap
-                        nsmap = [(k or '', v) for k, v in elem.nsmap.items()]
-                    self._nsmap[elem] = nsmap
+                    parent = elem.getparent()
+                    if parent is None or elem.nsmap != parent.nsmap:
+                        self._nsmap[elem] = [(k or '', v) for k, v in elem.nsmap.items()]
 
         self._parent_map = None
         self._source = source
@@ -738,17 +810,14 @@ class XMLResource(object):
 
         resource = XMLResource(elem, self._base_url, self._allow, self._defuse, self._timeout)
         if not hasattr(elem, 'nsmap'):
-            namespaces = {}
-            _nsmap = self._nsmap[elem]
+            _, _nsmap = next(self._iter_with_scopes((elem,)))
             _nsmap_initial_len = len(_nsmap)
             nsmap = list(dict(_nsmap).items())
+            namespaces = {elem: nsmap}
 
             for e in elem.iter():
-                if _nsmap is not self._nsmap[e]:
-                    _nsmap = self._nsmap[e]
-                    nsmap = nsmap[:]
-                    nsmap.extend(_nsmap[_nsmap_initial_len:])
-                namespaces[e] = nsmap
+                if e is not elem and e in self._nsmap:
+                    namespaces[e] = nsmap + self._nsmap[e][_nsmap_initial_len:]
 
             resource._nsmap = namespaces
 
@@ -879,12 +948,28 @@ class XMLResource(object):
         if self._lazy:
             resource = self.open()
             tag = '*' if tag is None else tag.strip()
+            if self._lazy_backend != 'lxml':
+                iterparse = self._lazy_iterparse(resource, nsmap)
+            else:
+                iterparse = self._lazy_iterparse(resource, nsmap, None if tag == '*' else tag)
+
             try:
-                for event, node in self._lazy_iterparse(resource, nsmap):
+                for event, node in iterparse:
                     if event == 'end':
                         if tag == '*' or node.tag == tag:
                             yield node
-                        node.clear()
+
+                        if self._lazy_backend != 'lxml':
+                            node.clear()
+                        else:
+                            # Delete also the processed siblings. If tags are filtered
+                            # the siblings of the ancestors are not processed otherwise.
+                            node.clear(keep_tail=True)
+                            for elem in node.iterancestors() if tag != '*' else ():
+                                while elem.getprevious() is not None:
+                                    del elem.getparent()[0]
+                            while node.getprevious() is not None:
+                                del node.getparent()[0]
             finally:
                 # Close the resource only if it was originally opened by XMLResource
                 if resource is not self._source:
@@ -892,22 +977,40 @@ class XMLResource(object):
 
         elif not self._nsmap or nsmap is None:
             yield from self._root.iter(tag)
+        elif tag is None or tag == '*':
+            yield from self._iter_tracking_nsmap(None, nsmap)
         else:
-            _nsmap = None
-            for elem in self._root.iter(tag):
-                try:
-                    if _nsmap is not self._nsmap[elem]:
-                        _nsmap = self._nsmap[elem]
-                        if isinstance(nsmap, list):
-                            nsmap.clear()
-                            nsmap.extend(_nsmap)
-                        else:
-                            for prefix, uri in _nsmap:
-                                self._update_nsmap(nsmap, prefix, uri)
-                except KeyError:
-                    pass
+            yield from self._iter_tracking_nsmap(self._root.iter(tag), nsmap)
+
+    def _iter_tracking_nsmap(self, elements, nsmap):
+        """
+        Yields the provided elements of the XML tree, tracking their namespaces
+        in *nsmap*. If *elements* is `None` iterates the whole tree.
+        """
+        if len(self._nsmap) == 1 and self._root in self._nsmap:
+            # Namespaces declared only by the root: a single scope for all the tree
+            self._set_scope(nsmap, self._nsmap[self._root])
+            yield from self._root.iter() if elements is None else elements
+            return
+        elif elements is None:
+            scopes = self._iter_scopes()
+        else:
+            scopes = self._iter_with_scopes(elements)
 
-                yield elem
+        _nsmap = None
+        for elem, scope in scopes:
+            if scope is not None and _nsmap is not scope:
+                _nsmap = scope
+                self._set_scope(nsmap, scope)
+            yield elem
+
+    def _set_scope(self, nsmap, scope):
+        if isinstance(nsmap, list):
+            nsmap.clear()
+            nsmap.extend(scope)
+        else:
+            for prefix, uri in scope:
+                self._update_nsmap(nsmap, prefix, uri)
 
     def iter_location_hints(self, tag=None):
         """
@@ -942,10 +1045,10 @@ class XMLResource(object):
             if nsmap is not None and self._nsmap:
                 if isinstance(nsmap, list):
                     nsmap.clear()
-                    nsmap.extend(self._nsmap[self._root])
+                    nsmap.extend(self._nsmap.get(self._root, ()))
                 else:
-                    for elem in self._root.iter():
-                        for prefix, uri in self._nsmap[elem]:
+                    for _nsmap in self._nsmap.values():
+                        for prefix, uri in _nsmap:
                             self._update_nsmap(nsmap, prefix, uri)
 
             yield self._root
@@ -958,6 +1061,10 @@ class XMLResource(object):
         level = 0
         subtree_level = int(self._lazy)
 
+        # Only with mode 1 a pruned root is not yielded, so the processed
+        # siblings can be deleted from the tree.
+        prune_siblings = mode == 1 and self._lazy_backend == 'lxml'
+
         try:
             for event, node in self._lazy_iterparse(resource, nsmap):
                 if event == "start":
@@ -980,6 +1087,9 @@ class XMLResource(object):
                         yield node
 
                     del node[:]  # delete children, keep attributes, text and tail.
+                    if prune_siblings:
+                        while node.getprevious() is not None:
+                            del node.getparent()[0]
         finally:
             if self._source is not resource:
                 resource.close()
@@ -1009,6 +1119,11 @@ class XMLResource(object):
             else:
                 subtree_level = path.count('/') + 1
 
+            # Without predicates the selection of an element doesn't depend
+            # on its preceding siblings, that can be deleted from the tree.
+            prune_siblings = self._lazy_backend == 'lxml' and subtree_level \
+                and '[' not in path
+
             try:
                 for event, node in self._lazy_iterparse(resource, nsmap):
                     if event == "start":
@@ -1032,6 +1147,9 @@ class XMLResource(object):
                             yield node
 
                         del node[:]  # delete children, keep attributes, text and tail.
+                        if prune_siblings:
+                            while node.getprevious() is not None:
+                                del node.getparent()[0]
 
             finally:
                 if self._source is not resource:
@@ -1068,21 +1186,102 @@ class XMLResource(object):
             if not self._nsmap or nsmap is None:
                 yield from selector(self._root, path, namespaces, strict=False)
             else:
-                _nsmap = None
-                for elem in selector(self._root, path, namespaces, strict=False):
-                    try:
-                        if _nsmap is not self._nsmap[elem]:
-                            _nsmap = self._nsmap[elem]
-                            if isinstance(nsmap, list):
-                                nsmap.clear()
-                                nsmap.extend(_nsmap)
-                            else:
-                                for prefix, uri in _nsmap:
-                                    self._update_nsmap(nsmap, prefix, uri)
-                    except KeyError:
-                        pass
-
-                    yield elem
+                elements = selector(self._root, path, namespaces, strict=False)
+                yield from self._iter_tracking_nsmap(elements, nsmap)
+
+    def iter_records(self, path, namespaces=None, nsmap=None, ancestors=None):
+        """
+        Iterates the elements of the XML resource that match a simple path of child
+        steps. For lazy resources each yielded subtree is removed from its parent when
+        the iteration continues, so the memory usage doesn't depend on the number of
+        records. Not lazy resources are iterated without changing the XML tree.
+
+        :param path: a path of element names, prefixed names or `*` wildcards \
+        separated by slashes, relative to the root or absolute.
+        :param namespaces: an optional mapping from namespace prefixes to URIs \
+        used for resolving prefixed names. The default namespace, mapped by the \
+        empty prefix, is applied to unprefixed names.
+        :param nsmap: provide a list/dict for tracking the namespaces of yielded \
+        elements. If a list is passed the tracking is done at element level, otherwise \
+        the tracking is on the whole tree, renaming prefixes in case of conflicts.
+        :param ancestors: provide a list for tracking the ancestors of yielded elements.
+        """
+        if not self._lazy:
+            yield from self.iterfind(path, namespaces, nsmap, ancestors)
+            return
+
+        steps = self._get_record_steps(path, namespaces)
+        subtree_level = len(steps) - 1
+        if ancestors is not None:
+            ancestors.clear()
+        _ancestors = []
+        matches = []
+        level = 0
+
+        resource = self.open()
+        try:
+            for event, node in self._lazy_iterparse(resource, nsmap):
+                if event == 'start':
+                    if level < subtree_level:
+                        _ancestors.append(node)
+                        if ancestors is not None:
+                            ancestors.append(node)
+                    if level <= subtree_level:
+                        matches.append(steps[level] in ('*', node.tag))
+                    level += 1
+                    continue
+
+                level -= 1
+                if level > subtree_level:
+                    continue
+                elif level == subtree_level:
+                    if all(matches):
+                        yield node
+                else:
+                    _ancestors.pop()
+                    if ancestors is not None:
+                        ancestors.pop()
+
+                # Remove the processed subtree from the tree
+                matches.pop()
+                if _ancestors:
+                    _ancestors[-1].remove(node)
+        finally:
+            if self._source is not resource:
+                resource.close()
+
+    def _get_record_steps(self, path, namespaces=None):
+        if namespaces is None:
+            namespaces = self.get_namespaces(root_only=True)
+
+        path = path.strip()
+        if path.startswith('/'):
+            steps = path[1:].split('/')
+        else:
+            steps = ['*']  # the root
+            if path.startswith('./'):
+                path = path[2:]
+            if path != '.':
+                steps.extend(path.split('/'))
+
+        for k, step in enumerate(steps):
+            step = steps[k] = step.strip()
+            if step == '*' or step.startswith('{'):
+                continue
+            elif not re.match(r'^[^\W\d][\w.\-]*(:[^\W\d][\w.\-]*)?$', step):
+                msg = "invalid step {!r} in record path {!r}".format(step, path)
+                raise XMLResourceError(msg)
+            elif ':' in step:
+                prefix, name = step.split(':')
+                try:
+                    steps[k] = '{%s}%s' % (namespaces[prefix], name)
+                except KeyError:
+                    msg = "unmapped prefix {!r} in record path {!r}"
+                    raise XMLResourceError(msg.format(prefix, path)) from None
+            elif namespaces.get(''):
+                steps[k] = '{%s}%s' % (namespaces[''], step)
+
+        return steps
 
     def find(self, path, namespaces=None, nsmap=None, ancestors=None):
         return next(self.iterfind(path, namespaces, nsmap, ancestors), None)
@@ -96,7 +96,7 @@ def make_schema_test_class(test_file, test_args, test_num, schema_class, check_w
                     deserialized_schema = pickle.loads(obj)
                 except pickle.PicklingError:
                     # Don't raise if some schema parts (eg. a schema loaded from remote)
-                    # are built with the SafeXMLParser that uses pure Python elements.
+                    # are built with pure Python elements.
                     for e in xs.maps.iter_components():
                         elem = getattr(e, 'elem', getattr(e, 'root', None))
                         if isinstance(elem, py_etree_element):
@@ -11,7 +11,7 @@ from .exceptions import XMLSchemaValidatorError, XMLSchemaParseError, \
     XMLSchemaModelError, XMLSchemaModelDepthError, XMLSchemaValidationError, \
     XMLSchemaDecodeError, XMLSchemaEncodeError, XMLSchemaNotBuiltError, \
     XMLSchemaChildrenValidationError, XMLSchemaIncludeWarning, \
-    XMLSchemaImportWarning, XMLSchemaTypeTableWarning
+    XMLSchemaImportWarning, XMLSchemaTypeTableWarning, ValidationErrorRecord
 
 from .xsdbase import XsdValidator, XsdComponent, XsdAnnotation, XsdType, \
     ValidationMixin, ParticleMixin
@@ -30,7 +30,7 @@ from .attributes import XsdAttribute, Xsd11Attribute, XsdAttributeGroup
 from .simple_types import xsd_simple_type_factory, XsdSimpleType, XsdAtomic, XsdAtomicBuiltin, \
     XsdAtomicRestriction, Xsd11AtomicRestriction, XsdList, XsdUnion, Xsd11Union
 from .complex_types import XsdComplexType, Xsd11ComplexType
-from .models import ModelGroup, ModelVisitor
+from .models import ModelGroup, ModelVisitor, ModelAutomaton, ModelDispatchTable
 from .groups import XsdGroup, Xsd11Group
 from .elements import XsdElement, Xsd11Element, XsdAlternative
 
@@ -43,11 +43,11 @@ __all__ = [
     'XMLSchemaModelDepthError', 'XMLSchemaValidationError', 'XMLSchemaDecodeError',
     'XMLSchemaEncodeError', 'XMLSchemaNotBuiltError', 'XMLSchemaChildrenValidationError',
     'XMLSchemaIncludeWarning', 'XMLSchemaImportWarning', 'XMLSchemaTypeTableWarning',
-    'XsdValidator', 'XsdComponent', 'XsdAnnotation', 'XsdType', 'ValidationMixin',
-    'ParticleMixin', 'XsdAssert', 'XsdNotation', 'XsdSelector', 'XsdFieldSelector',
-    'XsdIdentity', 'XsdKeyref', 'XsdKey', 'XsdUnique', 'Xsd11Keyref', 'Xsd11Key',
-    'Xsd11Unique', 'XsdFacet', 'XsdWhiteSpaceFacet', 'XsdLengthFacet', 'XsdMinLengthFacet',
-    'XsdMaxLengthFacet', 'XsdMinExclusiveFacet', 'XsdMinInclusiveFacet',
+    'ValidationErrorRecord', 'XsdValidator', 'XsdComponent', 'XsdAnnotation', 'XsdType',
+    'ValidationMixin', 'ParticleMixin', 'XsdAssert', 'XsdNotation', 'XsdSelector',
+    'XsdFieldSelector', 'XsdIdentity', 'XsdKeyref', 'XsdKey', 'XsdUnique', 'Xsd11Keyref',
+    'Xsd11Key', 'Xsd11Unique', 'XsdFacet', 'XsdWhiteSpaceFacet', 'XsdLengthFacet',
+    'XsdMinLengthFacet', 'XsdMaxLengthFacet', 'XsdMinExclusiveFacet', 'XsdMinInclusiveFacet',
     'XsdMaxExclusiveFacet', 'XsdMaxInclusiveFacet', 'XsdFractionDigitsFacet',
     'XsdTotalDigitsFacet', 'XsdExplicitTimezoneFacet', 'XsdPatternFacets',
     'XsdEnumerationFacets', 'XsdAssertionFacet', 'XsdAnyElement', 'Xsd11AnyElement',
@@ -55,7 +55,9 @@ __all__ = [
     'XsdAttribute', 'Xsd11Attribute', 'XsdAttributeGroup', 'xsd_simple_type_factory',
     'XsdSimpleType', 'XsdAtomic', 'XsdAtomicBuiltin', 'XsdAtomicRestriction',
     'Xsd11AtomicRestriction', 'XsdList', 'XsdUnion', 'Xsd11Union', 'XsdComplexType',
-    'Xsd11ComplexType', 'ModelGroup', 'ModelVisitor', 'XsdGroup', 'Xsd11Group',
+    'Xsd11ComplexType', 'ModelGroup', 'ModelVisitor', 'ModelAutomaton',
+    'ModelDispatchTable', 'XsdGroup',
+    'Xsd11Group',
     'XsdElement', 'Xsd11Element', 'XsdAlternative', 'XsdGlobals', 'XMLSchemaMeta',
     'XMLSchemaBase', 'XMLSchema', 'XMLSchema10', 'XMLSchema11'
 ]
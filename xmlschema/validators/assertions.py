@@ -10,11 +10,12 @@
 import threading
 from elementpath import XPath2Parser, XPathContext, ElementPathError
 
-from ..qnames import XSD_ASSERT
+from ..qnames import XSD_ASSERT, XSD_STRING
 from ..xpath import ElementPathMixin, XMLSchemaProxy
 
 from .exceptions import XMLSchemaValidationError
 from .xsdbase import XsdComponent
+from .predicates import compile_attribute_test
 
 
 class XsdAssert(XsdComponent, ElementPathMixin):
@@ -32,6 +33,7 @@ class XsdAssert(XsdComponent, ElementPathMixin):
     _ADMITTED_TAGS = {XSD_ASSERT}
     token = None
     parser = None
+    predicate = None
     path = 'true()'
 
     def __init__(self, elem, schema, parent, base_type):
@@ -95,13 +97,48 @@ class XsdAssert(XsdComponent, ElementPathMixin):
         finally:
             self.parser.variable_types.clear()
 
-    def __call__(self, elem, value=None, namespaces=None, source=None, **kwargs):
-        with self._xpath_lock:
-            if not self.parser.is_schema_bound():
-                self.parser.schema.bind_parser(self.parser)
+        self.predicate = compile_attribute_test(
+            self.token, self.namespaces, self._get_attribute_normalizer
+        )
+
+    def _get_attribute_normalizer(self, name):
+        # Only string attributes have typed values that can be compared
+        # with string literals without decoding them.
+        try:
+            xsd_type = self.parent.attributes[name].type
+        except (KeyError, AttributeError):
+            return
+        if xsd_type.is_atomic() and xsd_type.primitive_type.name == XSD_STRING:
+            return xsd_type.normalize
+
+    def __call__(self, elem, value=None, namespaces=None, source=None,
+                 assertion_context=None, **kwargs):
+        if self.predicate is not None:
+            if not self.predicate(elem.attrib):
+                yield XMLSchemaValidationError(self, obj=elem, reason="assertion test if false")
+            return
+
+        if not self.parser.is_schema_bound():
+            # The parser is bound at build time, this is needed only for
+            # parsers restored from a serialized state. Double-checked for
+            # keeping the lock out of the validation of built schemas.
+            with self._assert_xpath_lock:
+                if not self.parser.is_schema_bound():
+                    self.parser.schema.bind_parser(self.parser)
 
         variables = {'value': None if value is None else self.base_type.text_decode(value)}
-        if source is not None:
+        if assertion_context is not None:
+            # Reuse the context shared by the decoding of the subtree. The parent
+            # map is built before the evaluation, so it's built once and it's
+            # inherited by the copies of the context made by elementpath.
+            context = assertion_context
+            context.item = elem
+            context.namespaces = namespaces
+            context.variables = variables
+            context.position = context.size = 1
+            context.axis = None
+            _ = context.parent_map
+        elif source is not None:
             context = XPathContext(source.root, namespaces=namespaces,
                                    item=elem, variables=variables)
         else:
@@ -260,6 +260,8 @@ class XsdAttribute(XsdComponent, ValidationMixin):
             if isinstance(result, XMLSchemaValidationError):
                 yield result
                 continue
+            elif kwargs.get('validation_only'):
+                yield result
             elif isinstance(result, Decimal):
                 try:
                     yield kwargs['decimal_type'](result)
@@ -654,6 +656,7 @@ class XsdAttributeGroup(MutableMapping, XsdComponent, ValidationMixin):
         if self.xsd_version == '1.0':
             kwargs['id_list'] = []
 
+        validation_only = kwargs.get('validation_only', False)
         filler = kwargs.get('filler')
         result_list = []
         for name, value in attrs.items():
@@ -688,6 +691,8 @@ class XsdAttributeGroup(MutableMapping, XsdComponent, ValidationMixin):
             for result in xsd_attribute.iter_decode(value, validation, **kwargs):
                 if isinstance(result, XMLSchemaValidationError):
                     yield result
+                elif validation_only:
+                    break
                 elif result is None and filler is not None:
                     result_list.append((name, filler(xsd_attribute)))
                     break
@@ -695,7 +700,10 @@ class XsdAttributeGroup(MutableMapping, XsdComponent, ValidationMixin):
                     result_list.append((name, result))
                     break
 
-        if kwargs.get('fill_missing'):
+        if validation_only:
+            yield None
+            return
+        elif kwargs.get('fill_missing'):
             if filler is None:
                 result_list.extend((k, None) for k in self._attribute_group
                                    if k is not None and k not in attrs)
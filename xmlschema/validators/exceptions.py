@@ -7,10 +7,20 @@
 #
 # @author Davide Brunato <brunato@sissa.it>
 #
+from collections import namedtuple
+
 from ..exceptions import XMLSchemaException, XMLSchemaWarning, XMLSchemaValueError
 from ..qnames import get_prefixed_qname
 from ..etree import is_etree_element, etree_tostring, etree_getpath
 
+ValidationErrorRecord = namedtuple(
+    'ValidationErrorRecord', 'validator path reason sourceline error_class'
+)
+ValidationErrorRecord.__doc__ = """
+A lightweight record of a validation error, for bulk reporting. Doesn't keep
+references to XML data, so it can be collected without keeping elements alive.
+"""
+
 
 class XMLSchemaValidatorError(XMLSchemaException):
     """
@@ -27,16 +37,45 @@ class XMLSchemaValidatorError(XMLSchemaException):
     :param namespaces: is an optional mapping from namespace prefix to URI.
     :type namespaces: dict
     :ivar path: the XPath of the element, calculated when the element is set \
-    or the XML resource is set.
+    for a lazy XML resource, otherwise calculated at first access if the XML \
+    resource has been set before the element.
     """
+    _path = None
+    _path_args = None  # the root and the namespaces for calculating a deferred path
+
     def __init__(self, validator, message, elem=None, source=None, namespaces=None):
         self.path = None
         self.validator = validator
-        self.message = message[:-1] if message[-1] in ('.', ':') else message
+        self.message = message
         self.namespaces = namespaces
         self.source = source
         self.elem = elem
 
+    @property
+    def message(self):
+        return self._message
+
+    @message.setter
+    def message(self, message):
+        if message and message[-1] in ('.', ':'):
+            message = message[:-1]
+        self._message = message
+
+    @property
+    def path(self):
+        if self._path_args is not None:
+            root, namespaces = self._path_args
+            self._path_args = None
+            if self.elem is not None:
+                self._path = etree_getpath(self.elem, root, namespaces,
+                                           relative=False, add_position=True)
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        self._path_args = None
+        self._path = path
+
     def __str__(self):
         if self.elem is None:
             return self.message
@@ -63,11 +102,16 @@ class XMLSchemaValidatorError(XMLSchemaException):
                 raise XMLSchemaValueError(
                     "'elem' attribute requires an Element, not %r." % type(value)
                 )
-            if self.source is not None:
+            if self.source is None:
+                pass
+            elif self.source.is_lazy():
                 self.path = etree_getpath(value, self.root, self.namespaces,
                                           relative=False, add_position=True)
-                if self.source.is_lazy():
-                    value = None  # Don't save the element of a lazy resource
+                value = None  # Don't save the element of a lazy resource
+            else:
+                # The path of an element of a fully loaded tree is deferred
+                self._path = None
+                self._path_args = self.root, self.namespaces
         super(XMLSchemaValidatorError, self).__setattr__(name, value)
 
     @property
@@ -179,16 +223,15 @@ class XMLSchemaValidationError(XMLSchemaValidatorError, ValueError):
     :type source: XMLResource
     :param namespaces: is an optional mapping from namespace prefix to URI.
     :type namespaces: dict
+
+    The message, that contains the representations of the object and of the \
+    validator, is formatted at first access.
     """
     def __init__(self, validator, obj, reason=None, source=None, namespaces=None):
-        if not isinstance(obj, str):
-            _obj = obj
-        else:
-            _obj = obj.encode('ascii', 'xmlcharrefreplace').decode('utf-8')
-
+        self._message_obj = obj
         super(XMLSchemaValidationError, self).__init__(
             validator=validator,
-            message="failed validating {!r} with {!r}".format(_obj, validator),
+            message=None,
             elem=obj if is_etree_element(obj) else None,
             source=source,
             namespaces=namespaces,
@@ -199,6 +242,25 @@ class XMLSchemaValidationError(XMLSchemaValidatorError, ValueError):
     def __repr__(self):
         return '%s(reason=%r)' % (self.__class__.__name__, self.reason)
 
+    @property
+    def message(self):
+        if self._message is None:
+            obj = self._message_obj
+            if isinstance(obj, str):
+                obj = obj.encode('ascii', 'xmlcharrefreplace').decode('utf-8')
+            self._message = "failed validating {!r} with {!r}".format(obj, self.validator)
+        return self._message
+
+    @message.setter
+    def message(self, message):
+        XMLSchemaValidatorError.message.fset(self, message)
+
+    def to_record(self):
+        """Returns a :class:`ValidationErrorRecord` with the data of the error."""
+        return ValidationErrorRecord(
+            self.validator, self.path, self.reason, self.sourceline, self.__class__.__name__
+        )
+
     def __str__(self):
         msg = ['%s:\n' % self.message]
         if self.reason is not None:
@@ -239,8 +301,6 @@ class XMLSchemaDecodeError(XMLSchemaValidationError):
     :param namespaces: is an optional mapping from namespace prefix to URI.
     :type namespaces: dict
     """
-    message = "failed decoding {!r} with {!r}.\n"
-
     def __init__(self, validator, obj, decoder, reason=None, source=None, namespaces=None):
         super(XMLSchemaDecodeError, self).__init__(validator, obj, reason, source, namespaces)
         self.decoder = decoder
@@ -263,8 +323,6 @@ class XMLSchemaEncodeError(XMLSchemaValidationError):
     :param namespaces: is an optional mapping from namespace prefix to URI.
     :type namespaces: dict
     """
-    message = "failed encoding {!r} with {!r}.\n"
-
     def __init__(self, validator, obj, encoder, reason=None, source=None, namespaces=None):
         super(XMLSchemaEncodeError, self).__init__(validator, obj, reason, source, namespaces)
         self.encoder = encoder
@@ -290,6 +348,9 @@ class XMLSchemaChildrenValidationError(XMLSchemaValidationError):
     :type source: XMLResource
     :param namespaces: is an optional mapping from namespace prefix to URI.
     :type namespaces: dict
+
+    The reason is formatted at first access, from the tags of the element and \
+    of the child, that are saved because the element of a lazy resource is pruned.
     """
     def __init__(self, validator, elem, index, particle, occurs=0,
                  expected=None, source=None, namespaces=None):
@@ -297,13 +358,32 @@ class XMLSchemaChildrenValidationError(XMLSchemaValidationError):
         self.particle = particle
         self.occurs = occurs
         self.expected = expected
+        self._tags = elem.tag, elem[index].tag if index < len(elem) else None
+
+        super(XMLSchemaChildrenValidationError, self).\
+            __init__(validator, elem, None, source, namespaces)
 
-        tag = get_prefixed_qname(elem.tag, validator.namespaces, use_empty=False)
-        if index >= len(elem):
+    @property
+    def reason(self):
+        if self._reason is None:
+            self._reason = self._get_reason()
+        return self._reason
+
+    @reason.setter
+    def reason(self, reason):
+        self._reason = reason
+
+    def _get_reason(self):
+        particle, occurs, expected = self.particle, self.occurs, self.expected
+        namespaces = self.validator.namespaces
+
+        tag, child_tag = self._tags
+        if child_tag is None:
+            tag = get_prefixed_qname(tag, namespaces, use_empty=False)
             reason = "The content of element %r is not complete." % tag
         else:
-            child_tag = get_prefixed_qname(elem[index].tag, validator.namespaces, use_empty=False)
-            reason = "Unexpected child with tag %r at position %d." % (child_tag, index + 1)
+            child_tag = get_prefixed_qname(child_tag, namespaces, use_empty=False)
+            reason = "Unexpected child with tag %r at position %d." % (child_tag, self.index + 1)
 
         if occurs and particle.is_missing(occurs):
             reason += " The particle %r occurs %d times but the minimum is %d." % (
@@ -331,8 +411,7 @@ class XMLSchemaChildrenValidationError(XMLSchemaValidationError):
             else:
                 reason += " Tag (%s) expected." % ' | '.join(expected_tags)
 
-        super(XMLSchemaChildrenValidationError, self).\
-            __init__(validator, elem, reason, source, namespaces)
+        return reason
 
 
 class XMLSchemaIncludeWarning(XMLSchemaWarning):
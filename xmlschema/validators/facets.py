@@ -14,6 +14,7 @@ import re
 import math
 import operator
 from collections.abc import MutableSequence
+from decimal import Decimal
 from elementpath import XPath2Parser, XPathContext, ElementPathError, \
     translate_pattern, RegexError
 
@@ -28,6 +29,9 @@ from ..helpers import count_digits
 from .exceptions import XMLSchemaValidationError, XMLSchemaDecodeError
 from .xsdbase import XsdComponent
 
+# Maximum number of enumeration values reported by the reason of a validation error
+ENUMERATION_REASON_MAXSIZE = 10
+
 
 class XsdFacet(XsdComponent):
     """
@@ -569,6 +573,31 @@ class XsdEnumerationFacets(MutableSequence, XsdFacet):
         super(XsdFacet, self)._parse()
         self._elements = [self.elem]
         self.enumeration = [self._parse_value(self.elem)]
+        self._build_index()
+
+    def _build_index(self):
+        """
+        Builds the hash-based index of the enumeration values, used for checking
+        the membership of a value without scanning the enumeration. List values
+        are indexed by their tuple, unhashable values are kept apart and scanned.
+        """
+        self._index = set()
+        self._unhashable = []
+        self._has_nan = self._has_inf = False
+        for value in self.enumeration:
+            self._add_to_index(value)
+
+    def _add_to_index(self, value):
+        try:
+            self._index.add((list, tuple(value)) if isinstance(value, list) else value)
+        except TypeError:
+            self._unhashable.append(value)
+
+        if isinstance(value, (float, Decimal)):
+            if math.isnan(value):
+                self._has_nan = True
+            elif math.isinf(value):
+                self._has_inf = True
 
     def _parse_value(self, elem):
         try:
@@ -598,17 +627,21 @@ class XsdEnumerationFacets(MutableSequence, XsdFacet):
     def __setitem__(self, i, elem):
         self._elements[i] = elem
         self.enumeration[i] = self._parse_value(elem)
+        self._build_index()
 
     def __delitem__(self, i):
         del self._elements[i]
         del self.enumeration[i]
+        self._build_index()
 
     def __len__(self):
         return len(self._elements)
 
     def insert(self, i, elem):
         self._elements.insert(i, elem)
-        self.enumeration.insert(i, self._parse_value(elem))
+        value = self._parse_value(elem)
+        self.enumeration.insert(i, value)
+        self._add_to_index(value)
 
     def __repr__(self):
         if len(self.enumeration) > 5:
@@ -619,18 +652,33 @@ class XsdEnumerationFacets(MutableSequence, XsdFacet):
             return '%s(%r)' % (self.__class__.__name__, self.enumeration)
 
     def __call__(self, value):
-        if value in self.enumeration:
-            return
+        try:
+            if ((list, tuple(value)) if isinstance(value, list) else value) in self._index:
+                return
+        except TypeError:
+            if value in self.enumeration:
+                return
+        else:
+            if self._unhashable and value in self._unhashable:
+                return
 
         try:
-            if math.isnan(value) and any(math.isnan(x) for x in self.enumeration):
+            if math.isnan(value) and self._has_nan:
                 return
-            elif math.isinf(value) and any(math.isinf(x) for x in self.enumeration):
+            elif math.isinf(value) and self._has_inf:
                 return
         except TypeError:
             pass
 
-        reason = "invalid value %r, it must be one of %r" % (value, self.enumeration)
+        if len(self.enumeration) > ENUMERATION_REASON_MAXSIZE:
+            enumeration = '[%s, ...]' % ', '.join(
+                map(repr, self.enumeration[:ENUMERATION_REASON_MAXSIZE])
+            )
+            reason = "invalid value %r, it must be one of %s (%d values)" % (
+                value, enumeration, len(self.enumeration)
+            )
+        else:
+            reason = "invalid value %r, it must be one of %r" % (value, self.enumeration)
         yield XMLSchemaValidationError(self, value, reason=reason)
 
 
@@ -646,6 +694,8 @@ class XsdPatternFacets(MutableSequence, XsdFacet):
         </pattern>
     """
     _ADMITTED_TAGS = {XSD_PATTERN}
+    _PATTERN_PREFIX = '^(?:'
+    _PATTERN_SUFFIX = ')$(?!\\n\\Z)'
 
     def __init__(self, elem, schema, parent, base_type):
         XsdFacet.__init__(self, elem, schema, parent, base_type)
@@ -654,6 +704,29 @@ class XsdPatternFacets(MutableSequence, XsdFacet):
         super(XsdFacet, self)._parse()
         self._elements = [self.elem]
         self.patterns = [self._parse_value(self.elem)]
+        self._regex = self.patterns[0]
+
+    def _combine_patterns(self):
+        """
+        Combines the patterns into a single regex, sharing the anchors
+        added by the translation of XSD regular expressions.
+        """
+        if len(self.patterns) <= 1:
+            self._regex = self.patterns[0] if self.patterns else None
+            return
+
+        prefix, suffix = self._PATTERN_PREFIX, self._PATTERN_SUFFIX
+        regexps = [p.pattern for p in self.patterns]
+        if all(x.startswith(prefix) and x.endswith(suffix) for x in regexps):
+            regexps = ['(?:%s)' % x[len(prefix):-len(suffix)] for x in regexps]
+            pattern = '%s%s%s' % (prefix, '|'.join(regexps), suffix)
+        else:
+            pattern = '|'.join('(?:%s)' % x for x in regexps)
+
+        try:
+            self._regex = re.compile(pattern)
+        except re.error:
+            self._regex = None  # Fallback to matching patterns one by one
 
     def _parse_value(self, elem):
         try:
@@ -679,10 +752,12 @@ class XsdPatternFacets(MutableSequence, XsdFacet):
     def __setitem__(self, i, elem):
         self._elements[i] = elem
         self.patterns[i] = self._parse_value(elem)
+        self._combine_patterns()
 
     def __delitem__(self, i):
         del self._elements[i]
         del self.patterns[i]
+        self._combine_patterns()
 
     def __len__(self):
         return len(self._elements)
@@ -690,6 +765,7 @@ class XsdPatternFacets(MutableSequence, XsdFacet):
     def insert(self, i, elem):
         self._elements.insert(i, elem)
         self.patterns.insert(i, self._parse_value(elem))
+        self._combine_patterns()
 
     def __repr__(self):
         s = repr(self.regexps)
@@ -700,7 +776,11 @@ class XsdPatternFacets(MutableSequence, XsdFacet):
 
     def __call__(self, text):
         try:
-            if all(pattern.match(text) is None for pattern in self.patterns):
+            if self._regex is not None:
+                if self._regex.match(text) is None:
+                    msg = "value doesn't match any pattern of %r."
+                    yield XMLSchemaValidationError(self, text, reason=msg % self.regexps)
+            elif all(pattern.match(text) is None for pattern in self.patterns):
                 msg = "value doesn't match any pattern of %r."
                 yield XMLSchemaValidationError(self, text, reason=msg % self.regexps)
         except TypeError as err:
@@ -10,6 +10,7 @@
 """
 This module contains functions and classes for namespaces XSD declarations/definitions.
 """
+import threading
 import warnings
 from collections import Counter
 from functools import lru_cache
@@ -27,6 +28,10 @@ from . import XMLSchemaNotBuiltError, XMLSchemaModelError, XMLSchemaModelDepthEr
 from .builtins import xsd_builtin_types_factory
 
 
+# Serializes the on-demand loads of namespaces made by XSD wildcards
+_load_namespace_lock = threading.RLock()
+
+
 #
 # Defines the load functions for XML Schema structures
 def create_load_function(tag):
@@ -418,6 +423,14 @@ class XsdGlobals(XsdValidator):
         elif self.validator.meta_schema is None:
             return False  # Do not load additional namespaces for meta-schema (XHTML)
 
+        # Loads are serialized, so concurrent validations with the same schema
+        # import and build the schemas of a namespace only once.
+        with _load_namespace_lock:
+            if namespace in self.namespaces:
+                return True
+            return self._load_namespace(namespace, build)
+
+    def _load_namespace(self, namespace, build):
         # Try from schemas location hints: usually the namespaces related to these
         # hints are already loaded during schema construction, but it's better to
         # retry once if the initial load has failed.
@@ -18,12 +18,13 @@ from ..etree import etree_element
 from ..qnames import XSD_GROUP, XSD_SEQUENCE, XSD_ALL, XSD_CHOICE, XSD_ELEMENT, \
     XSD_ANY, XSI_TYPE, XSD_ANY_TYPE, get_qname, local_name, is_not_xsd_annotation
 
-from .exceptions import XMLSchemaValidationError, XMLSchemaChildrenValidationError, \
-    XMLSchemaTypeTableWarning
+from .exceptions import XMLSchemaModelError, XMLSchemaValidationError, \
+    XMLSchemaChildrenValidationError, XMLSchemaTypeTableWarning
 from .xsdbase import ValidationMixin, XsdComponent, XsdType
 from .elements import XsdElement
 from .wildcards import XsdAnyElement, Xsd11AnyElement
-from .models import ParticleMixin, ModelGroup, ModelVisitor
+from .models import ParticleMixin, ModelGroup, ModelVisitor, ModelAutomaton, \
+    ModelDispatchTable
 
 ANY_ELEMENT = etree_element(
     XSD_ANY,
@@ -83,6 +84,8 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
     restriction = None
     interleave = None  # an Xsd11AnyElement in case of XSD 1.1 openContent with mode='interleave'
     suffix = None  # an Xsd11AnyElement in case of openContent with mode='suffix' or 'interleave'
+    _automaton = ()  # lazily compiled model automaton, `None` if the model is not compilable
+    _dispatch_table = ()  # lazily built dispatch table, `None` if the model can't be indexed
 
     _ADMITTED_TAGS = {XSD_GROUP, XSD_SEQUENCE, XSD_ALL, XSD_CHOICE}
 
@@ -109,6 +112,8 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
         group.__dict__.update(self.__dict__)
         group.errors = self.errors[:]
         group._group = self._group[:]
+        group.__dict__.pop('_automaton', None)
+        group.__dict__.pop('_dispatch_table', None)
         return group
 
     __copy__ = copy
@@ -299,6 +304,38 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
         if self.redefine is not None and self.redefine not in self:
             yield from self.redefine.iter_components(xsd_classes)
 
+    @property
+    def automaton(self):
+        """
+        The compiled automaton of the model group, used as fast path by decode and encode
+        when the option *compiled_models* is provided. It's `None` if the model is not
+        compilable (eg. models with wildcards, 'all' groups or XSD 1.1 open content).
+        """
+        if self._automaton == ():
+            if self.interleave is not None or self.suffix is not None or not self.built:
+                return None
+            try:
+                self._automaton = ModelAutomaton(self)
+            except (XMLSchemaValueError, XMLSchemaModelError):
+                self._automaton = None
+        return self._automaton
+
+    @property
+    def dispatch_table(self):
+        """
+        The dispatch table of the model group, that indexes the model particles by the
+        names of the elements they can match, for avoiding linear scans of the group
+        for each child element. It's `None` if the group is not built yet.
+        """
+        if self._dispatch_table == ():
+            if not self.built:
+                return None
+            try:
+                self._dispatch_table = ModelDispatchTable(self)
+            except (XMLSchemaValueError, XMLSchemaModelError):
+                self._dispatch_table = None
+        return self._dispatch_table
+
     def admits_restriction(self, model):
         if self.model == model:
             return True
@@ -576,6 +613,10 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
         Try a model-less match of a child element. Returns the
         matched element, or `None` if there is no match.
         """
+        dispatch_table = self.dispatch_table
+        if dispatch_table is not None:
+            return dispatch_table.match_element(name, default_namespace, group=self)
+
         for xsd_element in self.iter_elements():
             if xsd_element.is_matching(name, default_namespace, group=self):
                 return xsd_element
@@ -588,10 +629,13 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
         :param validation: the validation mode, can be 'lax', 'strict' or 'skip'.
         :param kwargs: keyword arguments for the decoding process.
         :return: yields a list of 3-tuples (key, decoded data, decoder), \
-        eventually preceded by a sequence of validation or decoding errors.
+        eventually preceded by a sequence of validation or decoding errors. \
+        With the *validation_only* option only the leading text of the element \
+        is collected, the decoded data of child elements is discarded.
         """
         result_list = []
         cdata_index = 1  # keys for CDATA sections are positive integers
+        validation_only = kwargs.get('validation_only', False)
 
         if not self._group and self.model == 'choice' and self.min_occurs:
             reason = "an empty 'choice' group with minOccurs > 0 cannot validate any content"
@@ -631,7 +675,11 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
             except AttributeError:
                 default_namespace = None
 
-        model = ModelVisitor(self)
+        matches = None
+        if kwargs.get('compiled_models') and self.automaton is not None:
+            matches = self.automaton.match((child.tag for child in elem), default_namespace)
+
+        model = ModelVisitor(self) if matches is None else None
         errors = []
         broken_model = False
 
@@ -639,54 +687,63 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
             if callable(child.tag):
                 continue  # child is a <class 'lxml.etree._Comment'>
 
-            while model.element is not None:
-                xsd_element = model.element.match(
-                    child.tag, default_namespace, group=self, occurs=model.occurs
-                )
-                if xsd_element is None:
-                    if self.interleave is not None and self.interleave.is_matching(
-                            child.tag, default_namespace, self, model.occurs):
-                        xsd_element = self.interleave
-                        break
-
-                    for particle, occurs, expected in model.advance(False):
-                        errors.append((index, particle, occurs, expected))
-                        model.clear()
-                        broken_model = True  # the model is broken, continues with raw decoding.
-                        xsd_element = self.match_element(child.tag, default_namespace)
-                        break
-                    else:
-                        continue
-                    break
-
+            if matches is not None:
+                model_element, xsd_element = matches[index]
                 try:
-                    self.check_dynamic_context(child, xsd_element, model.element, namespaces)
+                    self.check_dynamic_context(child, xsd_element, model_element, namespaces)
                 except XMLSchemaValidationError as err:
                     yield self.validation_error(validation, err, elem, **kwargs)
-
-                for particle, occurs, expected in model.advance(True):
-                    errors.append((index, particle, occurs, expected))
-                break
             else:
-                if self.suffix is not None and \
-                        self.suffix.is_matching(child.tag, default_namespace, self):
-                    xsd_element = self.suffix
-                else:
-                    xsd_element = self.match_element(child.tag, default_namespace)
+                while model.element is not None:
+                    if self.interleave is None:
+                        model.skip_choices(child.tag, default_namespace)
+                    xsd_element = model.element.match(
+                        child.tag, default_namespace, group=self, occurs=model.occurs
+                    )
                     if xsd_element is None:
-                        errors.append((index, self, 0, None))
-                        broken_model = True
-                    elif not broken_model:
-                        errors.append((index, xsd_element, 0, []))
-                        broken_model = True
+                        if self.interleave is not None and self.interleave.is_matching(
+                                child.tag, default_namespace, self, model.occurs):
+                            xsd_element = self.interleave
+                            break
+
+                        for particle, occurs, expected in model.advance(False):
+                            errors.append((index, particle, occurs, expected))
+                            model.clear()
+                            broken_model = True  # the model is broken, continues with raw decoding.
+                            xsd_element = self.match_element(child.tag, default_namespace)
+                            break
+                        else:
+                            continue
+                        break
+
+                    try:
+                        self.check_dynamic_context(child, xsd_element, model.element, namespaces)
+                    except XMLSchemaValidationError as err:
+                        yield self.validation_error(validation, err, elem, **kwargs)
+
+                    for particle, occurs, expected in model.advance(True):
+                        errors.append((index, particle, occurs, expected))
+                    break
+                else:
+                    if self.suffix is not None and \
+                            self.suffix.is_matching(child.tag, default_namespace, self):
+                        xsd_element = self.suffix
+                    else:
+                        xsd_element = self.match_element(child.tag, default_namespace)
+                        if xsd_element is None:
+                            errors.append((index, self, 0, None))
+                            broken_model = True
+                        elif not broken_model:
+                            errors.append((index, xsd_element, 0, []))
+                            broken_model = True
 
             if xsd_element is None:
-                if kwargs.get('keep_unknown'):
+                if kwargs.get('keep_unknown') and not validation_only:
                     for result in self.any_type.iter_decode(child, validation, **kwargs):
                         result_list.append((child.tag, result, None))
                 continue
             elif over_max_depth:
-                if 'depth_filler' in kwargs:
+                if 'depth_filler' in kwargs and not validation_only:
                     obj = kwargs['depth_filler']
                     result_list.append((child.tag, obj(xsd_element), xsd_element))
                 continue
@@ -694,10 +751,12 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
             for result in xsd_element.iter_decode(child, validation, **kwargs):
                 if isinstance(result, XMLSchemaValidationError):
                     yield result
-                else:
+                elif not validation_only:
                     result_list.append((child.tag, result, xsd_element))
 
-            if cdata_index and child.tail is not None:
+            if validation_only:
+                continue  # children data and tails are not collected
+            elif cdata_index and child.tail is not None:
                 tail = str(child.tail.strip())
                 if tail:
                     if result_list and isinstance(result_list[-1][0], int):
@@ -707,7 +766,7 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
                         result_list.append((cdata_index, tail, None))
                         cdata_index += 1
 
-        if model.element is not None:
+        if model is not None and model.element is not None:
             index = len(elem)
             for particle, occurs, expected in model.stop():
                 errors.append((index, particle, occurs, expected))
@@ -746,7 +805,6 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
             converter = kwargs['converter'] = self.schema.get_converter(**kwargs)
 
         default_namespace = converter.get('')
-        model = ModelVisitor(self)
         index = cdata_index = 0
         wrong_content_type = False
 
@@ -762,6 +820,12 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
         else:
             content = ModelVisitor(self).iter_collapsed_content(element_data.content)
 
+        matches = None
+        if kwargs.get('compiled_models') and self.automaton is not None:
+            content = list(content)
+            matches = self.automaton.match((name for name, _ in content), default_namespace)
+
+        model = ModelVisitor(self) if matches is None else None
         for index, (name, value) in enumerate(content):
             if isinstance(name, int):
                 if not children:
@@ -773,11 +837,15 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
                 cdata_index += 1
                 continue
 
-            if self.interleave and self.interleave.is_matching(name, default_namespace, group=self):
+            if matches is not None:
+                xsd_element = matches[index][1]
+            elif self.interleave and \
+                    self.interleave.is_matching(name, default_namespace, group=self):
                 xsd_element = self.interleave
                 value = get_qname(default_namespace, name), value
             else:
                 while model.element is not None:
+                    model.skip_choices(name, default_namespace)
                     xsd_element = model.element.match(
                         name, default_namespace, group=self, occurs=model.occurs
                     )
@@ -817,7 +885,7 @@ class XsdGroup(XsdComponent, ModelGroup, ValidationMixin):
                 else:
                     children.append(result)
 
-        if model.element is not None:
+        if model is not None and model.element is not None:
             for particle, occurs, expected in model.stop():
                 errors.append((index - cdata_index + 1, particle, occurs, expected))
 
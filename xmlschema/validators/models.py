@@ -10,11 +10,13 @@
 """
 This module contains classes and functions for processing XSD content models.
 """
+from bisect import bisect_right
 from collections import defaultdict, deque, Counter
 from collections.abc import MutableSequence
 
 from .. import limits
 from ..exceptions import XMLSchemaValueError
+from ..qnames import get_namespace
 from .exceptions import XMLSchemaModelError, XMLSchemaModelDepthError
 from .xsdbase import ParticleMixin
 from .wildcards import XsdAnyElement, Xsd11AnyElement
@@ -26,6 +28,7 @@ class ModelGroup(MutableSequence, ParticleMixin):
     schema element parsing and validation methods are implemented in derived classes.
     """
     parent = None
+    dispatch_table = None
 
     def __init__(self, model):
         self._group = []
@@ -419,6 +422,31 @@ class ModelVisitor(MutableSequence):
         self.clear()
         self._start()
 
+    def skip_choices(self, name, default_namespace=None):
+        """
+        Moves the current element of a 'choice' group to the first following item
+        that can match the name, using the dispatch table of the group. If the item
+        is a model group the visit stops at the previous item, so the group is entered
+        by the next advance. The model occurrences don't change, because the skipped
+        items are elements of a choice without a match. Does nothing if the current
+        element can match the name or if there is no following item that can match it.
+
+        :param name: a local or fully-qualified name.
+        :param default_namespace: used for completing local names when it's not \
+        `None` and not empty.
+        """
+        if self.match or self.group.model != 'choice' or self.group.max_occurs == 0:
+            return
+
+        dispatch_table = self.group.dispatch_table
+        if dispatch_table is not None:
+            position = dispatch_table.next_choice(self.element, name, default_namespace)
+            if position is not None:
+                if isinstance(self.group[position], ModelGroup):
+                    position -= 1  # stops before the group, that is entered by advance()
+                self.element = self.group[position]
+                self.items = iter(self.group[position + 1:])
+
     def stop(self):
         while self.element is not None:
             for e in self.advance():
@@ -701,3 +729,322 @@ class ModelVisitor(MutableSequence):
         for name, values in unordered_content.items():
             for v in values:
                 yield name, v
+
+
+class ModelAutomaton(object):
+    """
+    A deterministic finite automaton compiled from an XSD model group. The particles
+    of the model are expanded to a non-deterministic automaton, unrolling bounded
+    occurrences, that is then converted to a transition table keyed by element names.
+    Can be used as a fast path for matching a sequence of children against the model,
+    falling back to a :class:`ModelVisitor` for reporting errors.
+
+    Models containing wildcards or 'all' groups are not compilable, nor models that
+    expand to too many states. In these cases an `XMLSchemaValueError` is raised.
+
+    :param root: the root ModelGroup instance of the model.
+    :ivar transitions: a list of dictionaries, one for each state, that map element \
+    names to 3-tuples (next state, model particle, matched XSD element).
+    :ivar final: the set of accepting states.
+    """
+    max_states = 1000
+    """Maximum number of states of the expanded and of the compiled automaton."""
+
+    def __init__(self, root):
+        self.root = root
+        self._edges = []    # for each NFA state a list of (names, particle, target)
+        self._epsilon = []  # for each NFA state a list of epsilon target states
+
+        start = self._new_state()
+        end = self._compile_particle(root, start, depth=0)
+        self._build_dfa(start, end)
+        del self._edges, self._epsilon
+
+    def __repr__(self):
+        return '%s(root=%r, states=%r)' % (
+            self.__class__.__name__, self.root, len(self.transitions)
+        )
+
+    def _new_state(self):
+        if len(self._edges) >= self.max_states:
+            raise XMLSchemaValueError("too many states for compiling %r" % self.root)
+        self._edges.append([])
+        self._epsilon.append([])
+        return len(self._edges) - 1
+
+    def _compile_particle(self, item, start, depth):
+        if depth > limits.MAX_MODEL_DEPTH:
+            raise XMLSchemaModelDepthError(self.root)
+
+        if isinstance(item, ModelGroup):
+            if item.model not in ('sequence', 'choice'):
+                raise XMLSchemaValueError("cannot compile a model with %r groups" % item.model)
+
+            def compile_once(state):
+                if item.model == 'sequence':
+                    for particle in item:
+                        state = self._compile_particle(particle, state, depth + 1)
+                    return state
+
+                target = self._new_state()
+                for particle in item:
+                    self._epsilon[self._compile_particle(particle, state, depth + 1)].append(target)
+                if not item:
+                    self._epsilon[state].append(target)
+                return target
+
+        elif isinstance(item, XsdAnyElement):
+            raise XMLSchemaValueError("cannot compile a model with wildcards")
+        else:
+            names = {item.name: item}
+            for xsd_element in item.iter_substitutes():
+                names.setdefault(xsd_element.name, xsd_element)
+
+            def compile_once(state):
+                target = self._new_state()
+                self._edges[state].append((names, item, target))
+                return target
+
+        # Expands minOccurs/maxOccurs
+        state = start
+        for _ in range(item.min_occurs):
+            state = compile_once(state)
+
+        if item.max_occurs is None:
+            loop = self._new_state()
+            self._epsilon[state].append(loop)
+            self._epsilon[compile_once(loop)].append(loop)
+            return loop
+
+        end = self._new_state()
+        self._epsilon[state].append(end)
+        for _ in range(item.max_occurs - item.min_occurs):
+            state = compile_once(state)
+            self._epsilon[state].append(end)
+        return end
+
+    def _closure(self, states):
+        closure = set(states)
+        stack = list(states)
+        while stack:
+            for state in self._epsilon[stack.pop()]:
+                if state not in closure:
+                    closure.add(state)
+                    stack.append(state)
+        return frozenset(closure)
+
+    def _build_dfa(self, start, end):
+        initial = self._closure((start,))
+        dfa_states = {initial: 0}
+        self.transitions = []
+        self.final = set()
+
+        queue = deque([initial])
+        while queue:
+            nfa_states = queue.popleft()
+            if end in nfa_states:
+                self.final.add(dfa_states[nfa_states])
+
+            moves = {}
+            for state in nfa_states:
+                for names, particle, target in self._edges[state]:
+                    for name, xsd_element in names.items():
+                        try:
+                            targets, matched = moves[name]
+                        except KeyError:
+                            moves[name] = {target}, (particle, xsd_element)
+                        else:
+                            if matched[0] is not particle:
+                                msg = "ambiguous attribution of %r in %r"
+                                raise XMLSchemaValueError(msg % (name, self.root))
+                            targets.add(target)
+
+            table = {}
+            for name, (targets, (particle, xsd_element)) in moves.items():
+                next_states = self._closure(targets)
+                try:
+                    index = dfa_states[next_states]
+                except KeyError:
+                    index = dfa_states[next_states] = len(dfa_states)
+                    if index >= self.max_states:
+                        msg = "too many states for compiling %r" % self.root
+                        raise XMLSchemaValueError(msg)
+                    queue.append(next_states)
+                table[name] = index, particle, xsd_element
+
+            self.transitions.append(table)
+
+    def match(self, names, default_namespace=None):
+        """
+        Matches a sequence of element names against the model. Returns a list of
+        couples (model particle, matched XSD element), one for each name, or `None`
+        if the sequence is not accepted by the model. Items that are not strings,
+        like the tags of comments and processing instructions, are matched to `None`.
+
+        :param names: an iterable of local or fully-qualified names.
+        :param default_namespace: used for completing local names when it's not \
+        `None` and not empty.
+        """
+        transitions = self.transitions
+        state = 0
+        matches = []
+        for name in names:
+            if not isinstance(name, str):
+                matches.append(None)
+                continue
+
+            try:
+                state, particle, xsd_element = transitions[state][name]
+            except KeyError:
+                if not default_namespace or not name or name[0] == '{':
+                    return None
+                try:
+                    state, particle, xsd_element = \
+                        transitions[state]['{%s}%s' % (default_namespace, name)]
+                except KeyError:
+                    return None
+
+            matches.append((particle, xsd_element))
+
+        return matches if state in self.final else None
+
+
+class ModelDispatchTable(object):
+    """
+    A dispatch table of a model group, that indexes the particles of the model by
+    the expanded names of the elements they can match, including the members of
+    substitution groups. Wildcards are indexed by the namespaces they admit. Used
+    for avoiding linear scans of wide model groups when matching child elements.
+
+    :param root: the ModelGroup instance of the model.
+    :ivar elements: a dictionary that maps each element name to a couple with \
+    the position and the first XSD element of the model that matches the name.
+    :ivar wildcards: a list of couples with the position and the wildcard.
+    :ivar positions: a dictionary that maps the items of the group to their positions.
+    :ivar choices: a dictionary that maps element names to the sorted positions \
+    of the items of the group that are XSD elements and that can match the name.
+    :ivar others: the sorted positions of the items of the group that are not \
+    XSD elements, that are always candidates for a match.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.elements = {}
+        self.wildcards = []
+        self._namespaces = {}
+
+        for position, xsd_element in enumerate(root.iter_elements()):
+            if isinstance(xsd_element, XsdAnyElement):
+                self.wildcards.append((position, xsd_element))
+                continue
+
+            self.elements.setdefault(xsd_element.name, (position, xsd_element))
+            for e in xsd_element.iter_substitutes():
+                self.elements.setdefault(e.name, (position, xsd_element))
+
+        self.positions = {}
+        self.choices = defaultdict(list)
+        self.others = []
+        for position, item in enumerate(root):
+            if item in self.positions:
+                raise XMLSchemaValueError("%r has repeated items" % root)
+            self.positions[item] = position
+
+            if isinstance(item, (ModelGroup, XsdAnyElement)):
+                self.others.append(position)
+                continue
+
+            names = {item.name}
+            names.update(e.name for e in item.iter_substitutes())
+            for name in names:
+                self.choices[name].append(position)
+
+        self.choices = dict(self.choices)
+
+    def __repr__(self):
+        return '%s(root=%r, names=%r)' % (
+            self.__class__.__name__, self.root, len(self.elements)
+        )
+
+    def iter_wildcards(self, name, default_namespace=None):
+        """
+        Iterates the couples (position, wildcard) of the wildcards that admit
+        the namespace of the name, in model order.
+        """
+        if not name or name[0] == '{':
+            namespaces = (get_namespace(name),)
+        elif not default_namespace:
+            namespaces = ('',)
+        else:
+            namespaces = ('', default_namespace)
+
+        try:
+            return iter(self._namespaces[namespaces])
+        except KeyError:
+            wildcards = self._namespaces[namespaces] = [
+                (position, w) for position, w in self.wildcards
+                if any(w.is_namespace_allowed(ns) for ns in namespaces)
+            ]
+            return iter(wildcards)
+
+    def match_element(self, name, default_namespace=None, group=None):
+        """
+        Returns the first element or wildcard of the model that matches the
+        name, or `None` if there is no match.
+
+        :param name: a local or fully-qualified name.
+        :param default_namespace: used for completing local names when it's not \
+        `None` and not empty.
+        :param group: the model group, used by XSD 1.1 wildcards.
+        """
+        position = float('inf')  # positions of repeated names exceed the number of names
+        xsd_element = None
+        for key in self.iter_keys(name, default_namespace):
+            try:
+                k, e = self.elements[key]
+            except KeyError:
+                continue
+            if k < position:
+                position, xsd_element = k, e
+
+        for k, wildcard in self.iter_wildcards(name, default_namespace):
+            if k >= position:
+                break
+            elif wildcard.is_matching(name, default_namespace, group=group):
+                return wildcard
+        return xsd_element
+
+    def next_choice(self, item, name, default_namespace=None):
+        """
+        Returns the position of the first item of the group, following *item*,
+        that can match the name. Returns `None` if *item* can match the name or
+        if there is no following item that can match it.
+        """
+        try:
+            position = self.positions[item]
+        except KeyError:
+            return None
+
+        candidate = None
+        for key in self.iter_keys(name, default_namespace):
+            positions = self.choices.get(key)
+            if positions:
+                k = bisect_right(positions, position)
+                if k and positions[k - 1] == position:
+                    return None
+                elif k < len(positions) and (candidate is None or positions[k] < candidate):
+                    candidate = positions[k]
+
+        if self.others:
+            k = bisect_right(self.others, position)
+            if k and self.others[k - 1] == position:
+                return None
+            elif k < len(self.others) and (candidate is None or self.others[k] < candidate):
+                candidate = self.others[k]
+
+        return candidate
+
+    @staticmethod
+    def iter_keys(name, default_namespace=None):
+        yield name
+        if default_namespace and name and name[0] != '{':
+            yield '{%s}%s' % (default_namespace, name)
@@ -0,0 +1,223 @@
+#
+# Copyright (c), 2016-2020, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+This module contains a compiler of simple XPath tests on attributes to Python
+predicates, used for evaluating XSD 1.1 type alternatives and assertions
+without building an XPath dynamic context. Predicates are picklable objects
+that take a mapping of attributes and return a boolean.
+"""
+import operator
+import re
+
+_REGEX_DOUBLE = re.compile(
+    r'^\s*(?:[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?|[+-]?INF|NaN)\s*$'
+)
+
+GENERAL_COMPARISON_OPERATORS = {
+    '=': operator.eq, '!=': operator.ne, '<': operator.lt,
+    '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+}
+
+VALUE_COMPARISON_OPERATORS = {
+    'eq': operator.eq, 'ne': operator.ne, 'lt': operator.lt,
+    'gt': operator.gt, 'le': operator.le, 'ge': operator.ge,
+}
+
+SWAPPED_OPERATORS = {
+    operator.lt: operator.gt, operator.gt: operator.lt,
+    operator.le: operator.ge, operator.ge: operator.le,
+}
+
+NUMERIC_LITERALS = ('(integer)', '(decimal)', '(float)')
+
+
+def to_double(value):
+    """Casts an untyped value to a float, with the lexical rules of xs:double."""
+    if _REGEX_DOUBLE.match(value) is None:
+        raise ValueError("invalid value {!r} for xs:double".format(value))
+    return float(value.strip().replace('INF', 'inf'))
+
+
+class AttributePredicate(object):
+    """Base class for predicates on a mapping of attributes."""
+    __slots__ = ()
+
+    def __call__(self, attrib):
+        raise NotImplementedError()
+
+
+class BooleanConstant(AttributePredicate):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, attrib):
+        return self.value
+
+
+class AttributeExists(AttributePredicate):
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, attrib):
+        return self.name in attrib
+
+
+class AttributeComparison(AttributePredicate):
+    """
+    Compares an attribute value with a literal. A missing attribute is an empty
+    sequence, so the comparison is false. Values are converted before the
+    comparison with the optional *cast* function.
+    """
+    __slots__ = ('name', 'op', 'literal', 'cast')
+
+    def __init__(self, name, op, literal, cast=None):
+        self.name = name
+        self.op = op
+        self.literal = literal
+        self.cast = cast
+
+    def __call__(self, attrib):
+        try:
+            value = attrib[self.name]
+        except KeyError:
+            return False
+        if self.cast is not None:
+            value = self.cast(value)
+        return self.op(value, self.literal)
+
+
+class NotPredicate(AttributePredicate):
+    __slots__ = ('predicate',)
+
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+    def __call__(self, attrib):
+        return not self.predicate(attrib)
+
+
+class AndPredicate(AttributePredicate):
+    __slots__ = ('left', 'right')
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def __call__(self, attrib):
+        return self.left(attrib) and self.right(attrib)
+
+
+class OrPredicate(AndPredicate):
+    __slots__ = ()
+
+    def __call__(self, attrib):
+        return self.left(attrib) or self.right(attrib)
+
+
+def compile_attribute_test(token, namespaces=None, get_normalizer=None):
+    """
+    Compiles a parsed XPath test expression to a Python predicate that takes
+    a mapping of attributes and returns a boolean. The supported expressions
+    are attribute references, comparisons between an attribute and a literal,
+    `not()`, `true()`, `false()` and the boolean operators `and` and `or`.
+
+    :param token: the root token of a parsed XPath expression.
+    :param namespaces: the namespace map used for resolving prefixed attribute names.
+    :param get_normalizer: an optional function that takes an attribute name and \
+    returns a function that maps attribute values to typed strings, or `None` if \
+    the attribute has not a string type. If not provided the attribute values are \
+    untyped, compared as strings with string literals and as doubles with numbers.
+    :return: an :class:`AttributePredicate` instance or `None` if the expression \
+    is not supported. The predicate raises `ValueError` if an untyped value cannot \
+    be compared with a number.
+    """
+    def get_attribute_name(tk):
+        if tk.symbol != '@' or len(tk) != 1:
+            return
+        elif tk[0].symbol == '(name)':
+            return tk[0].value
+        elif tk[0].symbol == ':' and tk[0][0].symbol == '(name)' \
+                and tk[0][1].symbol == '(name)':
+            try:
+                uri = namespaces[tk[0][0].value]
+            except (KeyError, TypeError):
+                return
+            return '{%s}%s' % (uri, tk[0][1].value) if uri else tk[0][1].value
+
+    def get_literal(tk):
+        if tk.symbol == '(string)':
+            return tk.value
+        elif tk.symbol in NUMERIC_LITERALS:
+            return float(tk.value)
+        elif tk.symbol in ('-', '+') and len(tk) == 1 and tk[0].symbol in NUMERIC_LITERALS:
+            return -float(tk[0].value) if tk.symbol == '-' else float(tk[0].value)
+
+    def compile_comparison(tk):
+        try:
+            op = GENERAL_COMPARISON_OPERATORS[tk.symbol]
+        except KeyError:
+            op = VALUE_COMPARISON_OPERATORS[tk.symbol]
+
+        name = get_attribute_name(tk[0])
+        if name is not None:
+            literal = get_literal(tk[1])
+        else:
+            name = get_attribute_name(tk[1])
+            literal = get_literal(tk[0])
+            op = SWAPPED_OPERATORS.get(op, op)
+
+        if name is None or literal is None:
+            return
+        elif get_normalizer is not None:
+            normalizer = get_normalizer(name)
+            if normalizer is not None and isinstance(literal, str):
+                return AttributeComparison(name, op, literal, normalizer)
+        elif isinstance(literal, str):
+            return AttributeComparison(name, op, literal)
+        elif tk.symbol in GENERAL_COMPARISON_OPERATORS:
+            # Untyped values are cast to xs:double only by general comparisons
+            return AttributeComparison(name, op, literal, to_double)
+
+    def compile_token(tk):
+        if tk.symbol == '@':
+            name = get_attribute_name(tk)
+            if name is not None:
+                return AttributeExists(name)
+
+        elif tk.symbol in GENERAL_COMPARISON_OPERATORS or \
+                tk.symbol in VALUE_COMPARISON_OPERATORS:
+            return compile_comparison(tk)
+
+        elif tk.symbol == '(':
+            if len(tk) == 1:
+                return compile_token(tk[0])
+
+        elif tk.symbol in ('and', 'or'):
+            left, right = compile_token(tk[0]), compile_token(tk[1])
+            if left is None or right is None:
+                return
+            elif tk.symbol == 'and':
+                return AndPredicate(left, right)
+            else:
+                return OrPredicate(left, right)
+
+        elif tk.symbol == 'not' and tk.label == 'function' and len(tk) == 1:
+            predicate = compile_token(tk[0])
+            if predicate is not None:
+                return NotPredicate(predicate)
+
+        elif tk.symbol in ('true', 'false') and tk.label == 'function' and not len(tk):
+            return BooleanConstant(tk.symbol == 'true')
+
+    return None if token is None else compile_token(token)
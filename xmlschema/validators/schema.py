@@ -20,10 +20,13 @@ import threading
 import warnings
 import re
 import sys
+import pickle
+import multiprocessing
+import multiprocessing.pool
 from copy import copy
 from abc import ABCMeta
-from collections import namedtuple, Counter
-from itertools import chain
+from collections import namedtuple, Counter, OrderedDict, deque
+from itertools import chain, islice
 
 from ..exceptions import XMLSchemaTypeError, XMLSchemaKeyError, \
     XMLSchemaValueError, XMLSchemaNamespaceError
@@ -47,10 +50,11 @@ from .exceptions import XMLSchemaParseError, XMLSchemaValidationError, XMLSchema
     XMLSchemaNotBuiltError, XMLSchemaIncludeWarning, XMLSchemaImportWarning
 from .xsdbase import check_validation_mode, XsdValidator, ValidationMixin, XsdComponent
 from .notations import XsdNotation
-from .identities import XsdKey, XsdKeyref, XsdUnique, Xsd11Key, Xsd11Unique, Xsd11Keyref
+from .identities import XsdKey, XsdKeyref, XsdUnique, Xsd11Key, Xsd11Unique, \
+    Xsd11Keyref, KeyrefCounter
 from .facets import XSD_10_FACETS, XSD_11_FACETS
-from .simple_types import xsd_simple_type_factory, XsdUnion, XsdAtomicRestriction, \
-    Xsd11AtomicRestriction, Xsd11Union
+from .simple_types import DECODE_CACHE_MAXSIZE, xsd_simple_type_factory, XsdAtomic, \
+    XsdUnion, XsdAtomicRestriction, Xsd11AtomicRestriction, Xsd11Union
 from .attributes import XsdAttribute, XsdAttributeGroup, Xsd11Attribute
 from .complex_types import XsdComplexType, Xsd11ComplexType
 from .groups import XsdGroup, Xsd11Group
@@ -83,6 +87,203 @@ ANY_ELEMENT = etree_element(
         'maxOccurs': 'unbounded'
     })
 
+# Subtrees sent to a worker process with a single task, on parallel validation
+SUBTREES_CHUNK_SIZE = 100
+
+# Number of XML documents sent to a worker at once by the validation of many documents
+DOCUMENTS_CHUNK_SIZE = 10
+
+# Maximum number of XPath selections memoized by a path resolver
+PATH_CACHE_MAXSIZE = 1000
+
+# The schema and the XSD ancestors used by the worker processes of a parallel validation
+_worker_schema = None
+_worker_ancestors = {}
+_worker_resolvers = {}
+
+
+class SchemaPathResolver(object):
+    """
+    A resolver of the XSD elements that match the elements of an XML document,
+    that memoizes the XPath selections on the schema. The XSD ancestors are
+    memoized by the tags of the ancestors, the XSD elements by their tags.
+    Used by the validation and the decoding of XML subtrees, in order to not
+    repeat the XPath selections for sibling subtrees with the same ancestry.
+
+    :param schema: the schema instance.
+    :param schema_path: an optional XPath expression for selecting the XSD element.
+    :param namespaces: the namespace map used for the XPath selections.
+    :param maxsize: the maximum number of selections memoized for each kind, the \
+    least recently used are discarded.
+    """
+    def __init__(self, schema, schema_path=None, namespaces=None, maxsize=PATH_CACHE_MAXSIZE):
+        self.schema = schema
+        self.schema_path = schema_path
+        self.namespaces = namespaces
+        self.maxsize = maxsize
+        self._elements = OrderedDict()
+        self._ancestors = OrderedDict()
+        self._roots = OrderedDict()
+
+    def __repr__(self):
+        return '%s(schema=%r, schema_path=%r)' % (
+            self.__class__.__name__, self.schema, self.schema_path
+        )
+
+    def _memoize(self, cache, key, value):
+        cache[key] = value
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return value
+
+    def get_element(self, tag):
+        """Returns the XSD element for an XML element tag, `None` if it's not found."""
+        try:
+            xsd_element = self._elements[tag]
+        except KeyError:
+            xsd_element = self.schema.get_element(tag, self.schema_path, self.namespaces)
+            return self._memoize(self._elements, tag, xsd_element)
+        else:
+            self._elements.move_to_end(tag)
+            return xsd_element
+
+    def get_root_element(self, tag):
+        """Returns the XSD global element for the tag of a root element, if any."""
+        try:
+            xsd_element = self._roots[tag]
+        except KeyError:
+            xsd_element = self.schema.get_element(tag, namespaces=self.namespaces)
+            return self._memoize(self._roots, tag, xsd_element)
+        else:
+            self._roots.move_to_end(tag)
+            return xsd_element
+
+    def get_ancestors(self, ancestors):
+        """Returns the list of XSD elements that match a list of XML ancestors."""
+        key = tuple(e.tag for e in ancestors)
+        try:
+            xsd_ancestors = self._ancestors[key]
+        except KeyError:
+            path = '/'.join(key) + '/ancestor-or-self::node()'
+            xsd_ancestors = self.schema.findall(path, self.namespaces)[1:]
+            return self._memoize(self._ancestors, key, xsd_ancestors)
+        else:
+            self._ancestors.move_to_end(key)
+            return xsd_ancestors
+
+
+def _limit_errors(results, max_errors):
+    """
+    Yields the results of a validation or decoding iterator, closing the iterator
+    after yielding *max_errors* validation errors.
+    """
+    if not isinstance(max_errors, int) or max_errors < 1:
+        msg = "'max_errors' argument must be a positive integer, not {!r}"
+        raise XMLSchemaValueError(msg.format(max_errors))
+
+    for result in results:
+        yield result
+        if isinstance(result, XMLSchemaValidationError):
+            max_errors -= 1
+            if not max_errors:
+                results.close()
+                break
+
+
+def _init_validation_worker(data):
+    global _worker_schema
+    _worker_schema = pickle.loads(data)
+    _worker_ancestors.clear()
+    _worker_resolvers.clear()
+
+
+def _is_valid_document(args):
+    """Validates an XML document in a worker process, returning `True` if it's valid."""
+    source, path, schema_path, use_defaults, namespaces, _ = args
+    results = _worker_schema._iter_validate(source, path, schema_path, use_defaults,
+                                            namespaces, resolvers=_worker_resolvers)
+    return next(results, None) is None
+
+
+def _get_subtree_kwargs(xsd_ancestors, **kwargs):
+    """Returns validation arguments for validating a subtree apart from its document."""
+    identities = {}
+    for e in xsd_ancestors:
+        e.start_identities(identities)
+    kwargs.update(id_map=Counter(), identities=identities, inherited={})
+    return kwargs
+
+
+def _validate_subtrees(args):
+    """
+    Validates a chunk of pickled subtrees in a worker process. Returns for each
+    subtree the number of errors, the IDs map and the values of the identity
+    counters, that have to be merged by the main process.
+    """
+    ancestors_path, schema_path, namespaces, level, use_defaults, chunk = args
+    schema = _worker_schema
+
+    try:
+        xsd_ancestors = _worker_ancestors[ancestors_path]
+    except KeyError:
+        if ancestors_path is None:
+            xsd_ancestors = []
+        else:
+            xsd_ancestors = schema.findall(ancestors_path, namespaces)[1:]
+        _worker_ancestors[ancestors_path] = xsd_ancestors
+
+    resolver = SchemaPathResolver(schema, schema_path, namespaces)
+    results = []
+    for data in chunk:
+        elem = pickle.loads(data)
+        xsd_element = resolver.get_element(elem.tag)
+        if xsd_element is None:
+            xsd_element = schema.create_element(name=elem.tag)
+
+        kwargs = _get_subtree_kwargs(
+            xsd_ancestors,
+            level=level,
+            namespaces=namespaces,
+            converter=None,
+            validation_only=True,
+            use_defaults=use_defaults,
+            locations=[],
+        )
+        errors = 0
+        for result in xsd_element.iter_decode(elem, **kwargs):
+            if isinstance(result, XMLSchemaValidationError):
+                errors += 1
+
+        identities = [
+            (identity.name, identity.ref is not None, counter.enabled, dict(counter.counter))
+            for identity, counter in kwargs['identities'].items()
+        ]
+        results.append((errors, dict(kwargs['id_map']), identities))
+
+    return results
+
+
+class LazyMetaSchema(object):
+    """
+    A descriptor for the meta-schema of a schema class. The meta-schema instance
+    is created at first access, using the lock of the meta-schema class.
+    """
+    def __init__(self, meta_schema_class, source):
+        self.meta_schema_class = meta_schema_class
+        self.source = source
+        self.meta_schema = None
+
+    def __get__(self, instance, owner):
+        if self.meta_schema is None:
+            with self.meta_schema_class.lock:
+                if self.meta_schema is None:
+                    self.meta_schema = self.meta_schema_class.create_meta_schema(self.source)
+        return self.meta_schema
+
+    @property
+    def url(self):
+        return self.meta_schema.url if self.meta_schema is not None else self.source
+
 
 class XMLSchemaMeta(ABCMeta):
 
@@ -93,7 +294,14 @@ class XMLSchemaMeta(ABCMeta):
                 if hasattr(obj, attr):
                     return getattr(obj, attr)
 
-        meta_schema = dict_.get('meta_schema') or get_attribute('meta_schema', *bases)
+        def get_meta_schema(*args):
+            # Get the meta-schema of base classes without creating it
+            for obj in args:
+                for cls in obj.__mro__:
+                    if 'meta_schema' in cls.__dict__:
+                        return cls.__dict__['meta_schema']
+
+        meta_schema = dict_.get('meta_schema') or get_meta_schema(*bases)
         if meta_schema is None:
             # Defining a subclass without a meta-schema (eg. XMLSchemaBase)
             return super(XMLSchemaMeta, mcs).__new__(mcs, name, bases, dict_)
@@ -131,10 +339,12 @@ class XMLSchemaMeta(ABCMeta):
         meta_schema_class.__qualname__ = meta_schema_class_name
         globals()[meta_schema_class_name] = meta_schema_class
 
-        # Build the shared meta-schema instance
-        schema_location = meta_schema.url if isinstance(meta_schema, XMLSchemaBase) else meta_schema
-        meta_schema = meta_schema_class.create_meta_schema(schema_location)
-        dict_['meta_schema'] = meta_schema
+        # Set the shared meta-schema instance, that is created at first access
+        if isinstance(meta_schema, (XMLSchemaBase, LazyMetaSchema)):
+            schema_location = meta_schema.url
+        else:
+            schema_location = meta_schema
+        dict_['meta_schema'] = LazyMetaSchema(meta_schema_class, schema_location)
         dict_.pop('lock')
 
         return super(XMLSchemaMeta, mcs).__new__(mcs, name, bases, dict_)
@@ -176,7 +386,7 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
     are under the directory path identified by source or by the *base_url* argument \
     are allowed.
     :type allow: str
-    :param defuse: defines when to defuse XML data using a `SafeXMLParser`. Can be \
+    :param defuse: defines when to defuse XML data forbidding entities. Can be \
     'always', 'remote' or 'never'. For default defuses only remote XML data.
     :type defuse: str
     :param timeout: the timeout in seconds for fetching resources. Default is `300`.
@@ -830,7 +1040,9 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
         if self.built:
             pass
         elif self.meta_schema is None:
-            self.build()  # Meta-schema lazy build
+            with self.lock:
+                if not self.built:
+                    self.build()  # Meta-schema lazy build
         elif validation == 'skip' and self.validation == 'skip' and \
                 any(comp.validation_attempted == 'partial' for comp in self.iter_globals()):
             pass
@@ -918,6 +1130,29 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
         for xsd_global in self.iter_globals(self):
             yield from xsd_global.iter_components(xsd_classes)
 
+    def set_decode_cache(self, maxsize=DECODE_CACHE_MAXSIZE):
+        """
+        Sets a bounded LRU decode cache on each atomic type of the global maps
+        that has a context free decoding. The XSD builtin types are shared with
+        the meta-schema, so their caches are shared with other schemas.
+
+        :param maxsize: the maximum number of cached values for each type. \
+        Provide `None` or 0 for removing the caches.
+        """
+        for xsd_type in self.maps.iter_components(XsdAtomic):
+            xsd_type.set_decode_cache(maxsize)
+
+    def get_decode_cache_info(self):
+        """
+        Returns a dictionary that maps the atomic types of the global maps
+        that have a decode cache to the statistics of their cache.
+        """
+        return {
+            xsd_type: xsd_type.decode_cache.info()
+            for xsd_type in self.maps.iter_components(XsdAtomic)
+            if xsd_type.decode_cache is not None
+        }
+
     def get_schema(self, namespace):
         """
         Returns the first schema loaded for a namespace. Raises a
@@ -1408,24 +1643,29 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
             )
         return '{%s}%s' % (namespace, local_name)
 
-    def validate(self, source, path=None, schema_path=None, use_defaults=True, namespaces=None):
+    def validate(self, source, path=None, schema_path=None, use_defaults=True,
+                 namespaces=None, workers=None):
         """
         Validates an XML data against the XSD schema/component instance.
 
         :raises: :exc:`XMLSchemaValidationError` if XML *data* instance is not a valid.
         """
-        for error in self.iter_errors(source, path, schema_path, use_defaults, namespaces):
+        for error in self.iter_errors(source, path, schema_path, use_defaults,
+                                      namespaces, workers):
             raise error
 
-    def is_valid(self, source, path=None, schema_path=None, use_defaults=True, namespaces=None):
+    def is_valid(self, source, path=None, schema_path=None, use_defaults=True,
+                 namespaces=None, workers=None):
         """
         Like :meth:`validate` except that do not raises an exception but returns ``True`` if
         the XML data is valid, ``False`` if it's invalid.
         """
-        error = next(self.iter_errors(source, path, schema_path, use_defaults, namespaces), None)
+        error = next(self.iter_errors(source, path, schema_path, use_defaults,
+                                      namespaces, workers), None)
         return error is None
 
-    def iter_errors(self, source, path=None, schema_path=None, use_defaults=True, namespaces=None):
+    def iter_errors(self, source, path=None, schema_path=None, use_defaults=True,
+                    namespaces=None, workers=None, max_errors=None):
         """
         Creates an iterator for the errors generated by the validation of an XML data
         against the XSD schema/component instance.
@@ -1440,8 +1680,58 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
         global element of the schema.
         :param use_defaults: Use schema's default values for filling missing data.
         :param namespaces: is an optional mapping from namespace prefix to URI.
+        :param workers: an optional number of worker processes for validating the \
+        subtrees of a lazy resource in parallel. Ignored for not lazy resources.
+        :param max_errors: an optional maximum number of errors. The validation \
+        stops after yielding this number of errors, also stopping the parsing of \
+        a lazy resource.
+        """
+        yield from self.iter_validate(source, path, schema_path, use_defaults,
+                                      namespaces, workers, max_errors)
+
+    def iter_validate(self, source, path=None, schema_path=None, use_defaults=True,
+                      namespaces=None, workers=None, max_errors=None):
+        """
+        Creates an iterator for the errors generated by a validation-only decoding
+        of an XML data. The converter is not used and the decoded data of elements
+        and attributes is discarded during the process.
+
+        :param source: the source of XML data. Can be an :class:`XMLResource` instance, a \
+        path to a file or an URI of a resource or an opened file-like object or an Element \
+        instance or an ElementTree instance or a string containing the XML data.
+        :param path: is an optional XPath expression that matches the elements of the XML \
+        data that have to be decoded. If not provided the XML root element is selected.
+        :param schema_path: an alternative XPath expression to select the XSD element \
+        to use for decoding. Useful if the root of the XML data doesn't match an XSD \
+        global element of the schema.
+        :param use_defaults: Use schema's default values for filling missing data.
+        :param namespaces: is an optional mapping from namespace prefix to URI.
+        :param workers: an optional number of worker processes for validating the \
+        subtrees of a lazy resource in parallel. The schema is pickled and sent to \
+        a pool of processes, the subtrees are validated by the workers and the IDs \
+        and identities are merged in the main process. Invalid subtrees are validated \
+        again by the main process for reporting their errors.
+        :param max_errors: an optional maximum number of errors. The validation \
+        stops after yielding this number of errors, also stopping the parsing of \
+        a lazy resource.
         """
+        if max_errors is not None:
+            results = self.iter_validate(source, path, schema_path, use_defaults,
+                                         namespaces, workers)
+            yield from _limit_errors(results, max_errors)
+            return
+
         self.check_validator(validation='lax')
+        yield from self._iter_validate(source, path, schema_path, use_defaults,
+                                       namespaces, workers)
+
+    def _iter_validate(self, source, path=None, schema_path=None, use_defaults=True,
+                       namespaces=None, workers=None, resolvers=None):
+        """
+        Validates an XML source with a built schema. The optional *resolvers* dictionary
+        memoizes the path resolvers, for sharing them between the validations of many
+        XML documents.
+        """
         if not isinstance(source, XMLResource):
             source = XMLResource(source, defuse=self.defuse, timeout=self.timeout)
         if not schema_path:
@@ -1455,6 +1745,17 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
         except KeyError:
             schema = self
 
+        if resolvers is None:
+            resolver = SchemaPathResolver(schema, schema_path, namespaces)
+        else:
+            key = id(schema), schema_path, tuple(namespaces.items())
+            try:
+                resolver = resolvers[key]
+            except KeyError:
+                if len(resolvers) >= PATH_CACHE_MAXSIZE:
+                    resolvers.clear()
+                resolver = resolvers[key] = SchemaPathResolver(schema, schema_path, namespaces)
+
         identities = {}
         locations = []
         ancestors = []
@@ -1464,6 +1765,7 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
             'source': source,
             'namespaces': namespaces,
             'converter': None,
+            'validation_only': True,
             'use_defaults': use_defaults,
             'id_map': Counter(),
             'identities': identities,
@@ -1471,53 +1773,93 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
             'locations': locations,  # TODO: lazy schemas load
         }
 
+        if workers is not None and workers > 1 and source.is_lazy() \
+                and source.lazy_backend != 'lxml':  # lxml elements can't be pickled
+            pool = multiprocessing.Pool(workers, _init_validation_worker, (pickle.dumps(schema),))
+        else:
+            pool = None
+        pending = deque()
+        chunk = []
+
         if path:
             selector = source.iterfind(path, namespaces, nsmap=namespaces, ancestors=ancestors)
         else:
             selector = source.iter_depth(mode=3, nsmap=namespaces, ancestors=ancestors)
 
-        for elem in selector:
-            if elem is source.root:
-                xsd_element = schema.get_element(elem.tag, namespaces=namespaces)
-                if source.lazy_depth:
-                    kwargs['level'] = 0
-                    kwargs['identities'] = {}
-                    kwargs['max_depth'] = source.lazy_depth
-            else:
-                if prev_ancestors != ancestors:
-                    k = 0
-                    for k in range(min(len(ancestors), len(prev_ancestors))):
-                        if ancestors[k] is not prev_ancestors[k]:
-                            break
+        path_ = None
+        xsd_ancestors = []
+        try:
+            for elem in selector:
+                if pool is not None and chunk and \
+                        (elem is source.root or prev_ancestors != ancestors):
+                    # Merge all the results before changing the identities scope
+                    self._submit_subtrees(pool, pending, chunk, xsd_ancestors, path_,
+                                          schema_path, **kwargs)
+                    chunk = []
+                    while pending:
+                        yield from self._iter_subtrees_results(*pending.popleft(), **kwargs)
+
+                if elem is source.root:
+                    xsd_element = resolver.get_root_element(elem.tag)
+                    if source.lazy_depth:
+                        kwargs['level'] = 0
+                        kwargs['identities'] = {}
+                        kwargs['max_depth'] = source.lazy_depth
+                else:
+                    if prev_ancestors != ancestors:
+                        k = 0
+                        for k in range(min(len(ancestors), len(prev_ancestors))):
+                            if ancestors[k] is not prev_ancestors[k]:
+                                break
 
-                    path_ = '/'.join(e.tag for e in ancestors) + '/ancestor-or-self::node()'
-                    xsd_ancestors = schema.findall(path_, namespaces)[1:]
+                        path_ = '/'.join(e.tag for e in ancestors) + '/ancestor-or-self::node()'
+                        xsd_ancestors = resolver.get_ancestors(ancestors)
 
-                    for e in xsd_ancestors[k:]:
-                        e.stop_identities(identities)
+                        for e in xsd_ancestors[k:]:
+                            e.stop_identities(identities)
 
-                    for e in xsd_ancestors[k:]:
-                        e.start_identities(identities)
+                        for e in xsd_ancestors[k:]:
+                            e.start_identities(identities)
 
-                    prev_ancestors = ancestors[:]
+                        prev_ancestors = ancestors[:]
 
-                xsd_element = schema.get_element(elem.tag, schema_path, namespaces)
+                    xsd_element = resolver.get_element(elem.tag)
 
-            if xsd_element is None:
-                if XSI_TYPE in elem.attrib:
-                    xsd_element = self.create_element(name=elem.tag)
-                elif elem is not source.root and ancestors:
+                if xsd_element is None:
+                    if XSI_TYPE in elem.attrib:
+                        xsd_element = self.create_element(name=elem.tag)
+                    elif elem is not source.root and ancestors:
+                        continue
+                    else:
+                        reason = "{!r} is not an element of the schema".format(elem)
+                        yield schema.validation_error('lax', reason, elem, source, namespaces)
+                        return
+
+                if pool is not None and elem is not source.root:
+                    # The subtree is pickled before its children are pruned by the selector
+                    chunk.append((elem, pickle.dumps(elem), xsd_element))
+                    if len(chunk) >= SUBTREES_CHUNK_SIZE:
+                        self._submit_subtrees(pool, pending, chunk, xsd_ancestors, path_,
+                                              schema_path, **kwargs)
+                        chunk = []
+                        if len(pending) > workers * 2:
+                            yield from self._iter_subtrees_results(*pending.popleft(), **kwargs)
                     continue
-                else:
-                    reason = "{!r} is not an element of the schema".format(elem)
-                    yield schema.validation_error('lax', reason, elem, source, namespaces)
-                    return
 
-            for result in xsd_element.iter_decode(elem, **kwargs):
-                if isinstance(result, XMLSchemaValidationError):
-                    yield result
-                else:
-                    del result
+                for result in xsd_element.iter_decode(elem, **kwargs):
+                    if isinstance(result, XMLSchemaValidationError):
+                        yield result
+                    else:
+                        del result
+
+            if chunk:
+                self._submit_subtrees(pool, pending, chunk, xsd_ancestors, path_,
+                                      schema_path, **kwargs)
+            while pending:
+                yield from self._iter_subtrees_results(*pending.popleft(), **kwargs)
+        finally:
+            if pool is not None:
+                pool.terminate()
 
         if kwargs['identities'] is not identities:
             for identity, counter in kwargs['identities'].items():
@@ -1526,6 +1868,177 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
 
         yield from self._validate_references(validation='lax', **kwargs)
 
+    @staticmethod
+    def _submit_subtrees(pool, pending, chunk, xsd_ancestors, ancestors_path,
+                         schema_path, level, namespaces, use_defaults, **kwargs):
+        """Sends a chunk of pickled subtrees to a pool of worker processes."""
+        args = ancestors_path, schema_path, namespaces, level, use_defaults, \
+            [x[1] for x in chunk]
+        pending.append((chunk, xsd_ancestors, pool.apply_async(_validate_subtrees, (args,))))
+
+    def _iter_subtrees_results(self, chunk, xsd_ancestors, async_result, **kwargs):
+        """
+        Merges the results of a chunk of subtrees validated by a worker process,
+        yielding the errors of the subtrees and the errors of duplicated IDs and
+        identity values.
+        """
+        for (elem, data, xsd_element), result in zip(chunk, async_result.get()):
+            yield from self._iter_subtree_result(elem, data, xsd_element,
+                                                 xsd_ancestors, *result, **kwargs)
+
+    def _iter_subtree_result(self, elem, data, xsd_element, xsd_ancestors,
+                             errors, subtree_id_map, counters, **kwargs):
+        if errors:
+            # Restore the pruned children and repeat the validation in the main process
+            elem[:] = pickle.loads(data)[:]
+            subtree_kwargs = _get_subtree_kwargs(xsd_ancestors, **kwargs)
+            for result in xsd_element.iter_decode(elem, **subtree_kwargs):
+                if isinstance(result, XMLSchemaValidationError):
+                    yield result
+            del elem[:]
+
+        namespaces = kwargs['namespaces']
+        source = kwargs['source']
+        for k, v in subtree_id_map.items():
+            if k not in kwargs['id_map']:
+                kwargs['id_map'][k] = v
+            elif v and kwargs['id_map'][k]:
+                reason = "Duplicated xs:ID value {!r}".format(k)
+                yield self.validation_error('lax', reason, elem, source, namespaces)
+            elif v:
+                kwargs['id_map'][k] = v
+
+        identities = kwargs['identities']
+        ancestors_identities = {
+            (identity.name, identity.ref is not None): identity
+            for e in xsd_ancestors for identity in e.identities.values()
+        }
+        for name, is_ref, enabled, values in counters:
+            if not enabled:
+                # An identity of the subtree: like in sequential validation
+                # the counter keeps the values of the last validated element.
+                try:
+                    identity = ancestors_identities[name, is_ref]
+                except KeyError:
+                    if is_ref or name not in self.maps.identities:
+                        continue
+                    identity = self.maps.identities[name]
+
+                try:
+                    counter = identities[identity]
+                except KeyError:
+                    counter = identities[identity] = identity.get_counter(enabled=False)
+                counter.counter = Counter(values)
+                continue
+
+            try:
+                counter = identities[ancestors_identities[name, is_ref]]
+            except KeyError:
+                continue
+
+            if not counter.enabled:
+                continue
+            elif isinstance(counter, KeyrefCounter):
+                counter.counter.update(values)
+                continue
+
+            for fields, count in values.items():
+                if count > 1:
+                    counter.counter[fields] += count  # already reported by the worker
+                    continue
+                try:
+                    counter.increase(fields)
+                except ValueError as err:
+                    yield self.validation_error('lax', err, elem, source, namespaces)
+
+    def iter_validate_many(self, sources, path=None, schema_path=None, use_defaults=True,
+                           namespaces=None, max_errors=None, workers=None, use_threads=False):
+        """
+        Creates an iterator for validating many XML documents, that yields a list with
+        the validation errors of each document, in the order of the sources. The schema
+        status is checked once and the XPath selections on the schema are shared by the
+        validations, reducing the overhead of validating many small documents.
+
+        :param sources: an iterable of XML sources, each source can be any of the \
+        sources accepted by :meth:`iter_errors`. For validating with worker processes \
+        the sources must be picklable (eg. strings, bytes or file paths).
+        :param path: is an optional XPath expression that matches the elements of the XML \
+        data that have to be decoded. If not provided the XML root element is selected.
+        :param schema_path: an alternative XPath expression to select the XSD element \
+        to use for decoding.
+        :param use_defaults: Use schema's default values for filling missing data.
+        :param namespaces: is an optional mapping from namespace prefix to URI.
+        :param max_errors: an optional maximum number of errors reported for each document.
+        :param workers: an optional number of workers for validating the documents in \
+        parallel. With worker processes the invalid documents are validated again by \
+        the main process for reporting their errors.
+        :param use_threads: if `True` the workers are threads instead of processes.
+        """
+        self.check_validator(validation='lax')
+        args = path, schema_path, use_defaults, namespaces, max_errors
+
+        if workers is None or workers <= 1:
+            resolvers = {}
+            for source in sources:
+                yield self._get_document_errors(source, *args, resolvers=resolvers)
+            return
+
+        if use_threads:
+            local = threading.local()
+
+            def validate_document(source_):
+                try:
+                    resolvers_ = local.resolvers
+                except AttributeError:
+                    resolvers_ = local.resolvers = {}
+                return self._get_document_errors(source_, *args, resolvers=resolvers_)
+
+            pool = multiprocessing.pool.ThreadPool(workers)
+        else:
+            validate_document = _is_valid_document
+            pool = multiprocessing.Pool(workers, _init_validation_worker, (pickle.dumps(self),))
+
+        resolvers = {}
+        sources = iter(sources)
+        try:
+            while True:
+                # Sources are submitted in batches, for not consuming the whole iterable
+                batch = list(islice(sources, workers * SUBTREES_CHUNK_SIZE))
+                if not batch:
+                    break
+
+                if use_threads:
+                    yield from pool.imap(validate_document, batch, DOCUMENTS_CHUNK_SIZE)
+                    continue
+
+                results = pool.imap(validate_document, ((x,) + args for x in batch),
+                                    DOCUMENTS_CHUNK_SIZE)
+                for source, valid in zip(batch, results):
+                    if valid:
+                        yield []
+                    else:
+                        yield self._get_document_errors(source, *args, resolvers=resolvers)
+        finally:
+            pool.terminate()
+
+    def validate_many(self, sources, path=None, schema_path=None, use_defaults=True,
+                      namespaces=None, max_errors=None, workers=None, use_threads=False):
+        """
+        Validates many XML documents, returning a list with a list of validation errors
+        for each document, in the order of the sources. Takes the same arguments of the
+        method :meth:`iter_validate_many`.
+        """
+        return list(self.iter_validate_many(sources, path, schema_path, use_defaults,
+                                            namespaces, max_errors, workers, use_threads))
+
+    def _get_document_errors(self, source, path=None, schema_path=None, use_defaults=True,
+                             namespaces=None, max_errors=None, resolvers=None):
+        results = self._iter_validate(source, path, schema_path, use_defaults,
+                                      namespaces, resolvers=resolvers)
+        if max_errors is not None:
+            results = _limit_errors(results, max_errors)
+        return list(results)
+
     def _validate_references(self, source, validation='lax', id_map=None,
                              identities=None, **kwargs):
         # Check unresolved IDREF values
@@ -1550,8 +2063,9 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
         else:
             selector = source.iter_depth(nsmap=namespaces)
 
+        resolver = SchemaPathResolver(self, schema_path, namespaces)
         for elem in selector:
-            xsd_element = self.get_element(elem.tag, schema_path, namespaces)
+            xsd_element = resolver.get_element(elem.tag)
             if xsd_element is None:
                 if XSI_TYPE in elem.attrib:
                     xsd_element = self.create_element(name=elem.tag)
@@ -1569,7 +2083,8 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
                     process_namespaces=True, namespaces=None, use_defaults=True,
                     decimal_type=None, datetime_types=False, converter=None,
                     filler=None, fill_missing=False, keep_unknown=False,
-                    max_depth=None, depth_filler=None, **kwargs):
+                    max_depth=None, depth_filler=None, compiled_models=False,
+                    max_errors=None, **kwargs):
         """
         Creates an iterator for decoding an XML source to a data structure.
 
@@ -1607,10 +2122,25 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
         :param depth_filler: an optional callback function to replace data over the \
         *max_depth* level. The callback function must accept one positional argument, that \
         can be an XSD Element. If not provided deeper data are replaced with `None` values.
+        :param compiled_models: if set to `True` the content of elements is matched \
+        using the compiled automatons of model groups, falling back to model visitors \
+        for not compilable models or for invalid content.
+        :param max_errors: an optional maximum number of errors for 'lax' validation. \
+        The decoding stops after yielding this number of errors, also stopping the \
+        parsing of a lazy resource. The data of the interrupted element is not yielded.
         :param kwargs: keyword arguments with other options for converter and decoder.
         :return: yields a decoded data object, eventually preceded by a sequence of \
         validation or decoding errors.
         """
+        if max_errors is not None:
+            results = self.iter_decode(
+                source, path, schema_path, validation, process_namespaces, namespaces,
+                use_defaults, decimal_type, datetime_types, converter, filler, fill_missing,
+                keep_unknown, max_depth, depth_filler, compiled_models, **kwargs
+            )
+            yield from _limit_errors(results, max_errors)
+            return
+
         self.check_validator(validation)
         if not isinstance(source, XMLResource):
             source = XMLResource(source, defuse=self.defuse, timeout=self.timeout)
@@ -1648,6 +2178,8 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
             kwargs['max_depth'] = max_depth
         if depth_filler is not None:
             kwargs['depth_filler'] = depth_filler
+        if compiled_models:
+            kwargs['compiled_models'] = compiled_models
 
         if path:
             selector = source.iterfind(path, namespaces, nsmap=namespaces)
@@ -1663,8 +2195,9 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
             kwargs['max_depth'] = source.lazy_depth
             selector = source.iter_depth(mode=2, nsmap=namespaces)
 
+        resolver = SchemaPathResolver(schema, schema_path, namespaces)
         for elem in selector:
-            xsd_element = schema.get_element(elem.tag, schema_path, namespaces)
+            xsd_element = resolver.get_element(elem.tag)
             if xsd_element is None:
                 if XSI_TYPE in elem.attrib:
                     xsd_element = self.create_element(name=elem.tag)
@@ -1700,6 +2233,105 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
 
     to_dict = decode
 
+    def stream_decode(self, source, record_path, schema_path=None, validation='lax',
+                      process_namespaces=True, namespaces=None, use_defaults=True,
+                      converter=None, **kwargs):
+        """
+        Creates an iterator for decoding the records of an XML source, selected by
+        a path of child steps. Each record is decoded and validated when its end is
+        parsed and then it's removed from the XML tree, so that the memory usage doesn't
+        depend on the number of records. The XSD IDs and the identity constraints of the
+        records and their ancestors are checked across all the records. The ancestors of
+        the records are not validated.
+
+        :param source: the source of XML data. Can be an :class:`XMLResource` instance, a \
+        path to a file or an URI of a resource or an opened file-like object. If it's not \
+        an XML resource a lazy one is created. Not lazy XML resources are decoded without \
+        removing the records from the XML tree.
+        :param record_path: a path of element names, prefixed names or `*` wildcards \
+        separated by slashes for selecting the records, relative to the root or absolute.
+        :param schema_path: an alternative XPath expression to select the XSD element \
+        to use for decoding the records.
+        :param validation: defines the XSD validation mode to use for decode, can be \
+        'strict', 'lax' or 'skip'.
+        :param process_namespaces: indicates whether to use namespace information in \
+        the decoding process, using the map provided with the argument *namespaces* \
+        and the map extracted from the XML document.
+        :param namespaces: is an optional mapping from namespace prefix to URI.
+        :param use_defaults: indicates whether to use default values for filling missing data.
+        :param converter: an :class:`XMLSchemaConverter` subclass or instance to use \
+        for decoding.
+        :param kwargs: other options of :meth:`iter_decode` and keyword arguments \
+        for converter and decoder.
+        :return: yields a decoded data object for each record, eventually preceded \
+        by validation or decoding errors. Errors about IDREF values and key references \
+        that cannot be resolved are yielded at the end.
+        """
+        self.check_validator(validation)
+        if not isinstance(source, XMLResource):
+            source = XMLResource(source, defuse=self.defuse, timeout=self.timeout, lazy=True)
+        if not schema_path:
+            schema_path = source.get_absolute_path(record_path)
+
+        if process_namespaces:
+            namespaces = source.get_namespaces(namespaces, root_only=True)
+            namespace = source.namespace or namespaces.get('', '')
+        else:
+            namespace = source.namespace
+
+        try:
+            schema = self.get_schema(namespace)
+        except KeyError:
+            schema = self
+
+        identities = {}
+        ancestors = []
+        prev_ancestors = []
+        resolver = SchemaPathResolver(schema, schema_path, namespaces)
+
+        converter = self.get_converter(converter, namespaces=namespaces, **kwargs)
+        kwargs.update(
+            converter=converter,
+            namespaces=namespaces,
+            source=source,
+            use_defaults=use_defaults,
+            id_map=Counter(),
+            identities=identities,
+            inherited={},
+        )
+
+        for elem in source.iter_records(record_path, namespaces, nsmap=namespaces,
+                                        ancestors=ancestors):
+            if prev_ancestors != ancestors:
+                k = 0
+                for k in range(min(len(ancestors), len(prev_ancestors))):
+                    if ancestors[k] is not prev_ancestors[k]:
+                        break
+
+                xsd_ancestors = resolver.get_ancestors(ancestors)
+
+                for e in xsd_ancestors[k:]:
+                    e.stop_identities(identities)
+
+                for e in xsd_ancestors[k:]:
+                    e.start_identities(identities)
+
+                prev_ancestors = ancestors[:]
+
+            xsd_element = resolver.get_element(elem.tag)
+
+            if xsd_element is None:
+                if XSI_TYPE in elem.attrib:
+                    xsd_element = self.create_element(name=elem.tag)
+                else:
+                    reason = "{!r} is not an element of the schema".format(elem)
+                    yield schema.validation_error(validation, reason, elem, source, namespaces)
+                    continue
+
+            yield from xsd_element.iter_decode(elem, validation, **kwargs)
+
+        yield from self._validate_references(validation=validation, **kwargs)
+
     def iter_encode(self, obj, path=None, validation='lax', namespaces=None, converter=None,
                     unordered=False, **kwargs):
         """
@@ -1716,7 +2348,9 @@ class XMLSchemaBase(XsdValidator, ValidationMixin, ElementPathMixin, metaclass=X
         :param unordered: a flag for explicitly activating unordered encoding mode for \
         content model data. This mode uses content models for a reordered-by-model \
         iteration of the child elements.
-        :param kwargs: Keyword arguments containing options for converter and encoding.
+        :param kwargs: Keyword arguments containing options for converter and encoding. \
+        Provide *compiled_models=True* for matching the content using the compiled \
+        automatons of model groups.
         :return: yields an Element instance/s or validation/encoding errors.
         """
         self.check_validator(validation)
@@ -10,6 +10,8 @@
 """
 This module contains classes for XML Schema simple data types.
 """
+from collections import namedtuple, OrderedDict
+from copy import copy
 from decimal import DecimalException
 
 from ..etree import etree_element
@@ -32,6 +34,76 @@ from .facets import XsdFacet, XsdWhiteSpaceFacet, XSD_10_FACETS_BUILDERS, \
     XSD_11_FACETS_BUILDERS, XSD_10_FACETS, XSD_11_FACETS, XSD_10_LIST_FACETS, \
     XSD_11_LIST_FACETS, XSD_10_UNION_FACETS, XSD_11_UNION_FACETS, MULTIPLE_FACETS
 
+DECODE_CACHE_MAXSIZE = 128
+
+DecodeCacheInfo = namedtuple('DecodeCacheInfo', 'hits misses maxsize currsize')
+
+
+class DecodeCache(object):
+    """
+    A bounded LRU cache for the decoding of the normalized text values of an
+    atomic type. Each entry stores the items yielded by the decoding up to the
+    decoded value, validation errors included, that are copied before each use.
+
+    :param maxsize: the maximum number of cached values.
+    """
+    def __init__(self, maxsize=DECODE_CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._results = OrderedDict()
+
+    def __repr__(self):
+        return '%s(maxsize=%r)' % (self.__class__.__name__, self.maxsize)
+
+    def __len__(self):
+        return len(self._results)
+
+    def info(self):
+        """Returns the statistics of the cache, like `functools.lru_cache`."""
+        return DecodeCacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
+
+    def clear(self):
+        """Clears the cache and its statistics."""
+        self._results.clear()
+        self.hits = self.misses = 0
+
+    def iter_decode(self, xsd_type, text, validation, kwargs):
+        # Errors are yielded also in 'strict' mode, so it shares the results of 'lax' mode
+        key = text, validation == 'skip'
+        try:
+            items = self._results[key]
+        except KeyError:
+            self.misses += 1
+            items = []
+            for item in xsd_type._iter_decode(text, validation, **kwargs):
+                if items is None:
+                    pass
+                elif isinstance(item, XMLSchemaValidationError):
+                    items.append(copy(item))
+                else:
+                    # Store at the first decoded value, usually the last item
+                    items.append(item)
+                    self._results[key] = items
+                    if len(self._results) > self.maxsize:
+                        try:
+                            self._results.popitem(last=False)
+                        except KeyError:
+                            pass
+                    items = None
+                yield item
+        else:
+            self.hits += 1
+            try:
+                self._results.move_to_end(key)
+            except KeyError:
+                pass
+
+            for item in items:
+                if isinstance(item, XMLSchemaValidationError):
+                    yield copy(item)
+                else:
+                    yield item
+
 
 def xsd_simple_type_factory(elem, schema, parent):
     """
@@ -453,6 +525,7 @@ class XsdAtomic(XsdSimpleType):
     built-in type or another derived simpleType.
     """
     variety = 'atomic'
+    decode_cache = None
 
     to_python = str
     _special_types = {XSD_ANY_TYPE, XSD_ANY_SIMPLE_TYPE, XSD_ANY_ATOMIC_TYPE}
@@ -509,6 +582,44 @@ class XsdAtomic(XsdSimpleType):
     def is_atomic():
         return True
 
+    def has_context_free_decoding(self):
+        """
+        Returns `True` if the decoding of a text value depends only on the value,
+        `False` otherwise. Types with non-atomic values and types derived from
+        xs:QName, xs:ID or xs:IDREF have context dependent decoding.
+        """
+        if not self.primitive_type.is_atomic():
+            return False
+        elif self.name in (XSD_QNAME, XSD_ID, XSD_IDREF):
+            return False
+        return not any(self.is_derived(self.maps.types[name])
+                       for name in (XSD_QNAME, XSD_ID, XSD_IDREF))
+
+    def set_decode_cache(self, maxsize=DECODE_CACHE_MAXSIZE):
+        """
+        Sets a bounded LRU cache for the decoding of text values. The cache is
+        set only if the type has a context free decoding.
+
+        :param maxsize: the maximum number of cached values. Provide `None` \
+        or 0 for removing the cache.
+        :return: `True` if the cache is set, `False` otherwise.
+        """
+        if not maxsize or not self.has_context_free_decoding():
+            self.decode_cache = None
+            return False
+
+        self.decode_cache = DecodeCache(maxsize)
+        return True
+
+    def iter_decode(self, obj, validation='lax', **kwargs):
+        if self.decode_cache is not None and isinstance(obj, (str, bytes)):
+            return self.decode_cache.iter_decode(
+                self, self.normalize(obj), validation, kwargs
+            )
+        return self._iter_decode(obj, validation, **kwargs)
+
+    _iter_decode = XsdSimpleType.iter_decode
+
 
 class XsdAtomicBuiltin(XsdAtomic):
     """
@@ -563,7 +674,7 @@ class XsdAtomicBuiltin(XsdAtomic):
     def is_datetime(self):
         return self.to_python.__name__ == 'fromstring'
 
-    def iter_decode(self, obj, validation='lax', **kwargs):
+    def _iter_decode(self, obj, validation='lax', **kwargs):
         if isinstance(obj, (str, bytes)):
             obj = self.normalize(obj)
         elif obj is not None and not isinstance(obj, self.instance_types):
@@ -1242,7 +1353,7 @@ class XsdAtomicRestriction(XsdAtomic):
         if self.base_type.parent is not None:
             yield from self.base_type.iter_components(xsd_classes)
 
-    def iter_decode(self, obj, validation='lax', **kwargs):
+    def _iter_decode(self, obj, validation='lax', **kwargs):
         if isinstance(obj, (str, bytes)):
             obj = self.normalize(obj)
 
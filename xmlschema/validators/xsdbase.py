@@ -795,7 +795,20 @@ class ValidationMixin(object):
         :param use_defaults: Use schema's default values for filling missing data.
         :param namespaces: is an optional mapping from namespace prefix to URI.
         """
-        for result in self.iter_decode(source, use_defaults=use_defaults, namespaces=namespaces):
+        yield from self.iter_validate(source, use_defaults=use_defaults, namespaces=namespaces)
+
+    def iter_validate(self, source, **kwargs):
+        """
+        Creates an iterator for the errors generated by a validation-only
+        decoding of XML data. The converter is not used and decoded data of
+        elements and attributes is discarded during the process.
+
+        :param source: the XML data source.
+        :param kwargs: keyword arguments for the decoder API.
+        """
+        kwargs['converter'] = None
+        kwargs['validation_only'] = True
+        for result in self.iter_decode(source, 'lax', **kwargs):
             if isinstance(result, XMLSchemaValidationError):
                 yield result
             else: